@@ -43,6 +43,8 @@ const movementTypeConfig: Record<string, { label: string; className: string }> =
   ADJUSTMENT: { label: 'Ajuste', className: 'text-amber-400' },
   ENROLLMENT: { label: 'Registro', className: 'text-orange-400' },
   TRANSFER: { label: 'Transferencia', className: 'text-cyan-400' },
+  RFID_CHECK_IN: { label: 'Entrada RFID', className: 'text-green-400' },
+  RFID_CHECK_OUT: { label: 'Salida RFID', className: 'text-blue-400' },
 }
 
 interface Movement {
@@ -370,8 +372,8 @@ export default function InventoryItemDetailPage() {
                     >
                       <div className="flex-shrink-0">
                         <div className={`w-10 h-10 rounded-full flex items-center justify-center bg-gray-800 ${movementTypeConfig[movement.type]?.className || 'text-gray-400'}`}>
-                          {movement.type === 'CHECK_IN' && <ArrowDownToLine className="w-5 h-5" />}
-                          {movement.type === 'CHECK_OUT' && <ArrowUpFromLine className="w-5 h-5" />}
+                          {(movement.type === 'CHECK_IN' || movement.type === 'RFID_CHECK_IN') && <ArrowDownToLine className="w-5 h-5" />}
+                          {(movement.type === 'CHECK_OUT' || movement.type === 'RFID_CHECK_OUT') && <ArrowUpFromLine className="w-5 h-5" />}
                           {movement.type === 'ADJUSTMENT' && <Wrench className="w-5 h-5" />}
                           {movement.type === 'ENROLLMENT' && <Tag className="w-5 h-5" />}
                           {movement.type === 'TRANSFER' && <MapPin className="w-5 h-5" />}
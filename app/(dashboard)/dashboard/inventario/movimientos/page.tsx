@@ -36,6 +36,8 @@ export default function MovementsPage() {
               <option value="ADJUSTMENT">Ajuste</option>
               <option value="ENROLLMENT">Registro</option>
               <option value="TRANSFER">Transferencia</option>
+              <option value="RFID_CHECK_IN">Entrada RFID</option>
+              <option value="RFID_CHECK_OUT">Salida RFID</option>
             </select>
           </div>
         </Card.Header>
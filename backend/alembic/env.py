@@ -5,6 +5,8 @@ from sqlalchemy import engine_from_config, pool
 
 from app.core.config import settings
 from app.db.base import Base
+from app.infrastructure.common.partitions import is_partition_name
+from app.infrastructure.common.search import is_trigram_index
 from app.models import *  # noqa: F401,F403
 
 config = context.config
@@ -16,9 +18,25 @@ if config.config_file_name is not None:
 target_metadata = Base.metadata
 
 
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    # Las particiones se crean en tiempo de ejecución y no existen en los modelos.
+    if type_ == 'table' and reflected and compare_to is None and is_partition_name(name):
+        return False
+    # Los índices trigram dependen de que el servidor tenga `pg_trgm`: solo los gestiona su migración.
+    if type_ == 'index' and reflected and compare_to is None and is_trigram_index(name):
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     url = config.get_main_option('sqlalchemy.url')
-    context.configure(url=url, target_metadata=target_metadata, literal_binds=True, compare_type=True)
+    context.configure(
+        url=url,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        compare_type=True,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -32,7 +50,12 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata, compare_type=True)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            compare_type=True,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,96 @@
+"""partition inventory_movements by createdAt
+
+Revision ID: 6234afb5c725
+Revises: 3467b25b02f6
+Create Date: 2026-10-17 20:49:13.728919
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+from app.infrastructure.common.partitions import ensure_partitions
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6234afb5c725'
+down_revision: Union[str, None] = '3467b25b02f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_COLUMNS = (
+    '"id", "inventoryItemId", type, "fromStatus", "toStatus", "fromLocation", "toLocation", '
+    'reason, reference, "performedBy", "createdAt"'
+)
+
+
+def _create_movements_table(partitioned: bool) -> None:
+    op.create_table(
+        'inventory_movements',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('inventoryItemId', sa.String(), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('fromStatus', sa.String(), nullable=True),
+        sa.Column('toStatus', sa.String(), nullable=False),
+        sa.Column('fromLocation', sa.String(), nullable=True),
+        sa.Column('toLocation', sa.String(), nullable=True),
+        sa.Column('reason', sa.String(), nullable=True),
+        sa.Column('reference', sa.String(), nullable=True),
+        sa.Column('performedBy', sa.String(), nullable=False),
+        sa.Column('createdAt', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(
+            ['inventoryItemId'], ['inventory_items.id'], ondelete='CASCADE', name='inventory_movements_inventoryItemId_fkey'
+        ),
+        sa.ForeignKeyConstraint(['performedBy'], ['users.id'], ondelete='RESTRICT', name='inventory_movements_performedBy_fkey'),
+        sa.PrimaryKeyConstraint(*(['id', 'createdAt'] if partitioned else ['id']), name='inventory_movements_pkey'),
+        **({'postgresql_partition_by': 'RANGE ("createdAt")'} if partitioned else {}),
+    )
+
+
+def _rename_current(new_name: str) -> None:
+    # El nombre del índice de la PK es global al esquema: se libera antes de recrear la tabla.
+    op.rename_table('inventory_movements', new_name)
+    op.execute(sa.text(f'ALTER TABLE {new_name} RENAME CONSTRAINT inventory_movements_pkey TO {new_name}_pkey'))
+
+
+def upgrade() -> None:
+    # Igual que `rfid_detections`: tabla particionada al lado de la actual, particiones
+    # para todo el rango existente (más los periodos futuros) y copia de las filas.
+    op.drop_index(op.f('ix_inventory_movements_createdAt'), table_name='inventory_movements')
+    _rename_current('inventory_movements_legacy')
+    _create_movements_table(partitioned=True)
+    op.execute(sa.text('CREATE TABLE inventory_movements_default PARTITION OF inventory_movements DEFAULT'))
+
+    bind = op.get_bind()
+    oldest = bind.execute(sa.text('SELECT min("createdAt") FROM inventory_movements_legacy')).scalar()
+    ensure_partitions(
+        bind,
+        'inventory_movements',
+        'createdAt',
+        settings.inventory_movements_partition_interval,
+        ahead=settings.inventory_movements_partitions_ahead,
+        since=oldest,
+    )
+
+    op.execute(sa.text(f'INSERT INTO inventory_movements ({_COLUMNS}) SELECT {_COLUMNS} FROM inventory_movements_legacy'))
+    op.drop_table('inventory_movements_legacy')
+    # Los índices se crean después de copiar: construirlos de una vez es más rápido.
+    op.create_index(
+        'ix_inventory_movements_item_created',
+        'inventory_movements',
+        ['inventoryItemId', sa.text('"createdAt" DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+    op.create_index('ix_inventory_movements_created_id', 'inventory_movements', ['createdAt', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    _rename_current('inventory_movements_partitioned')
+    _create_movements_table(partitioned=False)
+    op.execute(sa.text(f'INSERT INTO inventory_movements ({_COLUMNS}) SELECT {_COLUMNS} FROM inventory_movements_partitioned'))
+    # Eliminar la tabla padre elimina también sus particiones adjuntas (y sus índices).
+    op.drop_table('inventory_movements_partitioned')
+    op.create_index(op.f('ix_inventory_movements_createdAt'), 'inventory_movements', ['createdAt'], unique=False)
@@ -0,0 +1,80 @@
+"""rfid_tags unique epc
+
+Revision ID: 695882cf6608
+Revises: 5a0f6deccbad
+Create Date: 2026-10-17 09:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '695882cf6608'
+down_revision: Union[str, None] = '5a0f6deccbad'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # La ingesta masiva usa `INSERT ... ON CONFLICT (epc)`, que exige un índice único.
+    # Antes de crearlo se fusionan EPC duplicados: se conserva el tag vinculado a un item
+    # (o el más antiguo) y se le reasignan las detecciones de los demás. Si un mismo EPC
+    # está vinculado a items distintos no hay uno correcto que conservar: se detiene la
+    # migración para que se resuelva a mano.
+    conflicts = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                '''
+                SELECT epc FROM rfid_tags
+                WHERE "inventoryItemId" IS NOT NULL
+                GROUP BY epc
+                HAVING count(DISTINCT "inventoryItemId") > 1
+                ORDER BY epc
+                '''
+            )
+        )
+        .scalars()
+        .all()
+    )
+    if conflicts:
+        raise RuntimeError(
+            'EPC duplicados vinculados a items distintos; desvincule los tags sobrantes '
+            f'antes de migrar: {", ".join(conflicts)}'
+        )
+    op.execute(
+        sa.text(
+            '''
+            CREATE TEMPORARY TABLE rfid_tag_duplicates AS
+            SELECT id, keep_id FROM (
+                SELECT id,
+                       first_value(id) OVER (
+                           PARTITION BY epc
+                           ORDER BY ("inventoryItemId" IS NULL), "createdAt", id
+                       ) AS keep_id
+                FROM rfid_tags
+            ) ranked
+            WHERE id <> keep_id
+            '''
+        )
+    )
+    op.execute(
+        sa.text(
+            '''
+            UPDATE rfid_detections AS d
+            SET "rfidTagId" = dup.keep_id
+            FROM rfid_tag_duplicates AS dup
+            WHERE d."rfidTagId" = dup.id
+            '''
+        )
+    )
+    op.execute(sa.text('DELETE FROM rfid_tags AS t USING rfid_tag_duplicates AS dup WHERE t.id = dup.id'))
+    op.execute(sa.text('DROP TABLE rfid_tag_duplicates'))
+    op.create_index(op.f('ix_rfid_tags_epc'), 'rfid_tags', ['epc'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_rfid_tags_epc'), table_name='rfid_tags')
@@ -0,0 +1,34 @@
+"""rfid_detections debounce aggregates
+
+Revision ID: 9bdac073259b
+Revises: 695882cf6608
+Create Date: 2026-10-17 19:48:02.114306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9bdac073259b'
+down_revision: Union[str, None] = '695882cf6608'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('rfid_detections', sa.Column('lastSeenAt', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('rfid_detections', sa.Column('readCount', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('rfid_detections', sa.Column('rssiMax', sa.Integer(), nullable=True))
+    op.add_column('rfid_detections', sa.Column('rssiAvg', sa.Float(), nullable=True))
+    # Las detecciones previas equivalen a ventanas de una sola lectura.
+    op.execute(sa.text('UPDATE rfid_detections SET "lastSeenAt" = "timestamp", "rssiMax" = rssi, "rssiAvg" = rssi'))
+
+
+def downgrade() -> None:
+    op.drop_column('rfid_detections', 'rssiAvg')
+    op.drop_column('rfid_detections', 'rssiMax')
+    op.drop_column('rfid_detections', 'readCount')
+    op.drop_column('rfid_detections', 'lastSeenAt')
@@ -0,0 +1,80 @@
+"""partition rfid_detections by timestamp
+
+Revision ID: f49ae32d66a2
+Revises: 9bdac073259b
+Create Date: 2026-10-17 20:21:37.640912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+from app.infrastructure.common.partitions import ensure_partitions
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f49ae32d66a2'
+down_revision: Union[str, None] = '9bdac073259b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = '"id", "rfidTagId", "readerId", "readerName", rssi, direction, "timestamp", "lastSeenAt", "readCount", "rssiMax", "rssiAvg"'
+
+
+def _create_detections_table(partitioned: bool) -> None:
+    op.create_table(
+        'rfid_detections',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('rfidTagId', sa.String(), nullable=False),
+        sa.Column('readerId', sa.String(), nullable=False),
+        sa.Column('readerName', sa.String(), nullable=True),
+        sa.Column('rssi', sa.Integer(), nullable=True),
+        sa.Column('direction', sa.String(), nullable=True),
+        sa.Column('timestamp', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('lastSeenAt', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('readCount', sa.Integer(), server_default='1', nullable=False),
+        sa.Column('rssiMax', sa.Integer(), nullable=True),
+        sa.Column('rssiAvg', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['rfidTagId'], ['rfid_tags.id'], ondelete='CASCADE', name='rfid_detections_rfidTagId_fkey'),
+        sa.PrimaryKeyConstraint(*(['id', 'timestamp'] if partitioned else ['id']), name='rfid_detections_pkey'),
+        **({'postgresql_partition_by': 'RANGE ("timestamp")'} if partitioned else {}),
+    )
+
+
+def _rename_current(new_name: str) -> None:
+    # El nombre del índice de la PK es global al esquema: se libera antes de recrear la tabla.
+    op.rename_table('rfid_detections', new_name)
+    op.execute(sa.text(f'ALTER TABLE {new_name} RENAME CONSTRAINT rfid_detections_pkey TO {new_name}_pkey'))
+
+
+def upgrade() -> None:
+    # Se crea la tabla particionada al lado de la actual, se crean particiones para
+    # todo el rango de datos existente (más los periodos futuros configurados) y se
+    # copian las filas: PostgreSQL las enruta a su partición.
+    _rename_current('rfid_detections_legacy')
+    _create_detections_table(partitioned=True)
+    op.execute(sa.text('CREATE TABLE rfid_detections_default PARTITION OF rfid_detections DEFAULT'))
+
+    bind = op.get_bind()
+    oldest = bind.execute(sa.text('SELECT min("timestamp") FROM rfid_detections_legacy')).scalar()
+    ensure_partitions(
+        bind,
+        'rfid_detections',
+        'timestamp',
+        settings.rfid_detections_partition_interval,
+        ahead=settings.rfid_detections_partitions_ahead,
+        since=oldest,
+    )
+
+    op.execute(sa.text(f'INSERT INTO rfid_detections ({_COLUMNS}) SELECT {_COLUMNS} FROM rfid_detections_legacy'))
+    op.drop_table('rfid_detections_legacy')
+
+
+def downgrade() -> None:
+    _rename_current('rfid_detections_partitioned')
+    _create_detections_table(partitioned=False)
+    op.execute(sa.text(f'INSERT INTO rfid_detections ({_COLUMNS}) SELECT {_COLUMNS} FROM rfid_detections_partitioned'))
+    # Eliminar la tabla padre elimina también sus particiones adjuntas.
+    op.drop_table('rfid_detections_partitioned')
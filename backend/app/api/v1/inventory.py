@@ -3,38 +3,62 @@
 Traduce request/response entre FastAPI y la capa de composición.
 """
 
-from fastapi import APIRouter, Depends, Query, status
+from collections.abc import Iterator
+from datetime import UTC, datetime
+
+from fastapi import APIRouter, Depends, File, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_module_edit, require_module_view
 from app.composition.inventory import (
     AlreadyCheckedInError,
     AlreadyCheckedOutError,
+    ContainerCycleError,
     ContainerHasItemsError,
     DuplicateAssetTagError,
     DuplicateSerialError,
     InvalidDateFormatError,
+    InvalidImportFileError,
     InvalidInventoryFiltersError,
     InvalidInventoryPayloadError,
     InventoryItemNotFoundError,
     InventoryPersistenceError,
+    ItemGroupNotFoundError,
     LostItemCheckOutError,
     ProductNotFoundOrInactiveError,
+    bulk_check_in,
+    bulk_check_out,
     check_in,
     check_out,
     create_item,
     delete_item,
+    export_items_csv,
+    export_movements_csv,
     get_item,
+    get_item_state,
+    get_item_tree,
+    import_items,
     list_items,
+    list_items_page,
     list_movements,
+    search_items,
     summary,
+    summary_as_of,
     update_item,
 )
 from app.core.exceptions import bad_request, not_found
 from app.db.session import get_db
-from app.domain.inventory.entities import CheckInOutInput, InventoryItemInput, InventoryListFilters, MovementListFilters
+from app.domain.inventory.entities import (
+    BulkCheckInOutInput,
+    CheckInOutInput,
+    InventoryItemInput,
+    InventoryListFilters,
+    MovementExportFilters,
+    MovementListFilters,
+)
 from app.domain.access_control.ports import AccessUser
-from app.schemas.inventory import CheckInOutRequest, InventoryItemCreateUpdateRequest
+from app.schemas.inventory import BulkCheckInOutRequest, CheckInOutRequest, InventoryItemCreateUpdateRequest
 
 router = APIRouter(prefix='/inventory', tags=['inventory'])
 
@@ -64,6 +88,26 @@ def _parse_check_in_out(payload: dict) -> CheckInOutInput:
     )
 
 
+def _parse_bulk_check_in_out(payload: dict) -> BulkCheckInOutInput:
+    return BulkCheckInOutInput(
+        item_ids=payload.get('itemIds') or [],
+        container_id=payload.get('containerId'),
+        group_id=payload.get('groupId'),
+        location=payload.get('location'),
+        reason=payload.get('reason'),
+        reference=payload.get('reference'),
+    )
+
+
+def _csv_response(chunks: Iterator[bytes], name: str) -> StreamingResponse:
+    filename = f'{name}-{datetime.now(UTC):%Y%m%d-%H%M%S}.csv'
+    return StreamingResponse(
+        chunks,
+        media_type='text/csv; charset=utf-8',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get('')
 def list_inventory_items(
     search: str = '',
@@ -71,20 +115,68 @@ def list_inventory_items(
     type_filter: str = Query('', alias='type'),
     product_id: str = Query('', alias='productId'),
     container_id: str = Query('', alias='containerId'),
+    limit: int | None = None,
+    cursor: str | None = None,
+    sort: str = '-createdAt',
+    include_total: bool = Query(False, alias='includeTotal'),
     _: AccessUser = Depends(require_module_view('items')),
     db: Session = Depends(get_db),
 ):
+    filters = InventoryListFilters(
+        search=search,
+        status_filter=status_filter,
+        type_filter=type_filter,
+        product_id=product_id,
+        container_id=container_id,
+        limit=limit,
+        cursor=cursor,
+        sort=sort,
+        include_total=include_total,
+    )
     try:
-        return list_items(
-            db,
-            filters=InventoryListFilters(
-                search=search,
-                status_filter=status_filter,
-                type_filter=type_filter,
-                product_id=product_id,
-                container_id=container_id,
-            ),
-        )
+        # Sin `limit` ni `cursor` se mantiene la respuesta histórica: la lista completa.
+        if limit is None and cursor is None:
+            return list_items(db, filters=filters)
+        if limit is None:
+            filters.limit = 50
+        return list_items_page(db, filters=filters)
+    except InvalidInventoryFiltersError as exc:
+        raise bad_request(str(exc))
+
+
+@router.get('/export')
+def export_inventory_items(
+    search: str = '',
+    status_filter: str = Query('', alias='status'),
+    type_filter: str = Query('', alias='type'),
+    product_id: str = Query('', alias='productId'),
+    container_id: str = Query('', alias='containerId'),
+    sort: str = '-createdAt',
+    _: AccessUser = Depends(require_module_view('items')),
+):
+    filters = InventoryListFilters(
+        search=search,
+        status_filter=status_filter,
+        type_filter=type_filter,
+        product_id=product_id,
+        container_id=container_id,
+        sort=sort,
+    )
+    try:
+        return _csv_response(export_items_csv(filters=filters), 'inventario')
+    except InvalidInventoryFiltersError as exc:
+        raise bad_request(str(exc))
+
+
+@router.get('/search')
+def search_inventory_items(
+    q: str,
+    limit: int = 20,
+    _: AccessUser = Depends(require_module_view('items')),
+    db: Session = Depends(get_db),
+):
+    try:
+        return search_items(db, query=q, limit=limit)
     except InvalidInventoryFiltersError as exc:
         raise bad_request(str(exc))
 
@@ -111,11 +203,40 @@ def create_inventory_item(
         raise bad_request(str(exc))
 
 
+@router.post('/import')
+def import_inventory_items(
+    file: UploadFile = File(...),
+    fmt: str | None = Query(None, alias='format'),
+    dry_run: bool = Query(False, alias='dryRun'),
+    current_user: AccessUser = Depends(require_module_edit('items')),
+    db: Session = Depends(get_db),
+):
+    # El archivo se lee por filas desde el temporal de la subida, sin cargarlo entero.
+    try:
+        return import_items(
+            db,
+            stream=file.file,
+            fmt=fmt,
+            filename=file.filename,
+            content_type=file.content_type,
+            user_id=current_user.id,
+            dry_run=dry_run,
+        )
+    except InvalidImportFileError as exc:
+        raise bad_request(str(exc))
+    except InvalidInventoryPayloadError as exc:
+        raise bad_request(str(exc))
+
+
 @router.get('/summary')
 def inventory_summary(
+    as_of: datetime | None = Query(None, alias='asOf'),
     _: AccessUser = Depends(require_module_view('inventario')),
     db: Session = Depends(get_db),
 ):
+    # Con `asOf` se reconstruyen los conteos en esa fecha (sin movimientos recientes).
+    if as_of is not None:
+        return summary_as_of(db, as_of=as_of)
     return summary(db)
 
 
@@ -125,6 +246,10 @@ def list_movements_route(
     inventory_item_id: str = Query('', alias='inventoryItemId'),
     limit: int = 50,
     offset: int = 0,
+    cursor: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    include_total: bool = Query(False, alias='includeTotal'),
     _: AccessUser = Depends(require_module_view('movimientos')),
     db: Session = Depends(get_db),
 ):
@@ -136,12 +261,63 @@ def list_movements_route(
                 inventory_item_id=inventory_item_id,
                 limit=limit,
                 offset=offset,
+                cursor=cursor,
+                since=since,
+                until=until,
+                include_total=include_total,
             ),
         )
     except InvalidInventoryFiltersError as exc:
         raise bad_request(str(exc))
 
 
+@router.get('/movements/export')
+def export_movements_route(
+    type_filter: str = Query('', alias='type'),
+    inventory_item_id: str = Query('', alias='inventoryItemId'),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    _: AccessUser = Depends(require_module_view('movimientos')),
+):
+    filters = MovementExportFilters(type_filter=type_filter, inventory_item_id=inventory_item_id, since=since, until=until)
+    try:
+        return _csv_response(export_movements_csv(filters=filters), 'movimientos')
+    except InvalidInventoryFiltersError as exc:
+        raise bad_request(str(exc))
+
+
+@router.post('/bulk/check-in')
+def bulk_check_in_route(
+    payload: BulkCheckInOutRequest,
+    current_user: AccessUser = Depends(require_module_edit('items')),
+    db: Session = Depends(get_db),
+):
+    try:
+        return bulk_check_in(db, payload=_parse_bulk_check_in_out(payload.model_dump()), user_id=current_user.id)
+    except InvalidInventoryPayloadError as exc:
+        raise bad_request(str(exc))
+    except InventoryItemNotFoundError as exc:
+        raise not_found(str(exc))
+    except ItemGroupNotFoundError as exc:
+        raise not_found(str(exc))
+
+
+@router.post('/bulk/check-out')
+def bulk_check_out_route(
+    payload: BulkCheckInOutRequest,
+    current_user: AccessUser = Depends(require_module_edit('items')),
+    db: Session = Depends(get_db),
+):
+    try:
+        return bulk_check_out(db, payload=_parse_bulk_check_in_out(payload.model_dump()), user_id=current_user.id)
+    except InvalidInventoryPayloadError as exc:
+        raise bad_request(str(exc))
+    except InventoryItemNotFoundError as exc:
+        raise not_found(str(exc))
+    except ItemGroupNotFoundError as exc:
+        raise not_found(str(exc))
+
+
 @router.get('/{item_id}')
 def get_inventory_item(
     item_id: str,
@@ -156,6 +332,35 @@ def get_inventory_item(
         raise not_found(str(exc))
 
 
+@router.get('/{item_id}/tree')
+def get_inventory_item_tree(
+    item_id: str,
+    _: AccessUser = Depends(require_module_view('items')),
+    db: Session = Depends(get_db),
+):
+    try:
+        return get_item_tree(db, item_id)
+    except InvalidInventoryFiltersError as exc:
+        raise bad_request(str(exc))
+    except InventoryItemNotFoundError as exc:
+        raise not_found(str(exc))
+
+
+@router.get('/{item_id}/state')
+def get_inventory_item_state(
+    item_id: str,
+    as_of: datetime = Query(alias='asOf'),
+    _: AccessUser = Depends(require_module_view('items')),
+    db: Session = Depends(get_db),
+):
+    try:
+        return get_item_state(db, item_id, as_of=as_of)
+    except InvalidInventoryFiltersError as exc:
+        raise bad_request(str(exc))
+    except InventoryItemNotFoundError as exc:
+        raise not_found(str(exc))
+
+
 @router.put('/{item_id}')
 def update_inventory_item(
     item_id: str,
@@ -177,6 +382,8 @@ def update_inventory_item(
         raise bad_request(str(exc))
     except DuplicateAssetTagError as exc:
         raise bad_request(str(exc))
+    except ContainerCycleError as exc:
+        raise bad_request(str(exc))
     except InventoryPersistenceError as exc:
         raise bad_request(str(exc))
 
@@ -3,38 +3,79 @@
 Traduce request/response entre FastAPI y la capa de composición.
 """
 
-from fastapi import APIRouter, Depends, Query
+import asyncio
+import json
+import logging
+import time
+from contextlib import suppress
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Header, Query, Response, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app.api.deps import require_module_edit, require_module_view
 from app.composition.rfid import (
     DuplicateEpcError,
+    IngestBatchNotFoundError,
+    IngestQueueFullError,
+    InvalidActivityFilterError,
     InvalidApiKeyError,
+    InvalidCursorError,
     InvalidTimestampError,
     InventoryItemAlreadyLinkedError,
     InventoryItemNotFoundError,
     TagAlreadyLinkedError,
     TagNotFoundError,
+    authenticate_reader,
+    close_stream,
     create_tag,
+    debounce_stats,
     delete_tag,
+    direction_stats,
+    enqueue_read,
     enroll_tag,
+    epc_cache_stats,
+    get_ingest_batch,
     get_tag,
+    ingest_queue_stats,
+    list_activity,
     list_detections,
+    list_readers,
     list_tags,
     list_unknown_tags,
+    live_feed_stats,
+    open_stream,
     process_read,
+    process_stream_window,
+    record_stream_ack,
+    record_stream_error,
+    record_stream_message,
+    stream_stats,
+    subscribe_detections,
     unenroll_tag,
+    unsubscribe_detections,
     update_tag,
 )
 from app.core.config import settings
-from app.core.exceptions import bad_request, not_found, unauthorized
+from app.core.exceptions import bad_request, not_found, service_unavailable, unauthorized
 from app.db.session import get_db
-from app.domain.rfid.entities import DetectionFilters, TagFilters
+from app.domain.rfid.entities import ActivityFilters, DetectionFilters, TagFilters
 from app.domain.access_control.ports import AccessUser
 from app.domain.rfid.read_models import RfidTagPayload
-from app.schemas.rfid import RfidEnrollmentRequest, RfidReadRequest, RfidTagCreateUpdateRequest
+from app.schemas.rfid import (
+    RfidEnrollmentRequest,
+    RfidReadRequest,
+    RfidStreamHello,
+    RfidStreamMessage,
+    RfidTagCreateUpdateRequest,
+)
 
 router = APIRouter(prefix='/rfid', tags=['rfid'])
+logger = logging.getLogger(__name__)
 
 
 def _parse_tag_payload(payload: dict) -> RfidTagPayload:
@@ -92,13 +133,41 @@ def list_unknown_tags_route(
 @router.get('/tags/{tag_id}')
 def get_tag_route(
     tag_id: str,
+    before: str | None = None,
     _: AccessUser = Depends(require_module_view('rfid')),
     db: Session = Depends(get_db),
 ):
     try:
-        return get_tag(db, tag_id)
+        return get_tag(db, tag_id, before=before)
     except TagNotFoundError as exc:
         raise not_found(str(exc))
+    except InvalidCursorError as exc:
+        raise bad_request(str(exc))
+
+
+@router.get('/tags/{tag_id}/activity')
+def tag_activity_route(
+    tag_id: str,
+    reader_id: str = Query('', alias='readerId'),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    granularity: str = 'hour',
+    _: AccessUser = Depends(require_module_view('rfid')),
+    db: Session = Depends(get_db),
+):
+    try:
+        return list_activity(
+            db,
+            filters=ActivityFilters(
+                rfid_tag_id=tag_id,
+                reader_id=reader_id,
+                since=since,
+                until=until,
+                granularity=granularity,
+            ),
+        )
+    except InvalidActivityFilterError as exc:
+        raise bad_request(str(exc))
 
 
 @router.put('/tags/{tag_id}')
@@ -166,29 +235,317 @@ def list_detections_route(
     direction: str = '',
     limit: int = 100,
     offset: int = 0,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    cursor: str | None = None,
+    include_total: bool = Query(False, alias='includeTotal'),
+    _: AccessUser = Depends(require_module_view('rfid')),
+    db: Session = Depends(get_db),
+):
+    try:
+        return list_detections(
+            db,
+            filters=DetectionFilters(
+                rfid_tag_id=rfid_tag_id,
+                reader_id=reader_id,
+                direction=direction,
+                limit=limit,
+                offset=offset,
+                since=since,
+                until=until,
+                cursor=cursor,
+                include_total=include_total,
+            ),
+        )
+    except InvalidCursorError as exc:
+        raise bad_request(str(exc))
+
+
+@router.get('/detections/stream')
+async def detections_stream_route(
+    rfid_tag_id: str = Query('', alias='rfidTagId'),
+    reader_id: str = Query('', alias='readerId'),
+    direction: str = '',
     _: AccessUser = Depends(require_module_view('rfid')),
     db: Session = Depends(get_db),
 ):
-    return list_detections(
-        db,
-        filters=DetectionFilters(
-            rfid_tag_id=rfid_tag_id,
-            reader_id=reader_id,
-            direction=direction,
-            limit=limit,
-            offset=offset,
-        ),
+    """Feed en vivo (Server-Sent Events) de las lecturas confirmadas por la ingesta.
+
+    Eventos: `detection` (un JSON por lectura) y `dropped` si el cliente no consumió
+    a tiempo y se cerró su suscripción. Cada `RFID_LIVE_FEED_KEEPALIVE_SECONDS` sin
+    eventos se envía un comentario para mantener viva la conexión.
+    """
+    # La sesión solo se usó para autenticar: se libera antes de abrir el stream para
+    # no retener una conexión del pool por cada espectador.
+    await run_in_threadpool(db.close)
+    subscription = subscribe_detections(reader_id=reader_id, rfid_tag_id=rfid_tag_id, direction=direction)
+    if subscription is None:
+        raise service_unavailable('Demasiados suscriptores al feed en vivo', retry_after=settings.rfid_live_feed_keepalive_seconds)
+
+    async def events():
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=settings.rfid_live_feed_keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                # Lo que ya esté en cola sale en el mismo envío.
+                batch = [event]
+                while batch[-1] is not None and not subscription.queue.empty():
+                    batch.append(subscription.queue.get_nowait())
+                chunk = ''.join(
+                    f'event: detection\ndata: {json.dumps(jsonable_encoder(item))}\n\n' for item in batch if item is not None
+                )
+                if batch[-1] is None:
+                    yield chunk + 'event: dropped\ndata: {"message": "Cliente demasiado lento, reconecta"}\n\n'
+                    return
+                yield chunk
+        finally:
+            unsubscribe_detections(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
     )
 
 
+@router.get('/detections/stream/subscribers')
+def live_feed_stats_route(
+    _: AccessUser = Depends(require_module_view('rfid')),
+):
+    return live_feed_stats()
+
+
+@router.get('/activity')
+def activity_route(
+    rfid_tag_id: str = Query('', alias='rfidTagId'),
+    reader_id: str = Query('', alias='readerId'),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    granularity: str = 'hour',
+    _: AccessUser = Depends(require_module_view('rfid')),
+    db: Session = Depends(get_db),
+):
+    try:
+        return list_activity(
+            db,
+            filters=ActivityFilters(
+                rfid_tag_id=rfid_tag_id,
+                reader_id=reader_id,
+                since=since,
+                until=until,
+                granularity=granularity,
+            ),
+        )
+    except InvalidActivityFilterError as exc:
+        raise bad_request(str(exc))
+
+
+@router.get('/cache')
+def epc_cache_stats_route(
+    _: AccessUser = Depends(require_module_view('rfid')),
+):
+    return epc_cache_stats()
+
+
+@router.get('/debounce')
+def debounce_stats_route(
+    _: AccessUser = Depends(require_module_view('rfid')),
+):
+    return debounce_stats()
+
+
+@router.get('/readers')
+def list_readers_route(
+    _: AccessUser = Depends(require_module_view('rfid')),
+):
+    return list_readers()
+
+
+@router.get('/direction')
+def direction_stats_route(
+    _: AccessUser = Depends(require_module_view('rfid')),
+):
+    return direction_stats()
+
+
+@router.get('/read/queue')
+def ingest_queue_stats_route(
+    _: AccessUser = Depends(require_module_view('rfid')),
+):
+    return ingest_queue_stats()
+
+
 @router.post('/read')
 def process_read_route(
     payload: RfidReadRequest,
+    response: Response,
     db: Session = Depends(get_db),
 ):
     try:
+        if settings.rfid_ingest_mode == 'async':
+            batch = enqueue_read(db, payload=_parse_read_payload(payload.model_dump()), api_key=settings.rfid_api_key)
+            response.status_code = status.HTTP_202_ACCEPTED
+            return batch
         return process_read(db, payload=_parse_read_payload(payload.model_dump()), api_key=settings.rfid_api_key)
     except InvalidApiKeyError as exc:
         raise unauthorized(str(exc))
     except InvalidTimestampError as exc:
         raise bad_request(str(exc))
+    except IngestQueueFullError as exc:
+        raise service_unavailable(str(exc), retry_after=settings.rfid_ingest_retry_after_seconds)
+
+
+@router.get('/read/batches/{batch_id}')
+def get_ingest_batch_route(
+    batch_id: str,
+    x_api_key: str = Header('', alias='X-Api-Key'),
+    db: Session = Depends(get_db),
+):
+    try:
+        return get_ingest_batch(db, batch_id=batch_id, provided_api_key=x_api_key, api_key=settings.rfid_api_key)
+    except InvalidApiKeyError as exc:
+        raise unauthorized(str(exc))
+    except IngestBatchNotFoundError as exc:
+        raise not_found(str(exc))
+
+
+@router.get('/read/stream/connections')
+def stream_stats_route(
+    _: AccessUser = Depends(require_module_view('rfid')),
+):
+    return stream_stats()
+
+
+@router.websocket('/read/stream')
+async def read_stream_route(websocket: WebSocket):
+    """Canal persistente de ingesta para lectores continuos.
+
+    Protocolo (un JSON por mensaje):
+    - Lector -> `{"readerId", "readerName"?, "apiKey"}` una sola vez al conectar.
+    - Servidor -> `{"type": "ready", "connectionId", "ackReads", "ackIntervalMs"}`.
+    - Lector -> `{"seq"?, "reads": [...]}` (mismo formato de lectura que `POST /read`).
+    - Servidor -> `{"type": "ack", "seq", "processed", "newTags", "inventoryUpdated"}`
+      cada `ackReads` lecturas o `ackIntervalMs` ms, cuando la ventana ya está persistida.
+    - Servidor -> `{"type": "error", "seq", "message"}` si un mensaje o ventana falla. Una
+      ventana que no se pudo persistir no queda guardada: el lector reenvía lo enviado
+      después del último `ack` y la conexión sigue abierta.
+    """
+    await websocket.accept()
+    try:
+        hello = RfidStreamHello.model_validate_json(await websocket.receive_text())
+        authenticate_reader(provided_api_key=hello.apiKey, api_key=settings.rfid_api_key)
+    except (ValidationError, InvalidApiKeyError) as exc:
+        message = str(exc) if isinstance(exc, InvalidApiKeyError) else 'Mensaje de conexion invalido'
+        await websocket.send_json({'type': 'error', 'seq': None, 'message': message})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    except WebSocketDisconnect:
+        return
+
+    connection_id = open_stream(reader_id=hello.readerId, reader_name=hello.readerName)
+    ack_interval = settings.rfid_stream_ack_interval_ms / 1000
+    await websocket.send_json(
+        {
+            'type': 'ready',
+            'connectionId': connection_id,
+            'ackReads': settings.rfid_stream_ack_reads,
+            'ackIntervalMs': settings.rfid_stream_ack_interval_ms,
+        }
+    )
+
+    pending: list[dict] = []
+    pending_seq: int | None = None
+    received = 0
+    window_started = time.monotonic()
+
+    async def flush() -> None:
+        nonlocal pending, pending_seq
+        reads, seq = pending, pending_seq
+        pending, pending_seq = [], None
+        started = time.perf_counter()
+        try:
+            result = await run_in_threadpool(
+                process_stream_window,
+                payload={'readerId': hello.readerId, 'readerName': hello.readerName, 'reads': reads, 'apiKey': hello.apiKey},
+                api_key=settings.rfid_api_key,
+            )
+        except InvalidTimestampError as exc:
+            record_stream_error(connection_id)
+            await websocket.send_json({'type': 'error', 'seq': seq, 'message': str(exc)})
+            return
+        except Exception:
+            # La transacción se revirtió (base caída, deadlock, ...): se avisa para que
+            # el lector reenvíe la ventana en lugar de perderla en silencio.
+            logger.exception('No se pudo persistir la ventana %s del lector %s (%d lecturas)', seq, hello.readerId, len(reads))
+            record_stream_error(connection_id)
+            await websocket.send_json({'type': 'error', 'seq': seq, 'message': 'No se pudieron guardar las lecturas; reenviarlas'})
+            return
+        record_stream_ack(connection_id, processed=result['processed'], elapsed_ms=(time.perf_counter() - started) * 1000)
+        await websocket.send_json(
+            {
+                'type': 'ack',
+                'seq': seq,
+                'processed': result['processed'],
+                'newTags': sum(1 for row in result['results'] if row['isNew']),
+                'inventoryUpdated': sum(1 for row in result['results'] if row['inventoryUpdated']),
+            }
+        )
+
+    try:
+        while True:
+            timeout = max(window_started + ack_interval - time.monotonic(), 0) if pending else None
+            try:
+                raw = await asyncio.wait_for(websocket.receive_text(), timeout=timeout)
+            except asyncio.TimeoutError:
+                await flush()
+                continue
+
+            received += 1
+            try:
+                message = RfidStreamMessage.model_validate_json(raw)
+            except ValidationError:
+                record_stream_error(connection_id)
+                seq = _message_seq(raw)
+                await websocket.send_json({'type': 'error', 'seq': seq, 'message': 'Mensaje de lecturas invalido'})
+                continue
+
+            if not pending:
+                window_started = time.monotonic()
+            pending.extend(read.model_dump() for read in message.reads)
+            pending_seq = message.seq if message.seq is not None else received
+            record_stream_message(connection_id, reads=len(message.reads))
+            if len(pending) >= settings.rfid_stream_ack_reads:
+                await flush()
+    except WebSocketDisconnect:
+        # Lo ya recibido se persiste aunque el lector no espere la confirmación.
+        if pending:
+            try:
+                await run_in_threadpool(
+                    process_stream_window,
+                    payload={'readerId': hello.readerId, 'readerName': hello.readerName, 'reads': pending, 'apiKey': hello.apiKey},
+                    api_key=settings.rfid_api_key,
+                )
+            except InvalidTimestampError:
+                record_stream_error(connection_id)
+            except Exception:
+                # Ya no hay a quién avisar: queda al menos registrado.
+                logger.exception('Se perdieron %d lecturas del lector %s al desconectarse', len(pending), hello.readerId)
+                record_stream_error(connection_id)
+    except Exception:
+        logger.exception('Error inesperado en el canal de lecturas del lector %s', hello.readerId)
+        record_stream_error(connection_id)
+        with suppress(RuntimeError):
+            await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+    finally:
+        close_stream(connection_id)
+
+
+def _message_seq(raw: str) -> int | None:
+    try:
+        seq = json.loads(raw).get('seq')
+    except (ValueError, AttributeError):
+        return None
+    return seq if isinstance(seq, int) else None
@@ -6,7 +6,19 @@ Responsabilidad de esta capa:
 - devolver errores de dominio claros.
 """
 
-from app.domain.inventory.entities import CheckInOutInput, InventoryItemInput, InventoryListFilters, MovementListFilters
+from collections.abc import Iterable, Iterator
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+
+from app.domain.inventory.entities import (
+    BulkCheckInOutInput,
+    CheckInOutInput,
+    InventoryImportRow,
+    InventoryItemInput,
+    InventoryListFilters,
+    MovementExportFilters,
+    MovementListFilters,
+)
 from app.domain.inventory.errors import (
     AlreadyCheckedInError,
     AlreadyCheckedOutError,
@@ -18,16 +30,35 @@ from app.domain.inventory.errors import (
 )
 from app.domain.inventory.ports import InventoryRepository, UnitOfWork
 from app.domain.inventory.read_models import (
+    InventoryAsOfSummaryView,
+    InventoryBulkCheckInOutResult,
     InventoryCheckInOutResult,
+    InventoryExportView,
+    InventoryImportErrorView,
+    InventoryImportResultView,
+    InventoryItemsPageView,
+    InventoryItemStateView,
     InventoryItemView,
     InventoryMovementsPageView,
     InventoryMutationResult,
+    InventorySearchHitView,
+    InventorySnapshotView,
     InventorySummaryView,
+    InventoryTreeNodeView,
 )
 
 ALLOWED_ITEM_STATUSES = {'IN', 'OUT', 'MAINTENANCE', 'LOST'}
 ALLOWED_ITEM_TYPES = {'UNIT', 'CONTAINER'}
-ALLOWED_MOVEMENT_TYPES = {'CHECK_IN', 'CHECK_OUT', 'ADJUSTMENT', 'ENROLLMENT', 'TRANSFER'}
+ALLOWED_ITEM_SORTS = {'createdAt', '-createdAt'}
+ALLOWED_MOVEMENT_TYPES = {'CHECK_IN', 'CHECK_OUT', 'ADJUSTMENT', 'ENROLLMENT', 'TRANSFER', 'RFID_CHECK_IN', 'RFID_CHECK_OUT'}
+# Errores por fila que se devuelven en el reporte de importación (el total va en `failed`).
+MAX_IMPORT_ERRORS = 1000
+MAX_BULK_ITEM_IDS = 1000
+# Las fotos del inventario se toman con este desfase: un movimiento lleva como `createdAt`
+# el inicio de su transacción y, si aún no confirmó, quedaría fuera de la foto. Además el
+# repositorio retrocede el corte hasta antes de la transacción abierta más antigua (p. ej.
+# una importación larga); el desfase cubre las sesiones que la base no deja ver.
+SNAPSHOT_LAG = timedelta(minutes=5)
 
 
 class InventoryUseCases:
@@ -38,13 +69,24 @@ class InventoryUseCases:
         self._uow = uow
 
     def list_items(self, filters: InventoryListFilters) -> list[InventoryItemView]:
-        # Validamos filtros aquí para no pasar datos inválidos al repositorio.
-        if filters.status_filter and filters.status_filter not in ALLOWED_ITEM_STATUSES:
-            raise InvalidInventoryFiltersError('Filtro de estado invalido')
-        if filters.type_filter and filters.type_filter not in ALLOWED_ITEM_TYPES:
-            raise InvalidInventoryFiltersError('Filtro de tipo invalido')
+        self._validate_item_filters(filters)
         return self._repo.list_items(filters)
 
+    def list_items_page(self, filters: InventoryListFilters) -> InventoryItemsPageView:
+        self._validate_item_filters(filters)
+        if filters.limit is None or filters.limit <= 0 or filters.limit > 200:
+            raise InvalidInventoryFiltersError('El limite debe estar entre 1 y 200')
+        return self._repo.list_items_page(filters)
+
+    def search_items(self, query: str, limit: int) -> list[InventorySearchHitView]:
+        query = query.strip()
+        # Con menos de 2 caracteres casi todo coincide y los índices trigram no ayudan.
+        if len(query) < 2:
+            raise InvalidInventoryFiltersError('La busqueda requiere al menos 2 caracteres')
+        if limit <= 0 or limit > 50:
+            raise InvalidInventoryFiltersError('El limite debe estar entre 1 y 50')
+        return self._repo.search_items(query, limit)
+
     def create_item(self, payload: InventoryItemInput, user_id: str) -> InventoryItemView:
         # Se valida negocio antes de tocar persistencia.
         self._validate_payload(payload)
@@ -62,9 +104,83 @@ class InventoryUseCases:
                 raise
             raise
 
+    def import_items(
+        self,
+        rows: Iterable[InventoryImportRow],
+        user_id: str,
+        batch_size: int,
+        dry_run: bool = False,
+    ) -> InventoryImportResultView:
+        """Crea en bloque los items válidos y reporta los inválidos por línea.
+
+        Las filas se validan a medida que se leen y el repositorio las inserta por
+        lotes; todo queda en una transacción que se confirma al final (o se revierte
+        con `dry_run`). Un archivo ilegible aborta la importación completa.
+        """
+        if not user_id:
+            raise InvalidInventoryPayloadError('Usuario invalido')
+        if batch_size <= 0:
+            raise InvalidInventoryPayloadError('Tamano de lote invalido')
+        errors: list[InventoryImportErrorView] = []
+        received = 0
+
+        def valid_rows() -> Iterator[InventoryImportRow]:
+            nonlocal received
+            for row in rows:
+                received += 1
+                if row.error or row.item is None:
+                    errors.append({'line': row.line, 'message': row.error or 'Fila invalida'})
+                    continue
+                try:
+                    self._validate_import_row(row)
+                except InvalidInventoryPayloadError as exc:
+                    errors.append({'line': row.line, 'message': str(exc)})
+                    continue
+                yield row
+
+        try:
+            written = self._repo.import_items(valid_rows(), user_id, batch_size)
+            if dry_run:
+                self._uow.rollback()
+            else:
+                self._uow.commit()
+        except Exception:
+            self._uow.rollback()
+            raise
+
+        errors.extend(written['errors'])
+        errors.sort(key=lambda error: error['line'])
+        return {
+            'received': received,
+            'created': written['created'],
+            'failed': len(errors),
+            'dryRun': dry_run,
+            'errors': errors[:MAX_IMPORT_ERRORS],
+            'errorsTruncated': len(errors) > MAX_IMPORT_ERRORS,
+        }
+
     def summary(self) -> InventorySummaryView:
         return self._repo.summary()
 
+    def summary_as_of(self, as_of: datetime) -> InventoryAsOfSummaryView:
+        return self._repo.summary_as_of(self._aware(as_of))
+
+    def get_item_state(self, item_id: str, as_of: datetime) -> InventoryItemStateView:
+        if not item_id:
+            raise InvalidInventoryFiltersError('ID de item invalido')
+        return self._repo.get_item_state(item_id, self._aware(as_of))
+
+    def take_snapshot(self, now: datetime, interval_seconds: int, retention_days: int) -> InventorySnapshotView | None:
+        """Foto del inventario en `now - SNAPSHOT_LAG`; como mucho una por medio intervalo."""
+        retention = timedelta(days=retention_days) if retention_days > 0 else None
+        try:
+            snapshot = self._repo.take_snapshot(now - SNAPSHOT_LAG, timedelta(seconds=interval_seconds) / 2, retention)
+            self._uow.commit()
+            return snapshot
+        except Exception:
+            self._uow.rollback()
+            raise
+
     def list_movements(self, filters: MovementListFilters) -> InventoryMovementsPageView:
         # Reglas de paginación para proteger performance y evitar consultas inválidas.
         if filters.type_filter and filters.type_filter not in ALLOWED_MOVEMENT_TYPES:
@@ -73,13 +189,33 @@ class InventoryUseCases:
             raise InvalidInventoryFiltersError('El limite debe estar entre 1 y 200')
         if filters.offset < 0:
             raise InvalidInventoryFiltersError('El offset no puede ser negativo')
+        filters = replace(filters, since=self._aware_or_none(filters.since), until=self._aware_or_none(filters.until))
+        if filters.since and filters.until and filters.since > filters.until:
+            raise InvalidInventoryFiltersError('El rango de fechas es invalido')
         return self._repo.list_movements(filters)
 
+    def export_items(self, filters: InventoryListFilters, batch_size: int) -> InventoryExportView:
+        self._validate_item_filters(filters)
+        return self._repo.export_items(filters, batch_size)
+
+    def export_movements(self, filters: MovementExportFilters, batch_size: int) -> InventoryExportView:
+        if filters.type_filter and filters.type_filter not in ALLOWED_MOVEMENT_TYPES:
+            raise InvalidInventoryFiltersError('Filtro de movimiento invalido')
+        filters = replace(filters, since=self._aware_or_none(filters.since), until=self._aware_or_none(filters.until))
+        if filters.since and filters.until and filters.since > filters.until:
+            raise InvalidInventoryFiltersError('El rango de fechas es invalido')
+        return self._repo.export_movements(filters, batch_size)
+
     def get_item(self, item_id: str) -> InventoryItemView:
         if not item_id:
             raise InvalidInventoryFiltersError('ID de item invalido')
         return self._repo.get_item(item_id)
 
+    def get_item_tree(self, item_id: str) -> InventoryTreeNodeView:
+        if not item_id:
+            raise InvalidInventoryFiltersError('ID de item invalido')
+        return self._repo.get_item_tree(item_id)
+
     def update_item(self, item_id: str, payload: InventoryItemInput, user_id: str) -> InventoryItemView:
         if not item_id:
             raise InvalidInventoryFiltersError('ID de item invalido')
@@ -122,6 +258,7 @@ class InventoryUseCases:
             raise AlreadyCheckedInError('El item ya esta en bodega')
         try:
             result = self._repo.check_in(item_id, payload, user_id)
+            self._cascade_to_contents('IN', current_item, payload, user_id, result)
             self._uow.commit()
             return result
         except Exception:
@@ -141,17 +278,128 @@ class InventoryUseCases:
             raise LostItemCheckOutError('No se puede hacer check-out de un item perdido')
         try:
             result = self._repo.check_out(item_id, payload, user_id)
+            self._cascade_to_contents('OUT', current_item, payload, user_id, result)
+            self._uow.commit()
+            return result
+        except Exception:
+            self._uow.rollback()
+            raise
+
+    def _cascade_to_contents(
+        self,
+        target_status: str,
+        current_item: InventoryItemView,
+        payload: CheckInOutInput,
+        user_id: str,
+        result: InventoryCheckInOutResult,
+    ) -> None:
+        """Un contenedor entra/sale con todo su contenido, en la misma transacción."""
+        if current_item['type'] != 'CONTAINER' or current_item['_count']['contents'] == 0:
+            return
+        contents = self._repo.bulk_check_in_out(
+            target_status,
+            BulkCheckInOutInput(
+                item_ids=[],
+                container_id=current_item['id'],
+                group_id=None,
+                location=payload.location,
+                reason=payload.reason,
+                reference=payload.reference,
+            ),
+            user_id,
+        )
+        # El contenedor ya se movió arriba: solo se reporta su contenido.
+        contents['alreadyInState'] = [item_id for item_id in contents['alreadyInState'] if item_id != current_item['id']]
+        result['contents'] = contents
+
+    def bulk_check_in(self, payload: BulkCheckInOutInput, user_id: str) -> InventoryBulkCheckInOutResult:
+        return self._bulk_check_in_out('IN', payload, user_id)
+
+    def bulk_check_out(self, payload: BulkCheckInOutInput, user_id: str) -> InventoryBulkCheckInOutResult:
+        return self._bulk_check_in_out('OUT', payload, user_id)
+
+    def _bulk_check_in_out(self, target_status: str, payload: BulkCheckInOutInput, user_id: str) -> InventoryBulkCheckInOutResult:
+        """Mismas reglas que el check-in/out individual, pero los items que no aplican se reportan en lugar de fallar."""
+        if not user_id:
+            raise InvalidInventoryPayloadError('Usuario invalido')
+        payload.item_ids = list(dict.fromkeys(item_id for item_id in payload.item_ids if item_id))
+        if not payload.item_ids and not payload.container_id and not payload.group_id:
+            raise InvalidInventoryPayloadError('Debe indicar items, un contenedor o un grupo')
+        if len(payload.item_ids) > MAX_BULK_ITEM_IDS:
+            raise InvalidInventoryPayloadError(f'Maximo {MAX_BULK_ITEM_IDS} items por operacion')
+        try:
+            result = self._repo.bulk_check_in_out(target_status, payload, user_id)
             self._uow.commit()
             return result
         except Exception:
             self._uow.rollback()
             raise
 
+    def repair_counters(self) -> int:
+        """Corrige `_count.movements`/`_count.contents` desnormalizados; devuelve los items corregidos."""
+        try:
+            repaired = self._repo.repair_counters()
+            self._uow.commit()
+            return repaired
+        except Exception:
+            self._uow.rollback()
+            raise
+
+    def reconcile_summary(self) -> int:
+        """Iguala los contadores del resumen a los conteos reales; devuelve las filas corregidas."""
+        try:
+            repaired = self._repo.reconcile_summary()
+            self._uow.commit()
+            return repaired
+        except Exception:
+            self._uow.rollback()
+            raise
+
+    def fold_summary(self) -> int:
+        """Consolida en los contadores los deltas del resumen que dejaron las transacciones."""
+        try:
+            folded = self._repo.fold_summary()
+            self._uow.commit()
+            return folded
+        except Exception:
+            self._uow.rollback()
+            raise
+
+    @staticmethod
+    def _aware(moment: datetime) -> datetime:
+        # Una fecha sin zona horaria se interpreta en UTC, igual que `createdAt`.
+        return moment if moment.tzinfo is not None else moment.replace(tzinfo=UTC)
+
+    @classmethod
+    def _aware_or_none(cls, moment: datetime | None) -> datetime | None:
+        return cls._aware(moment) if moment is not None else None
+
+    @staticmethod
+    def _validate_item_filters(filters: InventoryListFilters) -> None:
+        # Validamos filtros aquí para no pasar datos inválidos al repositorio.
+        if filters.status_filter and filters.status_filter not in ALLOWED_ITEM_STATUSES:
+            raise InvalidInventoryFiltersError('Filtro de estado invalido')
+        if filters.type_filter and filters.type_filter not in ALLOWED_ITEM_TYPES:
+            raise InvalidInventoryFiltersError('Filtro de tipo invalido')
+        if filters.sort not in ALLOWED_ITEM_SORTS:
+            raise InvalidInventoryFiltersError('Orden invalido')
+
+    @classmethod
+    def _validate_import_row(cls, row: InventoryImportRow) -> None:
+        # En la importación el producto puede identificarse por SKU en lugar de id.
+        if not row.item.product_id and not row.product_sku:
+            raise InvalidInventoryPayloadError('El producto es obligatorio')
+        cls._validate_item_fields(row.item)
+
     @staticmethod
     def _validate_payload(payload: InventoryItemInput) -> None:
         """Valida reglas mínimas del payload de inventario."""
         if not payload.product_id:
             raise InvalidInventoryPayloadError('El producto es obligatorio')
+        InventoryUseCases._validate_item_fields(payload)
+
+    @staticmethod
+    def _validate_item_fields(payload: InventoryItemInput) -> None:
         if payload.item_type not in ALLOWED_ITEM_TYPES:
             raise InvalidInventoryPayloadError('Tipo de item invalido')
         if payload.status not in ALLOWED_ITEM_STATUSES:
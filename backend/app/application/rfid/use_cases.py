@@ -3,22 +3,50 @@
 Orquesta reglas de negocio, validaciones y transacciones.
 """
 
-from app.domain.rfid.entities import DetectionFilters, TagFilters
-from app.domain.rfid.ports import RfidRepository, UnitOfWork
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.domain.rfid.entities import ActivityFilters, DetectionFilters, TagFilters
+from app.domain.rfid.errors import (
+    IngestBatchNotFoundError,
+    InvalidActivityFilterError,
+    InvalidApiKeyError,
+    InvalidTimestampError,
+)
+from app.domain.rfid.ports import RfidDetectionPublisher, RfidIngestQueue, RfidReaderMonitor, RfidRepository, UnitOfWork
 from app.domain.rfid.read_models import (
+    RfidActivityView,
+    RfidDetectionEvent,
     RfidDetectionPageView,
+    RfidIngestBatchView,
     RfidMutationResult,
     RfidReadPayload,
     RfidReadResult,
+    RfidReaderView,
     RfidTagPayload,
     RfidTagView,
 )
 
 
+ACTIVITY_GRANULARITIES = {'hour', 'day'}
+ACTIVITY_DEFAULT_WINDOW = timedelta(hours=24)
+ACTIVITY_MAX_WINDOW = timedelta(days=366)
+
+
 class RfidUseCases:
-    def __init__(self, repo: RfidRepository, uow: UnitOfWork) -> None:
+    def __init__(
+        self,
+        repo: RfidRepository,
+        uow: UnitOfWork,
+        ingest_queue: RfidIngestQueue | None = None,
+        publisher: RfidDetectionPublisher | None = None,
+        reader_monitor: RfidReaderMonitor | None = None,
+    ) -> None:
         self._repo = repo
         self._uow = uow
+        self._ingest_queue = ingest_queue
+        self._publisher = publisher
+        self._reader_monitor = reader_monitor
 
     def list_tags(self, filters: TagFilters) -> list[RfidTagView]:
         return self._repo.list_tags(filters)
@@ -35,8 +63,8 @@ class RfidUseCases:
     def list_unknown_tags(self) -> list[RfidTagView]:
         return self._repo.list_unknown_tags()
 
-    def get_tag(self, tag_id: str) -> RfidTagView:
-        return self._repo.get_tag(tag_id)
+    def get_tag(self, tag_id: str, before: str | None = None) -> RfidTagView:
+        return self._repo.get_tag(tag_id, before)
 
     def update_tag(self, tag_id: str, payload: RfidTagPayload) -> RfidTagView:
         try:
@@ -77,11 +105,156 @@ class RfidUseCases:
     def list_detections(self, filters: DetectionFilters) -> RfidDetectionPageView:
         return self._repo.list_detections(filters)
 
+    def list_activity(self, filters: ActivityFilters) -> RfidActivityView:
+        """Historial de actividad desde los agregados por hora (por defecto, últimas 24 h)."""
+        if filters.granularity not in ACTIVITY_GRANULARITIES:
+            raise InvalidActivityFilterError('Granularidad invalida (hour o day)')
+        until = self._aware(filters.until) if filters.until else datetime.now(timezone.utc)
+        since = self._aware(filters.since) if filters.since else until - ACTIVITY_DEFAULT_WINDOW
+        if since >= until:
+            raise InvalidActivityFilterError('El rango de fechas es invalido')
+        if until - since > ACTIVITY_MAX_WINDOW:
+            raise InvalidActivityFilterError('El rango de fechas no puede superar un año')
+        return self._repo.list_activity(
+            ActivityFilters(
+                rfid_tag_id=filters.rfid_tag_id,
+                reader_id=filters.reader_id,
+                since=since,
+                until=until,
+                granularity=filters.granularity,
+            )
+        )
+
+    def backfill_rollups(self, since: datetime, until: datetime) -> int:
+        """Recalcula los agregados de `[since, until)` desde las detecciones crudas."""
+        since, until = self._aware(since), self._aware(until)
+        if since >= until:
+            raise InvalidActivityFilterError('El rango de fechas es invalido')
+        try:
+            written = self._repo.backfill_rollups(since, until)
+            self._uow.commit()
+            return written
+        except Exception:
+            self._uow.rollback()
+            raise
+
+    def save_reader_stats(self, rows: list[RfidReaderView]) -> None:
+        try:
+            self._repo.save_reader_stats(rows)
+            self._uow.commit()
+        except Exception:
+            self._uow.rollback()
+            raise
+
     def process_read(self, payload: RfidReadPayload, api_key: str) -> RfidReadResult:
+        started = time.perf_counter()
         try:
             result = self._repo.process_read(payload, api_key)
             self._uow.commit()
-            return result
-        except Exception:
+        except Exception as exc:
+            self._uow.rollback()
+            self._repo.discard_reads()
+            self._record_errors([payload], exc)
+            raise
+        self._repo.confirm_reads()
+        self._record_batches([(payload, result)], started)
+        self._publish([(payload, result)])
+        return result
+
+    def process_read_batch(self, payloads: list[RfidReadPayload], api_key: str) -> list[RfidReadResult]:
+        """Persiste varios lotes de lectura en una sola transacción (ingesta asíncrona)."""
+        started = time.perf_counter()
+        try:
+            results = [self._repo.process_read(payload, api_key) for payload in payloads]
+            self._uow.commit()
+        except Exception as exc:
             self._uow.rollback()
+            self._repo.discard_reads()
+            self._record_errors(payloads, exc)
             raise
+        self._repo.confirm_reads()
+        self._record_batches(list(zip(payloads, results)), started)
+        self._publish(list(zip(payloads, results)))
+        return results
+
+    def _record_batches(self, batches: list[tuple[RfidReadPayload, RfidReadResult]], started: float) -> None:
+        if self._reader_monitor is None:
+            return
+        # Con lotes agrupados, cada uno ve la latencia completa de la transacción.
+        latency_ms = (time.perf_counter() - started) * 1000
+        for payload, result in batches:
+            self._reader_monitor.record_batch(
+                payload['readerId'],
+                payload.get('readerName'),
+                len(result['results']),
+                sum(1 for row in result['results'] if row['status'] == 'UNKNOWN'),
+                latency_ms,
+            )
+
+    def _record_errors(self, payloads: list[RfidReadPayload], exc: Exception) -> None:
+        # Sin API key válida el `readerId` no es confiable: no se registra.
+        if self._reader_monitor is None or isinstance(exc, InvalidApiKeyError):
+            return
+        for payload in payloads:
+            self._reader_monitor.record_error(payload['readerId'], payload.get('readerName'))
+
+    def _publish(self, batches: list[tuple[RfidReadPayload, RfidReadResult]]) -> None:
+        """Emite al feed en vivo las lecturas ya confirmadas (nunca antes del commit)."""
+        if self._publisher is None:
+            return
+        received_at = datetime.now(timezone.utc).isoformat()
+        events: list[RfidDetectionEvent] = []
+        for payload, result in batches:
+            # `results` sigue el orden de `reads` (una entrada por lectura).
+            for read, row in zip(payload['reads'], result['results']):
+                events.append(
+                    {
+                        'epc': row['epc'],
+                        'tagId': row['tagId'],
+                        'status': row['status'],
+                        'readerId': payload['readerId'],
+                        'readerName': payload.get('readerName'),
+                        'direction': read.get('direction'),
+                        'rssi': read.get('rssi'),
+                        'timestamp': read.get('timestamp') or received_at,
+                        'isNew': row['isNew'],
+                        'inventoryItemId': row['inventoryItemId'],
+                        'inventoryUpdated': row['inventoryUpdated'],
+                    }
+                )
+        self._publisher.publish(events)
+
+    def enqueue_read(self, payload: RfidReadPayload, api_key: str) -> RfidIngestBatchView:
+        """Valida el lote y lo encola; la persistencia ocurre en segundo plano."""
+        self._validate_read(payload, api_key)
+        return self._ingest_queue.submit(payload)
+
+    def get_ingest_batch(self, batch_id: str, provided_api_key: str, api_key: str) -> RfidIngestBatchView:
+        self.check_api_key(provided_api_key, api_key)
+        batch = self._ingest_queue.get(batch_id)
+        if batch is None:
+            raise IngestBatchNotFoundError('Lote de lecturas no encontrado')
+        return batch
+
+    @staticmethod
+    def _aware(moment: datetime) -> datetime:
+        # Una fecha sin zona horaria se interpreta en UTC, igual que `timestamp` de las detecciones.
+        return moment if moment.tzinfo is not None else moment.replace(tzinfo=timezone.utc)
+
+    @staticmethod
+    def check_api_key(provided_api_key: str, api_key: str) -> None:
+        """Autentica a un lector (p. ej. una sola vez al abrir un canal de streaming)."""
+        if provided_api_key != api_key:
+            raise InvalidApiKeyError('API key invalida')
+
+    @classmethod
+    def _validate_read(cls, payload: RfidReadPayload, api_key: str) -> None:
+        """Mismas validaciones que `process_read`, antes de aceptar el lote con 202."""
+        cls.check_api_key(payload['apiKey'], api_key)
+        for read in payload['reads']:
+            if not read.get('timestamp'):
+                continue
+            try:
+                datetime.fromisoformat(read['timestamp'])
+            except ValueError:
+                raise InvalidTimestampError('Timestamp invalido en lectura RFID') from None
@@ -1,35 +1,68 @@
 """Composition root de `inventory`: conecta casos de uso con adaptadores concretos."""
 
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+from typing import BinaryIO
+
 from app.application.inventory.use_cases import InventoryUseCases
-from app.domain.inventory.entities import CheckInOutInput, InventoryItemInput, InventoryListFilters, MovementListFilters
+from app.domain.inventory.entities import (
+    BulkCheckInOutInput,
+    CheckInOutInput,
+    InventoryItemInput,
+    InventoryListFilters,
+    MovementExportFilters,
+    MovementListFilters,
+)
 from app.domain.inventory.errors import (
     AlreadyCheckedInError,
     AlreadyCheckedOutError,
+    ContainerCycleError,
     ContainerHasItemsError,
     DuplicateAssetTagError,
     DuplicateSerialError,
     InvalidDateFormatError,
+    InvalidImportFileError,
     InvalidInventoryFiltersError,
     InvalidInventoryPayloadError,
     InventoryItemNotFoundError,
     InventoryPersistenceError,
+    ItemGroupNotFoundError,
     LostItemCheckOutError,
     ProductNotFoundOrInactiveError,
 )
 from app.domain.inventory.read_models import (
+    InventoryAsOfSummaryView,
+    InventoryBulkCheckInOutResult,
     InventoryCheckInOutResult,
+    InventoryExportView,
+    InventoryImportResultView,
+    InventoryItemsPageView,
+    InventoryItemStateView,
     InventoryItemView,
     InventoryMovementsPageView,
     InventoryMutationResult,
+    InventorySearchHitView,
+    InventorySnapshotView,
     InventorySummaryView,
+    InventoryTreeNodeView,
 )
+from app.composition.rfid import epc_cache
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.infrastructure.common.csv_export import iter_csv
+from app.infrastructure.common.partitions import ensure_partitions, is_partitioned, lock_maintenance
+from app.infrastructure.common.scheduler import PeriodicTask
+from app.infrastructure.inventory.import_parser import detect_import_format, iter_import_rows
 from app.infrastructure.inventory.sqlalchemy_repository import SqlAlchemyInventoryRepository
+from app.infrastructure.inventory.summary_counters import SummaryCache
 from app.infrastructure.common.unit_of_work import SqlAlchemyUnitOfWork
 
+summary_cache = SummaryCache(settings.inventory_summary_cache_seconds)
+
 
 def _use_cases(db) -> InventoryUseCases:
     return InventoryUseCases(
-        repo=SqlAlchemyInventoryRepository(db),
+        repo=SqlAlchemyInventoryRepository(db, epc_cache=epc_cache, summary_cache=summary_cache),
         uow=SqlAlchemyUnitOfWork(db),
     )
 
@@ -38,22 +71,86 @@ def list_items(db, *, filters: InventoryListFilters) -> list[InventoryItemView]:
     return _use_cases(db).list_items(filters)
 
 
+def list_items_page(db, *, filters: InventoryListFilters) -> InventoryItemsPageView:
+    return _use_cases(db).list_items_page(filters)
+
+
+def search_items(db, *, query: str, limit: int) -> list[InventorySearchHitView]:
+    return _use_cases(db).search_items(query, limit)
+
+
 def create_item(db, *, payload: InventoryItemInput, user_id: str) -> InventoryItemView:
     return _use_cases(db).create_item(payload, user_id)
 
 
+def import_items(
+    db,
+    *,
+    stream: BinaryIO,
+    fmt: str | None,
+    filename: str | None,
+    content_type: str | None,
+    user_id: str,
+    dry_run: bool = False,
+) -> InventoryImportResultView:
+    rows = iter_import_rows(stream, detect_import_format(fmt, filename, content_type))
+    return _use_cases(db).import_items(rows, user_id, settings.inventory_import_batch_size, dry_run=dry_run)
+
+
 def summary(db) -> InventorySummaryView:
     return _use_cases(db).summary()
 
 
+def summary_as_of(db, *, as_of: datetime) -> InventoryAsOfSummaryView:
+    return _use_cases(db).summary_as_of(as_of)
+
+
 def list_movements(db, *, filters: MovementListFilters) -> InventoryMovementsPageView:
     return _use_cases(db).list_movements(filters)
 
 
+def _export_csv(open_export: Callable[[InventoryUseCases], InventoryExportView]) -> Iterator[bytes]:
+    """Valida y prepara la exportación ya; las filas se leen mientras se envía el archivo.
+
+    Usa su propia sesión porque el cuerpo se escribe después de que la ruta retornó;
+    se cierra al terminar o si el cliente corta la descarga.
+    """
+    db = SessionLocal()
+    try:
+        export = open_export(_use_cases(db))
+    except Exception:
+        db.close()
+        raise
+
+    def chunks() -> Iterator[bytes]:
+        try:
+            yield from iter_csv(export['columns'], export['rows'])
+        finally:
+            db.close()
+
+    return chunks()
+
+
+def export_items_csv(*, filters: InventoryListFilters) -> Iterator[bytes]:
+    return _export_csv(lambda use_cases: use_cases.export_items(filters, settings.inventory_export_batch_size))
+
+
+def export_movements_csv(*, filters: MovementExportFilters) -> Iterator[bytes]:
+    return _export_csv(lambda use_cases: use_cases.export_movements(filters, settings.inventory_export_batch_size))
+
+
 def get_item(db, item_id: str) -> InventoryItemView:
     return _use_cases(db).get_item(item_id)
 
 
+def get_item_state(db, item_id: str, *, as_of: datetime) -> InventoryItemStateView:
+    return _use_cases(db).get_item_state(item_id, as_of)
+
+
+def get_item_tree(db, item_id: str) -> InventoryTreeNodeView:
+    return _use_cases(db).get_item_tree(item_id)
+
+
 def update_item(db, *, item_id: str, payload: InventoryItemInput, user_id: str) -> InventoryItemView:
     return _use_cases(db).update_item(item_id, payload, user_id)
 
@@ -70,26 +167,140 @@ def check_out(db, *, item_id: str, payload: CheckInOutInput, user_id: str) -> In
     return _use_cases(db).check_out(item_id, payload, user_id)
 
 
+def bulk_check_in(db, *, payload: BulkCheckInOutInput, user_id: str) -> InventoryBulkCheckInOutResult:
+    return _use_cases(db).bulk_check_in(payload, user_id)
+
+
+def bulk_check_out(db, *, payload: BulkCheckInOutInput, user_id: str) -> InventoryBulkCheckInOutResult:
+    return _use_cases(db).bulk_check_out(payload, user_id)
+
+
+def repair_counters(db) -> int:
+    return _use_cases(db).repair_counters()
+
+
+def reconcile_summary() -> int:
+    """Corrige los contadores de `GET /inventory/summary` que se hayan desviado de los conteos reales."""
+    with SessionLocal() as db:
+        return _use_cases(db).reconcile_summary()
+
+
+summary_reconciliation = PeriodicTask(
+    'inventory-summary-reconcile',
+    settings.inventory_summary_reconcile_seconds,
+    reconcile_summary,
+)
+
+
+def fold_summary() -> int:
+    """Pasa a `inventory_summary_counters` los deltas que registraron las transacciones."""
+    with SessionLocal() as db:
+        return _use_cases(db).fold_summary()
+
+
+summary_fold = PeriodicTask(
+    'inventory-summary-fold',
+    settings.inventory_summary_fold_seconds,
+    fold_summary,
+)
+
+
+def maintain_movement_partitions() -> dict:
+    """Crea las particiones futuras de `inventory_movements` (el libro no se purga)."""
+    with SessionLocal() as db:
+        lock_maintenance(db, 'inventory_movements')
+        if not is_partitioned(db, 'inventory_movements'):
+            db.rollback()
+            return {'partitioned': False, 'created': []}
+        created = ensure_partitions(
+            db,
+            'inventory_movements',
+            'createdAt',
+            settings.inventory_movements_partition_interval,
+            ahead=settings.inventory_movements_partitions_ahead,
+        )
+        db.commit()
+        return {'partitioned': True, 'created': created}
+
+
+movement_partition_maintenance = PeriodicTask(
+    'inventory-movements-partitions',
+    settings.partition_maintenance_interval_seconds,
+    maintain_movement_partitions,
+)
+
+
+def take_inventory_snapshot() -> InventorySnapshotView | None:
+    """Foto del estado del inventario para las consultas históricas (`asOf`)."""
+    with SessionLocal() as db:
+        return _use_cases(db).take_snapshot(
+            datetime.now(UTC),
+            settings.inventory_snapshot_interval_seconds,
+            settings.inventory_snapshot_retention_days,
+        )
+
+
+inventory_snapshots = PeriodicTask(
+    'inventory-snapshots',
+    settings.inventory_snapshot_interval_seconds,
+    take_inventory_snapshot,
+)
+
+
+def start_inventory_maintenance() -> None:
+    summary_fold.start()
+    summary_reconciliation.start()
+    movement_partition_maintenance.start()
+    inventory_snapshots.start()
+
+
+def stop_inventory_maintenance(timeout: float | None = 30) -> None:
+    summary_fold.stop(timeout)
+    summary_reconciliation.stop(timeout)
+    movement_partition_maintenance.stop(timeout)
+    inventory_snapshots.stop(timeout)
+
+
 __all__ = [
     'AlreadyCheckedInError',
     'AlreadyCheckedOutError',
+    'ContainerCycleError',
     'ContainerHasItemsError',
     'DuplicateAssetTagError',
     'DuplicateSerialError',
     'InvalidDateFormatError',
+    'InvalidImportFileError',
     'InvalidInventoryFiltersError',
     'InvalidInventoryPayloadError',
     'InventoryItemNotFoundError',
     'InventoryPersistenceError',
+    'ItemGroupNotFoundError',
     'LostItemCheckOutError',
     'ProductNotFoundOrInactiveError',
+    'bulk_check_in',
+    'bulk_check_out',
     'check_in',
     'check_out',
     'create_item',
     'delete_item',
+    'export_items_csv',
+    'export_movements_csv',
+    'fold_summary',
     'get_item',
+    'get_item_state',
+    'get_item_tree',
+    'import_items',
     'list_items',
+    'list_items_page',
     'list_movements',
+    'maintain_movement_partitions',
+    'reconcile_summary',
+    'repair_counters',
+    'search_items',
+    'start_inventory_maintenance',
+    'stop_inventory_maintenance',
     'summary',
+    'summary_as_of',
+    'take_inventory_snapshot',
     'update_item',
 ]
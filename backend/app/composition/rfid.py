@@ -1,10 +1,18 @@
 """Composition root de `rfid`: conecta casos de uso con adaptadores concretos."""
 
+from datetime import datetime, timedelta
+
 from app.application.rfid.use_cases import RfidUseCases
-from app.domain.rfid.entities import DetectionFilters, TagFilters
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.domain.rfid.entities import ActivityFilters, DetectionFilters, TagFilters
 from app.domain.rfid.errors import (
     DuplicateEpcError,
+    IngestBatchNotFoundError,
+    IngestQueueFullError,
+    InvalidActivityFilterError,
     InvalidApiKeyError,
+    InvalidCursorError,
     InvalidTimestampError,
     InventoryItemAlreadyLinkedError,
     InventoryItemNotFoundError,
@@ -12,21 +20,141 @@ from app.domain.rfid.errors import (
     TagNotFoundError,
 )
 from app.domain.rfid.read_models import (
+    RfidActivityView,
     RfidDetectionPageView,
+    RfidIngestBatchView,
     RfidMutationResult,
     RfidReadPayload,
     RfidReadResult,
     RfidTagPayload,
     RfidTagView,
 )
+from app.infrastructure.rfid.debounce import DetectionDebouncer
+from app.infrastructure.rfid.detection_bus import DetectionBus, DetectionSubscription
+from app.infrastructure.rfid.direction import DirectionInferenceEngine, parse_zones
+from app.infrastructure.rfid.epc_cache import EpcCache
+from app.infrastructure.rfid.ingest_queue import InMemoryRfidIngestQueue
+from app.infrastructure.rfid.reader_stats import ReaderStatsRegistry
 from app.infrastructure.rfid.sqlalchemy_repository import SqlAlchemyRfidRepository
+from app.infrastructure.rfid.stream_registry import RfidStreamRegistry
+from app.infrastructure.common.partitions import apply_retention, ensure_partitions, is_partitioned, lock_maintenance
+from app.infrastructure.common.scheduler import PeriodicTask
 from app.infrastructure.common.unit_of_work import SqlAlchemyUnitOfWork
 
+# Una sola caché por proceso, compartida por todas las sesiones/requests.
+epc_cache = EpcCache(
+    max_entries=settings.rfid_epc_cache_size,
+    ttl_seconds=settings.rfid_epc_cache_ttl_seconds,
+)
+detection_debouncer = DetectionDebouncer(
+    window_seconds=settings.rfid_debounce_seconds,
+    max_entries=settings.rfid_debounce_max_entries,
+)
+direction_engine = DirectionInferenceEngine(
+    mode=settings.rfid_direction_mode,
+    zones=parse_zones(settings.rfid_direction_zones),
+    window_seconds=settings.rfid_direction_window_seconds,
+    min_reads=settings.rfid_direction_min_reads,
+    max_tags=settings.rfid_direction_max_tags,
+    ttl_seconds=settings.rfid_direction_ttl_seconds,
+)
+stream_registry = RfidStreamRegistry()
+reader_stats = ReaderStatsRegistry(
+    rate_window_seconds=settings.rfid_reader_rate_window_seconds,
+    latency_samples=settings.rfid_reader_latency_samples,
+    silent_after_seconds=settings.rfid_reader_silent_seconds,
+)
+detection_bus = DetectionBus(
+    buffer_size=settings.rfid_live_feed_buffer,
+    max_subscribers=settings.rfid_live_feed_max_subscribers,
+)
+
+
+def _process_queued_batches(payloads: list[RfidReadPayload]) -> list[RfidReadResult]:
+    # Los workers de la cola y los canales de streaming no tienen request: cada
+    # grupo de lotes abre su propia sesión.
+    with SessionLocal() as db:
+        return _use_cases(db).process_read_batch(payloads, settings.rfid_api_key)
+
+
+ingest_queue = InMemoryRfidIngestQueue(
+    _process_queued_batches,
+    max_size=settings.rfid_ingest_queue_size,
+    workers=settings.rfid_ingest_workers,
+    max_coalesce=settings.rfid_ingest_max_coalesce,
+    status_retention=settings.rfid_ingest_status_retention,
+)
+
+
+def maintain_detection_partitions() -> dict:
+    """Crea las particiones futuras de `rfid_detections` y aplica la retención configurada."""
+    with SessionLocal() as db:
+        lock_maintenance(db, 'rfid_detections')
+        if not is_partitioned(db, 'rfid_detections'):
+            db.rollback()
+            return {'partitioned': False, 'created': [], 'expired': []}
+        created = ensure_partitions(
+            db,
+            'rfid_detections',
+            'timestamp',
+            settings.rfid_detections_partition_interval,
+            ahead=settings.rfid_detections_partitions_ahead,
+        )
+        expired = []
+        if settings.rfid_detections_retention_days > 0:
+            expired = apply_retention(
+                db,
+                'rfid_detections',
+                retention=timedelta(days=settings.rfid_detections_retention_days),
+                action=settings.rfid_detections_retention_action,
+            )
+        db.commit()
+        return {'partitioned': True, 'created': created, 'expired': expired}
+
+
+partition_maintenance = PeriodicTask(
+    'rfid-detections-partitions',
+    settings.partition_maintenance_interval_seconds,
+    maintain_detection_partitions,
+)
+
+
+def flush_reader_stats() -> int:
+    """Vuelca a `rfid_readers` el estado en memoria de los lectores de este proceso."""
+    rows = reader_stats.drain()
+    if not rows:
+        return 0
+    try:
+        with SessionLocal() as db:
+            _use_cases(db).save_reader_stats(rows)
+    except Exception:
+        # Los deltas no persistidos se suman al próximo volcado.
+        reader_stats.restore(rows)
+        raise
+    return len(rows)
+
+
+reader_stats_flush = PeriodicTask(
+    'rfid-readers-flush',
+    settings.rfid_readers_flush_seconds,
+    flush_reader_stats,
+    run_on_start=False,
+)
+
 
 def _use_cases(db) -> RfidUseCases:
     return RfidUseCases(
-        repo=SqlAlchemyRfidRepository(db),
+        repo=SqlAlchemyRfidRepository(
+            db,
+            epc_cache=epc_cache,
+            debouncer=detection_debouncer,
+            direction_engine=direction_engine,
+            system_user_email=settings.rfid_system_user_email or settings.superadmin_email,
+        ),
         uow=SqlAlchemyUnitOfWork(db),
+        ingest_queue=ingest_queue,
+        publisher=detection_bus,
+        reader_monitor=reader_stats,
     )
 
 
@@ -42,8 +170,8 @@ def list_unknown_tags(db) -> list[RfidTagView]:
     return _use_cases(db).list_unknown_tags()
 
 
-def get_tag(db, tag_id: str) -> RfidTagView:
-    return _use_cases(db).get_tag(tag_id)
+def get_tag(db, tag_id: str, *, before: str | None = None) -> RfidTagView:
+    return _use_cases(db).get_tag(tag_id, before)
 
 
 def update_tag(db, *, tag_id: str, payload: RfidTagPayload) -> RfidTagView:
@@ -66,26 +194,158 @@ def list_detections(db, *, filters: DetectionFilters) -> RfidDetectionPageView:
     return _use_cases(db).list_detections(filters)
 
 
+def list_activity(db, *, filters: ActivityFilters) -> RfidActivityView:
+    return _use_cases(db).list_activity(filters)
+
+
+def backfill_rollups(db, *, since: datetime, until: datetime) -> int:
+    return _use_cases(db).backfill_rollups(since, until)
+
+
 def process_read(db, *, payload: RfidReadPayload, api_key: str) -> RfidReadResult:
     return _use_cases(db).process_read(payload, api_key)
 
 
+def enqueue_read(db, *, payload: RfidReadPayload, api_key: str) -> RfidIngestBatchView:
+    return _use_cases(db).enqueue_read(payload, api_key)
+
+
+def get_ingest_batch(db, *, batch_id: str, provided_api_key: str, api_key: str) -> RfidIngestBatchView:
+    return _use_cases(db).get_ingest_batch(batch_id, provided_api_key, api_key)
+
+
+def authenticate_reader(*, provided_api_key: str, api_key: str) -> None:
+    RfidUseCases.check_api_key(provided_api_key, api_key)
+
+
+def process_stream_window(*, payload: RfidReadPayload, api_key: str) -> RfidReadResult:
+    """Persiste una ventana de lecturas recibida por streaming (bloqueante: usar en threadpool)."""
+    with SessionLocal() as db:
+        return _use_cases(db).process_read(payload, api_key)
+
+
+def ingest_queue_stats() -> dict:
+    return ingest_queue.stats()
+
+
+def start_rfid_ingestion() -> None:
+    """Arranca los workers de la cola (modo `async`) y las tareas periódicas de `rfid`."""
+    if settings.rfid_ingest_mode == 'async':
+        ingest_queue.start()
+    partition_maintenance.start()
+    reader_stats_flush.start()
+
+
+def stop_rfid_ingestion(timeout: float | None = 30) -> None:
+    """Drena los lotes encolados (y vuelca el estado de los lectores) antes de apagar el proceso."""
+    ingest_queue.stop(timeout)
+    partition_maintenance.stop(timeout)
+    reader_stats_flush.stop(timeout)
+    if settings.rfid_readers_flush_seconds > 0:
+        reader_stats_flush.run_once()
+
+
+def epc_cache_stats() -> dict:
+    return epc_cache.stats()
+
+
+def debounce_stats() -> dict:
+    return detection_debouncer.stats()
+
+
+def direction_stats() -> dict:
+    return direction_engine.stats()
+
+
+def open_stream(*, reader_id: str, reader_name: str | None) -> str:
+    return stream_registry.open(reader_id, reader_name)
+
+
+def record_stream_message(connection_id: str, *, reads: int) -> None:
+    stream_registry.record_message(connection_id, reads)
+
+
+def record_stream_ack(connection_id: str, *, processed: int, elapsed_ms: float) -> None:
+    stream_registry.record_ack(connection_id, processed, elapsed_ms)
+
+
+def record_stream_error(connection_id: str) -> None:
+    stream_registry.record_error(connection_id)
+
+
+def close_stream(connection_id: str) -> None:
+    stream_registry.close(connection_id)
+
+
+def stream_stats() -> dict:
+    return stream_registry.stats()
+
+
+def subscribe_detections(*, reader_id: str, rfid_tag_id: str, direction: str) -> DetectionSubscription | None:
+    """Suscribe al feed en vivo (llamar desde el event loop). `None` si no hay cupo.
+
+    La cola de la suscripción recibe eventos y, si el cliente quedó atrás, un `None`
+    final que indica que fue desconectado.
+    """
+    return detection_bus.subscribe(reader_id=reader_id, rfid_tag_id=rfid_tag_id, direction=direction)
+
+
+def unsubscribe_detections(subscription: DetectionSubscription) -> None:
+    detection_bus.unsubscribe(subscription)
+
+
+def live_feed_stats() -> dict:
+    return detection_bus.stats()
+
+
+def list_readers() -> list[dict]:
+    return reader_stats.stats()
+
+
 __all__ = [
     'DuplicateEpcError',
+    'IngestBatchNotFoundError',
+    'IngestQueueFullError',
+    'InvalidActivityFilterError',
     'InvalidApiKeyError',
+    'InvalidCursorError',
     'InvalidTimestampError',
     'InventoryItemAlreadyLinkedError',
     'InventoryItemNotFoundError',
     'TagAlreadyLinkedError',
     'TagNotFoundError',
+    'authenticate_reader',
+    'backfill_rollups',
+    'close_stream',
     'create_tag',
+    'debounce_stats',
     'delete_tag',
+    'direction_stats',
+    'enqueue_read',
     'enroll_tag',
+    'epc_cache_stats',
+    'flush_reader_stats',
+    'get_ingest_batch',
     'get_tag',
+    'ingest_queue_stats',
+    'list_activity',
     'list_detections',
+    'list_readers',
     'list_tags',
     'list_unknown_tags',
+    'live_feed_stats',
+    'maintain_detection_partitions',
+    'open_stream',
     'process_read',
+    'process_stream_window',
+    'record_stream_ack',
+    'record_stream_error',
+    'record_stream_message',
+    'start_rfid_ingestion',
+    'stop_rfid_ingestion',
+    'stream_stats',
+    'subscribe_detections',
     'unenroll_tag',
+    'unsubscribe_detections',
     'update_tag',
 ]
@@ -27,6 +27,47 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 15
     refresh_token_expire_days: int = 7
     rfid_api_key: str = 'rfid-secret-key'
+    rfid_epc_cache_size: int = 50000
+    rfid_epc_cache_ttl_seconds: int = 300
+    rfid_debounce_seconds: float = 0.0
+    rfid_debounce_max_entries: int = 100000
+    rfid_stream_ack_reads: int = 200
+    rfid_stream_ack_interval_ms: int = 250
+    rfid_live_feed_buffer: int = 500
+    rfid_live_feed_max_subscribers: int = 500
+    rfid_live_feed_keepalive_seconds: int = 15
+    rfid_reader_rate_window_seconds: float = 60.0
+    rfid_reader_latency_samples: int = 512
+    rfid_reader_silent_seconds: int = 300
+    rfid_readers_flush_seconds: int = 0
+    rfid_direction_mode: str = 'reader'
+    rfid_direction_zones: str = ''
+    rfid_direction_window_seconds: float = 10.0
+    rfid_direction_min_reads: int = 2
+    rfid_direction_max_tags: int = 200000
+    rfid_direction_ttl_seconds: int = 600
+    # Vacío: los movimientos generados por lecturas RFID se atribuyen al superadmin.
+    rfid_system_user_email: str = ''
+    rfid_ingest_mode: str = 'sync'
+    rfid_ingest_queue_size: int = 1000
+    rfid_ingest_workers: int = 2
+    rfid_ingest_max_coalesce: int = 20
+    rfid_ingest_retry_after_seconds: int = 2
+    rfid_ingest_status_retention: int = 10000
+    rfid_detections_partition_interval: str = 'month'
+    rfid_detections_partitions_ahead: int = 3
+    rfid_detections_retention_days: int = 0
+    rfid_detections_retention_action: str = 'detach'
+    partition_maintenance_interval_seconds: int = 21600
+    inventory_summary_cache_seconds: float = 5.0
+    inventory_summary_reconcile_seconds: int = 3600
+    inventory_summary_fold_seconds: float = 2.0
+    inventory_import_batch_size: int = 1000
+    inventory_export_batch_size: int = 2000
+    inventory_movements_partition_interval: str = 'month'
+    inventory_movements_partitions_ahead: int = 3
+    inventory_snapshot_interval_seconds: int = 86400
+    inventory_snapshot_retention_days: int = 0
     resend_api_key: str | None = None
     emails_from: str = 'XENITH <onboarding@resend.dev>'
     r2_account_id: str | None = None
@@ -3,7 +3,13 @@
 from fastapi import HTTPException, status
 
 
-def api_error(code: str, message: str, status_code: int, details: dict | list | None = None) -> HTTPException:
+def api_error(
+    code: str,
+    message: str,
+    status_code: int,
+    details: dict | list | None = None,
+    headers: dict[str, str] | None = None,
+) -> HTTPException:
     payload = {
         'error': {
             'code': code,
@@ -11,7 +17,7 @@ def api_error(code: str, message: str, status_code: int, details: dict | list |
             'details': details,
         }
     }
-    return HTTPException(status_code=status_code, detail=payload)
+    return HTTPException(status_code=status_code, detail=payload, headers=headers)
 
 
 def unauthorized(message: str = 'No autorizado') -> HTTPException:
@@ -32,3 +38,8 @@ def bad_request(message: str = 'Solicitud invalida', details: dict | list | None
 
 def too_many_requests(message: str = 'Demasiados intentos, intenta mas tarde') -> HTTPException:
     return api_error('RATE_LIMITED', message, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
+def service_unavailable(message: str = 'Servicio no disponible', retry_after: int | None = None) -> HTTPException:
+    headers = {'Retry-After': str(retry_after)} if retry_after is not None else None
+    return api_error('SERVICE_UNAVAILABLE', message, status.HTTP_503_SERVICE_UNAVAILABLE, headers=headers)
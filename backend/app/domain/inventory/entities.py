@@ -4,6 +4,7 @@ Estas clases NO dependen de FastAPI ni SQLAlchemy: representan datos de negocio.
 """
 
 from dataclasses import dataclass
+from datetime import datetime
 
 
 @dataclass(slots=True)
@@ -15,6 +16,11 @@ class InventoryListFilters:
     type_filter: str
     product_id: str
     container_id: str
+    # Paginación por clave: sin `limit` ni `cursor` se devuelve la lista completa (compatibilidad).
+    limit: int | None = None
+    cursor: str | None = None
+    sort: str = '-createdAt'
+    include_total: bool = False
 
 
 @dataclass(slots=True)
@@ -25,6 +31,22 @@ class MovementListFilters:
     inventory_item_id: str
     limit: int
     offset: int
+    # Paginación por clave `(createdAt, id)`; `offset` se mantiene por compatibilidad.
+    cursor: str | None = None
+    # Rango `[since, until)`: acota las particiones de `inventory_movements` que se leen.
+    since: datetime | None = None
+    until: datetime | None = None
+    include_total: bool = False
+
+
+@dataclass(slots=True)
+class MovementExportFilters:
+    """Filtros para exportar movimientos (sin paginación: se exporta todo lo que coincide)."""
+
+    type_filter: str
+    inventory_item_id: str
+    since: datetime | None = None
+    until: datetime | None = None
 
 
 @dataclass(slots=True)
@@ -52,3 +74,33 @@ class CheckInOutInput:
     location: str | None
     reason: str | None
     reference: str | None
+
+
+@dataclass(slots=True)
+class BulkCheckInOutInput:
+    """Selección de items para check-in/check-out en bloque y su contexto.
+
+    Los items pueden venir por id, por contenedor (el contenedor y lo que contiene)
+    o por grupo de items; las tres fuentes se combinan.
+    """
+
+    item_ids: list[str]
+    container_id: str | None
+    group_id: str | None
+    location: str | None
+    reason: str | None
+    reference: str | None
+
+
+@dataclass(slots=True)
+class InventoryImportRow:
+    """Fila de una importación masiva de items.
+
+    `line` es la línea del archivo de origen. El producto puede venir por id o por
+    SKU (`product_sku`); `error` marca una fila que no se pudo leer y solo se reporta.
+    """
+
+    line: int
+    item: InventoryItemInput | None
+    product_sku: str | None = None
+    error: str | None = None
@@ -46,3 +46,15 @@ class InvalidInventoryFiltersError(Exception):
 
 class InvalidInventoryPayloadError(Exception):
     pass
+
+
+class InvalidImportFileError(Exception):
+    pass
+
+
+class ItemGroupNotFoundError(Exception):
+    pass
+
+
+class ContainerCycleError(Exception):
+    pass
@@ -3,15 +3,34 @@
 `InventoryUseCases` depende de estos contratos, no de implementaciones concretas.
 """
 
+from collections.abc import Iterable
+from datetime import datetime, timedelta
 from typing import Protocol
 
-from app.domain.inventory.entities import CheckInOutInput, InventoryItemInput, InventoryListFilters, MovementListFilters
+from app.domain.inventory.entities import (
+    BulkCheckInOutInput,
+    CheckInOutInput,
+    InventoryImportRow,
+    InventoryItemInput,
+    InventoryListFilters,
+    MovementExportFilters,
+    MovementListFilters,
+)
 from app.domain.inventory.read_models import (
+    InventoryAsOfSummaryView,
+    InventoryBulkCheckInOutResult,
     InventoryCheckInOutResult,
+    InventoryExportView,
+    InventoryImportWriteResult,
+    InventoryItemsPageView,
+    InventoryItemStateView,
     InventoryItemView,
     InventoryMovementsPageView,
     InventoryMutationResult,
+    InventorySearchHitView,
+    InventorySnapshotView,
     InventorySummaryView,
+    InventoryTreeNodeView,
 )
 
 
@@ -20,14 +39,32 @@ class InventoryRepository(Protocol):
 
     def list_items(self, filters: InventoryListFilters) -> list[InventoryItemView]: ...
 
+    def list_items_page(self, filters: InventoryListFilters) -> InventoryItemsPageView: ...
+
+    def search_items(self, query: str, limit: int) -> list[InventorySearchHitView]: ...
+
     def create_item(self, payload: InventoryItemInput, user_id: str) -> InventoryItemView: ...
 
+    def import_items(self, rows: Iterable[InventoryImportRow], user_id: str, batch_size: int) -> InventoryImportWriteResult: ...
+
     def summary(self) -> InventorySummaryView: ...
 
+    def summary_as_of(self, as_of: datetime) -> InventoryAsOfSummaryView: ...
+
+    def get_item_state(self, item_id: str, as_of: datetime) -> InventoryItemStateView: ...
+
+    def take_snapshot(self, cutoff: datetime, min_interval: timedelta, retention: timedelta | None) -> InventorySnapshotView | None: ...
+
     def list_movements(self, filters: MovementListFilters) -> InventoryMovementsPageView: ...
 
+    def export_items(self, filters: InventoryListFilters, batch_size: int) -> InventoryExportView: ...
+
+    def export_movements(self, filters: MovementExportFilters, batch_size: int) -> InventoryExportView: ...
+
     def get_item(self, item_id: str) -> InventoryItemView: ...
 
+    def get_item_tree(self, item_id: str) -> InventoryTreeNodeView: ...
+
     def update_item(self, item_id: str, payload: InventoryItemInput, user_id: str) -> InventoryItemView: ...
 
     def delete_item(self, item_id: str) -> InventoryMutationResult: ...
@@ -36,6 +73,14 @@ class InventoryRepository(Protocol):
 
     def check_out(self, item_id: str, payload: CheckInOutInput, user_id: str) -> InventoryCheckInOutResult: ...
 
+    def bulk_check_in_out(self, target_status: str, payload: BulkCheckInOutInput, user_id: str) -> InventoryBulkCheckInOutResult: ...
+
+    def repair_counters(self) -> int: ...
+
+    def reconcile_summary(self) -> int: ...
+
+    def fold_summary(self) -> int: ...
+
 
 class UnitOfWork(Protocol):
     """Contrato transaccional: confirma o revierte cambios."""
@@ -4,6 +4,7 @@ Aquí se define la forma de los datos que la aplicación devuelve/consume al lee
 Se usan `TypedDict` para tipar diccionarios sin acoplar el dominio al ORM.
 """
 
+from collections.abc import Iterator
 from typing import NotRequired, TypedDict
 
 
@@ -116,6 +117,19 @@ class InventoryItemView(TypedDict):
     movements: NotRequired[list[InventoryMovementView]]
 
 
+class InventoryItemsPageView(TypedDict):
+    items: list[InventoryItemView]
+    total: int | None
+    nextCursor: str | None
+    prevCursor: str | None
+
+
+class InventorySearchHitView(TypedDict):
+    item: InventoryItemView
+    rank: float
+    matchedOn: str
+
+
 class InventorySummaryCategoryView(TypedDict):
     name: str
     color: str | None
@@ -150,9 +164,11 @@ class InventorySummaryView(TypedDict):
 
 class InventoryMovementsPageView(TypedDict):
     movements: list[InventoryMovementView]
-    total: int
+    total: int | None
     limit: int
     offset: int
+    nextCursor: str | None
+    prevCursor: str | None
 
 
 class InventoryMutationResult(TypedDict):
@@ -170,3 +186,85 @@ class InventoryCheckInOutResult(TypedDict):
     status: str
     location: str | None
     product: InventoryShortProductView | None
+    # Solo en contenedores: lo que pasó con su contenido (a cualquier profundidad).
+    contents: NotRequired['InventoryBulkCheckInOutResult']
+
+
+class InventoryTreeNodeView(TypedDict):
+    id: str
+    serialNumber: str | None
+    assetTag: str | None
+    type: str
+    status: str
+    location: str | None
+    containerId: str | None
+    depth: int
+    product: InventoryShortProductView | None
+    contents: list['InventoryTreeNodeView']
+
+
+class InventoryBulkItemView(TypedDict):
+    id: str
+    status: str
+    location: str | None
+
+
+class InventoryBulkSkippedView(TypedDict):
+    id: str
+    reason: str
+
+
+class InventoryBulkCheckInOutResult(TypedDict):
+    updated: list[InventoryBulkItemView]
+    alreadyInState: list[str]
+    skipped: list[InventoryBulkSkippedView]
+
+
+class InventoryImportErrorView(TypedDict):
+    line: int
+    message: str
+
+
+class InventoryImportWriteResult(TypedDict):
+    created: int
+    errors: list[InventoryImportErrorView]
+
+
+class InventoryImportResultView(TypedDict):
+    received: int
+    created: int
+    failed: int
+    dryRun: bool
+    errors: list[InventoryImportErrorView]
+    errorsTruncated: bool
+
+
+class InventoryExportView(TypedDict):
+    # Filas como tuplas en el orden de `columns`; se leen a medida que se consumen.
+    columns: list[str]
+    rows: Iterator[tuple]
+
+
+class InventoryItemStateView(TypedDict):
+    id: str
+    asOf: object
+    # `None` si el item no tenía movimientos hasta `asOf` (p. ej. aún no existía).
+    status: str | None
+    location: str | None
+    changedAt: object | None
+    movementType: str | None
+
+
+class InventoryAsOfSummaryView(TypedDict):
+    asOf: object
+    snapshotAt: object | None
+    total: int
+    byStatus: dict[str, int]
+    byType: dict[str, int]
+    byCategory: list[InventorySummaryCategoryView]
+
+
+class InventorySnapshotView(TypedDict):
+    id: str
+    takenAt: object
+    itemCount: int
@@ -1,6 +1,7 @@
 """Entidades y estructuras de negocio del dominio `rfid`."""
 
 from dataclasses import dataclass
+from datetime import datetime
 
 
 @dataclass(slots=True)
@@ -16,3 +17,16 @@ class DetectionFilters:
     direction: str
     limit: int
     offset: int
+    since: datetime | None = None
+    until: datetime | None = None
+    cursor: str | None = None
+    include_total: bool = False
+
+
+@dataclass(slots=True)
+class ActivityFilters:
+    rfid_tag_id: str
+    reader_id: str
+    since: datetime | None = None
+    until: datetime | None = None
+    granularity: str = 'hour'
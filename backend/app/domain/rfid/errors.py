@@ -26,3 +26,19 @@ class InvalidTimestampError(Exception):
 
 class InvalidApiKeyError(Exception):
     pass
+
+
+class IngestQueueFullError(Exception):
+    pass
+
+
+class IngestBatchNotFoundError(Exception):
+    pass
+
+
+class InvalidActivityFilterError(Exception):
+    pass
+
+
+class InvalidCursorError(Exception):
+    pass
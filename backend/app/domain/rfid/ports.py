@@ -1,13 +1,18 @@
 """Puertos (interfaces) del dominio `rfid` para desacoplar infraestructura."""
 
+from datetime import datetime
 from typing import Protocol
 
-from app.domain.rfid.entities import DetectionFilters, TagFilters
+from app.domain.rfid.entities import ActivityFilters, DetectionFilters, TagFilters
 from app.domain.rfid.read_models import (
+    RfidActivityView,
+    RfidDetectionEvent,
     RfidDetectionPageView,
+    RfidIngestBatchView,
     RfidMutationResult,
     RfidReadPayload,
     RfidReadResult,
+    RfidReaderView,
     RfidTagPayload,
     RfidTagView,
 )
@@ -20,7 +25,7 @@ class RfidRepository(Protocol):
 
     def list_unknown_tags(self) -> list[RfidTagView]: ...
 
-    def get_tag(self, tag_id: str) -> RfidTagView: ...
+    def get_tag(self, tag_id: str, before: str | None = None) -> RfidTagView: ...
 
     def update_tag(self, tag_id: str, payload: RfidTagPayload) -> RfidTagView: ...
 
@@ -34,6 +39,38 @@ class RfidRepository(Protocol):
 
     def process_read(self, payload: RfidReadPayload, api_key: str) -> RfidReadResult: ...
 
+    def confirm_reads(self) -> None: ...
+
+    def discard_reads(self) -> None: ...
+
+    def list_activity(self, filters: ActivityFilters) -> RfidActivityView: ...
+
+    def backfill_rollups(self, since: datetime, until: datetime) -> int: ...
+
+    def save_reader_stats(self, rows: list[RfidReaderView]) -> None: ...
+
+
+class RfidIngestQueue(Protocol):
+    """Cola acotada de lotes de lectura que se persisten en segundo plano."""
+
+    def submit(self, payload: RfidReadPayload) -> RfidIngestBatchView: ...
+
+    def get(self, batch_id: str) -> RfidIngestBatchView | None: ...
+
+
+class RfidDetectionPublisher(Protocol):
+    """Difunde las lecturas confirmadas a los suscriptores del feed en vivo."""
+
+    def publish(self, events: list[RfidDetectionEvent]) -> None: ...
+
+
+class RfidReaderMonitor(Protocol):
+    """Registra la salud y el rendimiento de cada lector a partir de los lotes procesados."""
+
+    def record_batch(self, reader_id: str, reader_name: str | None, reads: int, unknown_reads: int, latency_ms: float) -> None: ...
+
+    def record_error(self, reader_id: str, reader_name: str | None) -> None: ...
+
 
 class UnitOfWork(Protocol):
     def commit(self) -> None: ...
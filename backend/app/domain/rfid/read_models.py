@@ -1,5 +1,6 @@
 """Modelos tipados de lectura para `rfid` (salidas/consultas)."""
 
+from datetime import datetime
 from typing import TypedDict
 
 
@@ -21,8 +22,11 @@ class RfidTagView(TypedDict, total=False):
 class RfidDetectionPageView(TypedDict):
     detections: list[dict]
     total: int
+    totalExact: bool
     limit: int
     offset: int
+    nextCursor: str | None
+    prevCursor: str | None
 
 
 class RfidMutationResult(TypedDict):
@@ -38,3 +42,61 @@ class RfidReadPayload(TypedDict, total=False):
     readerId: str
     timestamp: str
     detections: list[dict]
+
+
+class RfidDetectionEvent(TypedDict):
+    """Lectura ya confirmada, tal como se emite en el feed en vivo."""
+
+    epc: str
+    tagId: str
+    status: str
+    readerId: str
+    readerName: str | None
+    direction: str | None
+    rssi: int | None
+    timestamp: str
+    isNew: bool
+    inventoryItemId: str | None
+    inventoryUpdated: bool
+
+
+class RfidReaderView(TypedDict, total=False):
+    readerId: str
+    readerName: str | None
+    status: str
+    lastSeenAt: datetime
+    readsPerSecond: float
+    unknownRatio: float | None
+    latencyMs: dict
+
+
+class RfidIngestBatchView(TypedDict, total=False):
+    batchId: str
+    status: str
+    readerId: str
+    reads: int
+    queuedAt: str
+    startedAt: str | None
+    completedAt: str | None
+    result: RfidReadResult | None
+    error: str | None
+
+
+class RfidActivityBucketView(TypedDict):
+    bucket: str
+    readerId: str
+    readCount: int
+    tagCount: int
+    firstSeenAt: str
+    lastSeenAt: str
+    rssiMin: int | None
+    rssiMax: int | None
+    rssiAvg: float | None
+
+
+class RfidActivityView(TypedDict):
+    granularity: str
+    since: str
+    until: str
+    readCount: int
+    buckets: list[RfidActivityBucketView]
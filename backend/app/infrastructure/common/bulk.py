@@ -0,0 +1,20 @@
+"""Escrituras por lotes en PostgreSQL con arrays y `unnest`.
+
+Un lote completo viaja como un puñado de arrays en una sola sentencia, en lugar de
+una sentencia (o un `VALUES` enorme) por fila: el SQL no cambia con el tamaño del
+lote, así que compilarlo cuesta lo mismo para 10 filas que para 10.000.
+"""
+
+from sqlalchemy import bindparam, func
+from sqlalchemy.dialects.postgresql import ARRAY
+
+
+def array_param(items: list, item_type) -> object:
+    """Bind de un array PostgreSQL: la sentencia no cambia con el tamaño del lote."""
+    return bindparam(None, items, type_=ARRAY(item_type))
+
+
+def unnest_rows(name: str, columns: dict[str, object], rows: list[tuple]):
+    """`unnest(:col1, :col2, ...) AS name(col1, col2, ...)` a partir de filas."""
+    arrays = [array_param([row[index] for row in rows], column_type) for index, column_type in enumerate(columns.values())]
+    return func.unnest(*arrays).table_valued(*columns).render_derived(name=name)
@@ -0,0 +1,36 @@
+"""Escritura de CSV por partes para respuestas en streaming."""
+
+import csv
+import io
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime
+from decimal import Decimal
+
+
+def _cell(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return format(value, 'f')
+    return value
+
+
+def iter_csv(columns: list[str], rows: Iterable[tuple], rows_per_chunk: int = 500) -> Iterator[bytes]:
+    """CSV en UTF-8 (con BOM, para que las planillas lo abran bien) en trozos de `rows_per_chunk` filas.
+
+    Solo se retiene en memoria el trozo en curso, sin importar cuántas filas haya.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write('\ufeff')
+    writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        writer.writerow([_cell(value) for value in row])
+        pending += 1
+        if pending == rows_per_chunk:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode('utf-8')
@@ -0,0 +1,31 @@
+"""Cursores opacos para paginación por clave (keyset).
+
+Un cursor codifica la clave de orden de una fila límite (p. ej. `(timestamp, id)`)
+y el sentido de avance en base64 url-safe: `next` pide las filas posteriores a la
+clave en el orden del listado y `prev` las anteriores. Para el cliente es un valor
+opaco que solo se devuelve tal cual.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+CURSOR_DIRECTIONS = ('next', 'prev')
+
+
+def encode_cursor(moment: datetime, row_id: str, direction: str = 'next') -> str:
+    raw = json.dumps([moment.isoformat(), row_id, direction], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str, str]:
+    """Devuelve `(timestamp, id, sentido)`. Lanza `ValueError` si el cursor no es válido."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        moment, row_id, direction = json.loads(raw)
+        parsed = datetime.fromisoformat(moment)
+    except (ValueError, TypeError) as exc:
+        raise ValueError('Cursor invalido') from exc
+    if parsed.tzinfo is None or not isinstance(row_id, str) or direction not in CURSOR_DIRECTIONS:
+        raise ValueError('Cursor invalido')
+    return parsed, row_id, direction
@@ -0,0 +1,181 @@
+"""Mantenimiento de tablas PostgreSQL particionadas por rango de tiempo.
+
+Convenciones:
+- Cada partición cubre un periodo (`month` o `week`) en UTC y se llama
+  `<tabla>_p<AAAAMMDD>` según el inicio del periodo.
+- La tabla tiene además una partición `<tabla>_default` que recibe filas fuera de
+  cualquier rango (timestamps muy antiguos o futuros erróneos).
+- Las funciones solo ejecutan DDL/DML sobre la conexión o sesión recibida: quien
+  llama decide cuándo confirmar.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+INTERVALS = ('month', 'week')
+
+_BOUND_RE = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+_PARTITION_NAME_RE = re.compile(r'_(p\d{8}|default)$')
+
+
+@dataclass(frozen=True, slots=True)
+class Partition:
+    name: str
+    start: datetime
+    end: datetime
+
+
+def is_partition_name(name: str) -> bool:
+    """Indica si un nombre de tabla sigue la convención de particiones (adjunta o no)."""
+    return bool(_PARTITION_NAME_RE.search(name))
+
+
+def period_start(moment: datetime, interval: str) -> datetime:
+    moment = moment.astimezone(timezone.utc)
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if interval == 'month':
+        return day.replace(day=1)
+    if interval == 'week':
+        return day - timedelta(days=day.weekday())
+    raise ValueError(f'Intervalo de particion no soportado: {interval}')
+
+
+def next_period(start: datetime, interval: str) -> datetime:
+    if interval == 'month':
+        return start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    if interval == 'week':
+        return start + timedelta(days=7)
+    raise ValueError(f'Intervalo de particion no soportado: {interval}')
+
+
+def partition_name(table: str, start: datetime) -> str:
+    return f'{table}_p{start:%Y%m%d}'
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _literal(moment: datetime) -> str:
+    return "'" + moment.isoformat() + "'"
+
+
+def lock_maintenance(db, table: str) -> None:
+    """Serializa el mantenimiento de `table` entre procesos hasta el fin de la transacción."""
+    db.execute(text('SELECT pg_advisory_xact_lock(hashtext(:table))'), {'table': f'partitions:{table}'})
+
+
+def is_partitioned(db, table: str) -> bool:
+    return bool(
+        db.execute(
+            text("SELECT 1 FROM pg_class WHERE relname = :table AND relkind = 'p'"),
+            {'table': table},
+        ).scalar()
+    )
+
+
+def list_partitions(db, table: str) -> list[Partition]:
+    """Particiones de rango adjuntas a `table`, ordenadas por inicio (sin la `DEFAULT`)."""
+    rows = db.execute(
+        text(
+            '''
+            SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)
+            FROM pg_inherits AS inh
+            JOIN pg_class AS child ON child.oid = inh.inhrelid
+            JOIN pg_class AS parent ON parent.oid = inh.inhparent
+            WHERE parent.relname = :table
+            '''
+        ),
+        {'table': table},
+    ).all()
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND_RE.search(bound or '')
+        if not match:
+            continue
+        start, end = (datetime.fromisoformat(value).astimezone(timezone.utc) for value in match.groups())
+        partitions.append(Partition(name=name, start=start, end=end))
+    return sorted(partitions, key=lambda partition: partition.start)
+
+
+def create_partition(db, table: str, column: str, start: datetime, end: datetime) -> str:
+    """Crea y adjunta la partición `[start, end)`.
+
+    Las filas de ese rango que hubieran caído en la partición `DEFAULT` se mueven a
+    la nueva partición antes de adjuntarla (si no, `ATTACH` fallaría).
+    """
+    name = partition_name(table, start)
+    default = f'{table}_default'
+    db.execute(text(f'CREATE TABLE {_quote(name)} (LIKE {_quote(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'))
+    db.execute(
+        text(
+            f'''
+            WITH moved AS (
+                DELETE FROM {_quote(default)}
+                WHERE {_quote(column)} >= :start AND {_quote(column)} < :end
+                RETURNING *
+            )
+            INSERT INTO {_quote(name)} SELECT * FROM moved
+            '''
+        ),
+        {'start': start, 'end': end},
+    )
+    db.execute(
+        text(
+            f'ALTER TABLE {_quote(table)} ATTACH PARTITION {_quote(name)} '
+            f'FOR VALUES FROM ({_literal(start)}) TO ({_literal(end)})'
+        )
+    )
+    return name
+
+
+def ensure_partitions(
+    db,
+    table: str,
+    column: str,
+    interval: str,
+    *,
+    ahead: int,
+    since: datetime | None = None,
+    now: datetime | None = None,
+) -> list[str]:
+    """Garantiza particiones desde `since` (o el periodo actual) hasta `ahead` periodos a futuro.
+
+    Los rangos que ya se solapan con una partición existente se saltan, así que un
+    cambio de intervalo (`month` <-> `week`) convive con las particiones anteriores.
+    """
+    now = now or datetime.now(timezone.utc)
+    existing = list_partitions(db, table)
+    start = period_start(since or now, interval)
+    last = period_start(now, interval)
+    for _ in range(ahead):
+        last = next_period(last, interval)
+
+    created = []
+    while start <= last:
+        end = next_period(start, interval)
+        if not any(partition.start < end and start < partition.end for partition in existing):
+            created.append(create_partition(db, table, column, start, end))
+        start = end
+    return created
+
+
+def apply_retention(
+    db,
+    table: str,
+    *,
+    retention: timedelta,
+    action: str,
+    now: datetime | None = None,
+) -> list[str]:
+    """Desacopla (`detach`) o elimina (`drop`) las particiones completamente más antiguas que `retention`."""
+    cutoff = (now or datetime.now(timezone.utc)) - retention
+    expired = [partition for partition in list_partitions(db, table) if partition.end <= cutoff]
+    for partition in expired:
+        db.execute(text(f'ALTER TABLE {_quote(table)} DETACH PARTITION {_quote(partition.name)}'))
+        if action == 'drop':
+            db.execute(text(f'DROP TABLE {_quote(partition.name)}'))
+    return [partition.name for partition in expired]
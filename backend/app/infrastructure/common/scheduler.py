@@ -0,0 +1,48 @@
+"""Tareas periódicas en proceso (hilo daemon por tarea).
+
+Pensado para mantenimiento liviano (particiones, retención, conciliaciones) que
+no justifica un scheduler externo. Con varios workers cada proceso ejecuta su
+propia copia: las tareas deben ser idempotentes.
+"""
+
+import logging
+import threading
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    def __init__(self, name: str, interval_seconds: float, func: Callable[[], object], run_on_start: bool = True) -> None:
+        self._name = name
+        self._interval_seconds = interval_seconds
+        self._func = func
+        self._run_on_start = run_on_start
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._interval_seconds <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def run_once(self) -> None:
+        try:
+            self._func()
+        except Exception:
+            logger.exception('Fallo la tarea periodica %s', self._name)
+
+    def _run(self) -> None:
+        if self._run_on_start:
+            self.run_once()
+        while not self._stop.wait(self._interval_seconds):
+            self.run_once()
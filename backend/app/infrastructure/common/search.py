@@ -0,0 +1,39 @@
+"""Búsqueda por subcadena respaldada por índices trigram (`pg_trgm`).
+
+Los filtros `ILIKE '%term%'` solo pueden usar un índice GIN `gin_trgm_ops`. Esos
+índices (y la extensión) se crean en una migración únicamente si el servidor
+ofrece `pg_trgm`; sin ella las mismas consultas siguen funcionando con escaneo
+secuencial. Por eso no se declaran en los modelos: `alembic/env.py` los excluye de
+la comparación con `is_trigram_index`.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+TRIGRAM_INDEX_PREFIX = 'ix_trgm_'
+
+# Columnas de texto cubiertas por la búsqueda: `nombre_de_indice -> (tabla, columna)`.
+TRIGRAM_INDEXES = {
+    'ix_trgm_inventory_items_serial_number': ('inventory_items', 'serialNumber'),
+    'ix_trgm_inventory_items_asset_tag': ('inventory_items', 'assetTag'),
+    'ix_trgm_products_name': ('products', 'name'),
+    'ix_trgm_products_sku': ('products', 'sku'),
+    'ix_trgm_products_brand': ('products', 'brand'),
+    'ix_trgm_products_model': ('products', 'model'),
+    'ix_trgm_rfid_tags_epc': ('rfid_tags', 'epc'),
+    'ix_trgm_rfid_tags_tid': ('rfid_tags', 'tid'),
+}
+
+_trigram_available: bool | None = None
+
+
+def is_trigram_index(name: str) -> bool:
+    return name.startswith(TRIGRAM_INDEX_PREFIX)
+
+
+def trigram_available(db: Session) -> bool:
+    """Si `pg_trgm` está instalada en la base (se consulta una vez por proceso)."""
+    global _trigram_available
+    if _trigram_available is None:
+        _trigram_available = bool(db.scalar(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")))
+    return _trigram_available
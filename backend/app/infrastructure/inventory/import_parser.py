@@ -0,0 +1,127 @@
+"""Lectura en streaming de archivos de importación de inventario (CSV o NDJSON).
+
+Las columnas (o claves JSON) son las mismas de `POST /inventory`: `productId` o
+`productSku`, `serialNumber`, `assetTag`, `type` (por defecto `UNIT`), `status` (por
+defecto `IN`), `condition`, `location`, `containerId`, `purchaseDate`,
+`purchasePrice`, `warrantyExpiry` y `notes`.
+
+El archivo se recorre línea a línea y cada fila se entrega apenas se lee, así que la
+memoria no depende del tamaño del archivo. Una fila mal formada no detiene la
+lectura: sale con `error` para que aparezca en el reporte.
+"""
+
+import csv
+import io
+import json
+from collections.abc import Iterator
+from typing import BinaryIO
+
+from app.domain.inventory.entities import InventoryImportRow, InventoryItemInput
+from app.domain.inventory.errors import InvalidImportFileError
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+_NDJSON_EXTENSIONS = ('.ndjson', '.jsonl')
+_NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/jsonl', 'application/json-seq')
+
+
+def detect_import_format(fmt: str | None, filename: str | None, content_type: str | None) -> str:
+    """Formato explícito, o inferido por extensión/tipo de contenido (CSV si no hay pistas)."""
+    if fmt:
+        fmt = fmt.lower()
+        if fmt not in IMPORT_FORMATS:
+            raise InvalidImportFileError('Formato de importacion no soportado (csv o ndjson)')
+        return fmt
+    if (filename or '').lower().endswith(_NDJSON_EXTENSIONS) or (content_type or '').lower() in _NDJSON_CONTENT_TYPES:
+        return 'ndjson'
+    return 'csv'
+
+
+def _text(value) -> str | None:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _row(line: int, data: dict) -> InventoryImportRow:
+    price = data.get('purchasePrice')
+    if isinstance(price, str):
+        price = price.strip() or None
+    try:
+        price = float(price) if price is not None else None
+    except (TypeError, ValueError):
+        return InventoryImportRow(line=line, item=None, error='Precio de compra invalido')
+
+    item = InventoryItemInput(
+        product_id=_text(data.get('productId')) or '',
+        serial_number=_text(data.get('serialNumber')),
+        asset_tag=_text(data.get('assetTag')),
+        item_type=(_text(data.get('type')) or 'UNIT').upper(),
+        status=(_text(data.get('status')) or 'IN').upper(),
+        condition=_text(data.get('condition')),
+        location=_text(data.get('location')),
+        container_id=_text(data.get('containerId')),
+        purchase_date=_text(data.get('purchaseDate')),
+        purchase_price=price,
+        warranty_expiry=_text(data.get('warrantyExpiry')),
+        notes=_text(data.get('notes')),
+    )
+    return InventoryImportRow(line=line, item=item, product_sku=_text(data.get('productSku')))
+
+
+def _csv_rows(text: io.TextIOBase) -> Iterator[InventoryImportRow]:
+    reader = csv.DictReader(text)
+    try:
+        header = reader.fieldnames
+    except (csv.Error, UnicodeDecodeError):
+        raise InvalidImportFileError('No se pudo leer el encabezado del CSV') from None
+    if not header or not {'productId', 'productSku'} & {name.strip() for name in header}:
+        raise InvalidImportFileError('El CSV debe tener una columna productId o productSku')
+    reader.fieldnames = [name.strip() for name in header]
+    while True:
+        try:
+            data = next(reader)
+        except StopIteration:
+            return
+        except (csv.Error, UnicodeDecodeError) as exc:
+            raise InvalidImportFileError(f'CSV invalido cerca de la linea {reader.line_num}: {exc}') from None
+        if None in data:
+            yield InventoryImportRow(line=reader.line_num, item=None, error='La fila tiene mas columnas que el encabezado')
+            continue
+        if not any(value and value.strip() for value in data.values()):
+            continue
+        yield _row(reader.line_num, data)
+
+
+def _ndjson_rows(text: io.TextIOBase) -> Iterator[InventoryImportRow]:
+    line = 0
+    while True:
+        try:
+            raw = text.readline()
+        except UnicodeDecodeError:
+            raise InvalidImportFileError(f'El archivo no es UTF-8 valido (linea {line + 1})') from None
+        if not raw:
+            return
+        line += 1
+        if not raw.strip():
+            continue
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError:
+            yield InventoryImportRow(line=line, item=None, error='JSON invalido')
+            continue
+        if not isinstance(data, dict):
+            yield InventoryImportRow(line=line, item=None, error='Se esperaba un objeto JSON')
+            continue
+        yield _row(line, data)
+
+
+def iter_import_rows(stream: BinaryIO, fmt: str) -> Iterator[InventoryImportRow]:
+    """Filas del archivo en orden, leídas a medida que se consumen."""
+    # `utf-8-sig` descarta el BOM que agregan las planillas al exportar CSV.
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='' if fmt == 'csv' else None)
+    try:
+        yield from _csv_rows(text) if fmt == 'csv' else _ndjson_rows(text)
+    finally:
+        # El stream pertenece a quien lo abrió: se suelta sin cerrarlo.
+        text.detach()
@@ -0,0 +1,151 @@
+"""Reconstrucción del estado del inventario en una fecha pasada.
+
+El estado de un item en la fecha `D` es el `toStatus`/`toLocation` de su último
+movimiento con `createdAt <= D`. Recorrer todo el libro para cada consulta crece con
+los años, así que periódicamente se guarda una foto compacta `(item, estado,
+ubicación)` en `inventory_snapshots`:
+
+- Una consulta parte de la foto más reciente anterior a `D` y solo aplica los
+  movimientos de `(foto, D]`, que además caen en pocas particiones de
+  `inventory_movements`.
+- Cada foto se arma igual, desde la anterior más los movimientos intermedios: es
+  una caché de la reconstrucción y da el mismo resultado que recorrer el libro.
+- `createdAt` es el inicio de la transacción que escribe el movimiento: uno que
+  todavía no confirmó quedaría fuera de la foto para siempre. Por eso el corte va
+  con un desfase y, además, justo antes del `xact_start` de la transacción abierta
+  más antigua de la base (una importación o un check-in masivo pueden durar más
+  que el desfase). Una sesión que queda abierta mucho tiempo retrasa las fotos,
+  nunca las deja incompletas.
+
+Los items borrados no se reconstruyen (sus movimientos se borran con ellos) y el
+tipo y la categoría son los actuales: el libro solo registra estado y ubicación.
+"""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import case, delete, func, insert, literal, select, text, update
+from sqlalchemy.orm import Session
+
+from app.models.catalog_inventory import InventoryItem, InventoryMovement, InventorySnapshot, InventorySnapshotItem
+
+
+def nearest_snapshot(db: Session, as_of: datetime):
+    """`(id, taken_at)` de la foto más reciente con `takenAt <= as_of`, o `None`."""
+    return db.execute(
+        select(InventorySnapshot.id, InventorySnapshot.taken_at)
+        .where(InventorySnapshot.taken_at <= as_of)
+        .order_by(InventorySnapshot.taken_at.desc())
+        .limit(1)
+    ).first()
+
+
+def state_at(as_of: datetime, snapshot=None):
+    """Subconsulta `(item_id, status, location)` con el estado de cada item en `as_of`."""
+    window = [InventoryMovement.created_at <= as_of]
+    if snapshot is not None:
+        window.append(InventoryMovement.created_at > snapshot.taken_at)
+    moved = (
+        select(
+            InventoryMovement.inventory_item_id.label('item_id'),
+            InventoryMovement.to_status.label('status'),
+            InventoryMovement.to_location.label('location'),
+        )
+        .where(*window)
+        .distinct(InventoryMovement.inventory_item_id)
+        .order_by(InventoryMovement.inventory_item_id, InventoryMovement.created_at.desc(), InventoryMovement.id.desc())
+        .subquery('moved')
+    )
+    if snapshot is None:
+        return moved
+
+    base = (
+        select(
+            InventorySnapshotItem.inventory_item_id.label('item_id'),
+            InventorySnapshotItem.status,
+            InventorySnapshotItem.location,
+        )
+        .where(InventorySnapshotItem.snapshot_id == snapshot.id)
+        .subquery('base')
+    )
+    # Un movimiento posterior a la foto reemplaza el estado de la foto (aunque deje la ubicación en NULL).
+    was_moved = moved.c.item_id.is_not(None)
+    return (
+        select(
+            func.coalesce(moved.c.item_id, base.c.item_id).label('item_id'),
+            case((was_moved, moved.c.status), else_=base.c.status).label('status'),
+            case((was_moved, moved.c.location), else_=base.c.location).label('location'),
+        )
+        .select_from(base.join(moved, moved.c.item_id == base.c.item_id, full=True))
+        .subquery('state')
+    )
+
+
+def _oldest_open_transaction(db: Session) -> datetime | None:
+    # Sin `pg_read_all_stats` solo se ven las sesiones del mismo rol (las de la app).
+    return db.scalar(
+        text(
+            "SELECT min(xact_start) FROM pg_stat_activity "
+            "WHERE datname = current_database() AND backend_type = 'client backend' AND pid <> pg_backend_pid()"
+        )
+    )
+
+
+def save_snapshot(db: Session, cutoff: datetime, min_interval: timedelta) -> tuple[str, datetime, int] | None:
+    """Guarda la foto del inventario en `cutoff` (o antes); devuelve `(id, takenAt, items)` o `None`.
+
+    El corte retrocede hasta antes de la transacción abierta más antigua. No se toma
+    si ya hay una foto a menos de `min_interval` del corte, así que varios procesos con
+    la misma tarea periódica no duplican fotos.
+    """
+    db.execute(text('SELECT pg_advisory_xact_lock(hashtext(:key))'), {'key': 'inventory_snapshots'})
+    oldest_open = _oldest_open_transaction(db)
+    if oldest_open is not None and oldest_open <= cutoff:
+        cutoff = oldest_open - timedelta(microseconds=1)
+    latest = db.scalar(select(func.max(InventorySnapshot.taken_at)))
+    if latest is not None and latest > cutoff - min_interval:
+        return None
+
+    snapshot_id = str(uuid4())
+    previous = nearest_snapshot(db, cutoff)
+    state = state_at(cutoff, previous)
+    db.execute(insert(InventorySnapshot).values(id=snapshot_id, taken_at=cutoff))
+    db.execute(
+        insert(InventorySnapshotItem).from_select(
+            [
+                InventorySnapshotItem.snapshot_id,
+                InventorySnapshotItem.inventory_item_id,
+                InventorySnapshotItem.status,
+                InventorySnapshotItem.location,
+            ],
+            select(literal(snapshot_id), state.c.item_id, state.c.status, state.c.location).join(
+                InventoryItem, InventoryItem.id == state.c.item_id
+            ),
+        )
+    )
+    item_count = (
+        select(func.count())
+        .select_from(InventorySnapshotItem)
+        .where(InventorySnapshotItem.snapshot_id == snapshot_id)
+        .scalar_subquery()
+    )
+    taken = db.scalar(
+        update(InventorySnapshot)
+        .where(InventorySnapshot.id == snapshot_id)
+        .values(item_count=item_count)
+        .returning(InventorySnapshot.item_count)
+    )
+    return snapshot_id, cutoff, taken
+
+
+def apply_snapshot_retention(db: Session, older_than: datetime) -> int:
+    """Borra las fotos anteriores a `older_than`, salvo la más reciente de ellas.
+
+    Esa se conserva para que las fechas justo después del corte sigan partiendo de
+    una foto; las anteriores vuelven a reconstruirse desde el libro.
+    """
+    keep = nearest_snapshot(db, older_than)
+    if keep is None:
+        return 0
+    result = db.execute(delete(InventorySnapshot).where(InventorySnapshot.taken_at < keep.taken_at))
+    return result.rowcount
@@ -1,36 +1,232 @@
 """Adaptador de infraestructura para `inventory` (persistencia concreta)."""
 
-from datetime import datetime
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import islice
 from uuid import uuid4
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    Numeric,
+    String,
+    Text,
+    and_,
+    any_,
+    case,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    union,
+    update,
+)
+from sqlalchemy.dialects.postgresql import array
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session, selectinload
-
-from app.domain.inventory.entities import CheckInOutInput, InventoryItemInput, InventoryListFilters, MovementListFilters
+from sqlalchemy.orm import Session, aliased, selectinload
+
+from app.domain.inventory.entities import (
+    BulkCheckInOutInput,
+    CheckInOutInput,
+    InventoryImportRow,
+    InventoryItemInput,
+    InventoryListFilters,
+    MovementExportFilters,
+    MovementListFilters,
+)
 from app.domain.inventory.errors import (
+    ContainerCycleError,
     DuplicateAssetTagError,
     DuplicateSerialError,
     InvalidDateFormatError,
+    InvalidInventoryFiltersError,
     InventoryItemNotFoundError,
     InventoryPersistenceError,
+    ItemGroupNotFoundError,
     ProductNotFoundOrInactiveError,
 )
 from app.domain.inventory.read_models import (
+    InventoryAsOfSummaryView,
+    InventoryBulkCheckInOutResult,
+    InventoryBulkSkippedView,
     InventoryCheckInOutResult,
+    InventoryExportView,
+    InventoryImportErrorView,
+    InventoryImportWriteResult,
+    InventoryItemsPageView,
+    InventoryItemStateView,
     InventoryItemView,
     InventoryMovementView,
     InventoryMovementsPageView,
     InventoryMutationResult,
+    InventorySearchHitView,
+    InventorySnapshotView,
     InventorySummaryView,
+    InventoryTreeNodeView,
+)
+from app.infrastructure.common.bulk import unnest_rows
+from app.infrastructure.common.cursors import decode_cursor, encode_cursor
+from app.infrastructure.common.search import trigram_available
+from app.infrastructure.inventory.snapshots import apply_snapshot_retention, nearest_snapshot, save_snapshot, state_at
+from app.infrastructure.inventory.summary_counters import (
+    CATEGORY,
+    STATUS,
+    TYPE,
+    SummaryCache,
+    apply_summary_deltas,
+    fold_summary_deltas,
+    item_deltas,
+    reconcile_summary_counters,
+    status_deltas,
+    summary_counts,
+)
+from app.infrastructure.rfid.epc_cache import EpcCache, invalidate_on_commit
+from app.models.catalog_inventory import (
+    Category,
+    InventoryItem,
+    InventoryMovement,
+    Product,
+    RfidTag,
 )
-from app.models.catalog_inventory import Category, InventoryItem, InventoryMovement, Product, RfidTag
+from app.models.project_client import ItemGroup, ItemGroupItem
 from app.models.user import User
 
 
+# Niveles de anidación que recorren los árboles de contenedores.
+MAX_CONTAINER_DEPTH = 32
+
+
+def _container_tree(root_id: str):
+    """CTE recursiva con `root_id` y todo lo que contiene, a cualquier profundidad.
+
+    Cada fila lleva su `depth` y el `path` de ids desde la raíz. Una rama no vuelve a
+    entrar en un id de su propio camino, así que un ciclo en `containerId` (p. ej.
+    escrito por fuera de la API) no hace girar la consulta sin fin; `MAX_CONTAINER_DEPTH`
+    acota además la profundidad.
+    """
+    tree = (
+        select(
+            InventoryItem.id.label('id'),
+            literal(None, String).label('parent_id'),
+            literal(0).label('depth'),
+            array([InventoryItem.id]).label('path'),
+        )
+        .where(InventoryItem.id == root_id)
+        .cte('container_tree', recursive=True)
+    )
+    child = aliased(InventoryItem)
+    return tree.union_all(
+        select(
+            child.id,
+            child.container_id,
+            tree.c.depth + 1,
+            func.array_append(tree.c.path, child.id),
+        ).where(
+            child.container_id == tree.c.id,
+            ~(child.id == any_(tree.c.path)),
+            tree.c.depth < MAX_CONTAINER_DEPTH,
+        )
+    )
+
+
+def _matching_item_ids(search_like: str):
+    """Ids de items cuyo texto (propio, de su producto o de su tag) contiene el término.
+
+    Una consulta por tabla unidas con `UNION`: cada rama puede resolverse con los
+    índices trigram de su tabla (`BitmapOr`), a diferencia de un `OR` entre
+    subconsultas `EXISTS` correlacionadas, que obliga a recorrer todos los items.
+    """
+    return union(
+        select(InventoryItem.id).where(
+            or_(InventoryItem.serial_number.ilike(search_like), InventoryItem.asset_tag.ilike(search_like))
+        ),
+        select(InventoryItem.id)
+        .join(Product, Product.id == InventoryItem.product_id)
+        .where(
+            or_(
+                Product.name.ilike(search_like),
+                Product.sku.ilike(search_like),
+                Product.brand.ilike(search_like),
+                Product.model.ilike(search_like),
+            )
+        ),
+        select(RfidTag.inventory_item_id).where(
+            RfidTag.inventory_item_id.is_not(None),
+            or_(RfidTag.epc.ilike(search_like), RfidTag.tid.ilike(search_like)),
+        ),
+    )
+
+
+# Columnas del lote de importación, enviadas como un array por columna (`unnest`).
+_IMPORT_COLUMNS = {
+    'id': String,
+    'movement_id': String,
+    'product_id': String,
+    'serial_number': String,
+    'asset_tag': String,
+    'type': String,
+    'status': String,
+    'condition': String,
+    'location': String,
+    'container_id': String,
+    'purchase_date': DateTime(timezone=True),
+    'purchase_price': Numeric(10, 2),
+    'warranty_expiry': DateTime(timezone=True),
+    'notes': Text,
+}
+
+
+@dataclass(slots=True)
+class _ImportState:
+    """Lo ya resuelto durante una importación, para no volver a consultarlo en cada lote."""
+
+    # id/SKU -> `(product_id, category_id)`, o `None` si no existe o está inactivo.
+    products_by_id: dict[str, tuple[str, str] | None] = field(default_factory=dict)
+    products_by_sku: dict[str, tuple[str, str] | None] = field(default_factory=dict)
+    containers: dict[str, bool] = field(default_factory=dict)
+    # Seriales/etiquetas ya importados -> línea donde aparecieron.
+    serials: dict[str, int] = field(default_factory=dict)
+    asset_tags: dict[str, int] = field(default_factory=dict)
+
+
 class SqlAlchemyInventoryRepository:
-    def __init__(self, db: Session) -> None:
+    def __init__(
+        self,
+        db: Session,
+        epc_cache: EpcCache | None = None,
+        summary_cache: SummaryCache | None = None,
+    ) -> None:
         self._db = db
+        self._epc_cache = epc_cache
+        self._summary_cache = summary_cache
+
+    def _invalidate_rfid(self, item_id: str) -> None:
+        """La caché RFID guarda el estado del item vinculado: se invalida al cambiarlo y tras el commit."""
+        if self._epc_cache:
+            invalidate_on_commit(self._db, self._epc_cache, inventory_item_ids=[item_id])
+
+    def _apply_summary(self, deltas: Counter) -> None:
+        """Registra los deltas del resumen en la transacción actual y descarta la caché."""
+        apply_summary_deltas(self._db, deltas)
+        if self._summary_cache:
+            self._summary_cache.invalidate()
+
+    def _category_of(self, product_id: str | None) -> str | None:
+        product = self._db.get(Product, product_id) if product_id else None
+        return product.category_id if product else None
+
+    def reconcile_summary(self) -> int:
+        repaired = reconcile_summary_counters(self._db)
+        if self._summary_cache:
+            self._summary_cache.invalidate()
+        return repaired
+
+    def fold_summary(self) -> int:
+        return fold_summary_deltas(self._db)
 
     @staticmethod
     def _to_float(value):
@@ -60,13 +256,165 @@ class SqlAlchemyInventoryRepository:
             'user': user_map.get(movement.performed_by),
         }
 
-    def _item_payload(
-        self,
-        item: InventoryItem,
-        movement_count: int = 0,
-        contents_count: int = 0,
-        include_details: bool = False,
-    ) -> InventoryItemView:
+    def _adjust_contents(self, container_id: str | None, delta: int) -> None:
+        """Suma `delta` a `contentsCount` del contenedor con un `UPDATE` atómico (sin leer antes)."""
+        if not container_id:
+            return
+        self._db.execute(
+            update(InventoryItem)
+            .where(InventoryItem.id == container_id)
+            .values(contents_count=InventoryItem.contents_count + delta)
+        )
+
+    def bulk_check_in_out(self, target_status: str, payload: BulkCheckInOutInput, user_id: str) -> InventoryBulkCheckInOutResult:
+        """Check-in/out de toda la selección con un número fijo de sentencias.
+
+        1. `SELECT ... FOR UPDATE` de la selección (ids, contenedor con todo su
+           contenido a cualquier profundidad, grupo), en orden de id para que dos operaciones en bloque no se crucen.
+        2. Un `UPDATE ... RETURNING` condicionado al estado para los que aplican.
+        3. Un `INSERT ... SELECT FROM unnest` con todos sus movimientos.
+        """
+        sources = []
+        if payload.item_ids:
+            sources.append(select(InventoryItem.id).where(InventoryItem.id.in_(payload.item_ids)))
+        if payload.container_id:
+            tree = _container_tree(payload.container_id)
+            sources.append(select(tree.c.id))
+        if payload.group_id:
+            if self._db.get(ItemGroup, payload.group_id) is None:
+                raise ItemGroupNotFoundError('Grupo de items no encontrado')
+            sources.append(select(ItemGroupItem.inventory_item_id).where(ItemGroupItem.group_id == payload.group_id))
+        selection = sources[0] if len(sources) == 1 else union(*sources)
+        current = self._db.execute(
+            select(InventoryItem.id, InventoryItem.status, InventoryItem.location)
+            .where(InventoryItem.id.in_(selection))
+            .order_by(InventoryItem.id)
+            .with_for_update()
+        ).all()
+
+        found = {row.id: row for row in current}
+        if payload.container_id and payload.container_id not in found:
+            raise InventoryItemNotFoundError('Contenedor no encontrado')
+        skipped: list[InventoryBulkSkippedView] = [
+            {'id': item_id, 'reason': 'Item de inventario no encontrado'} for item_id in payload.item_ids if item_id not in found
+        ]
+        already_in_state: list[str] = []
+        eligible = []
+        for row in current:
+            if row.status == target_status:
+                already_in_state.append(row.id)
+            elif target_status == 'OUT' and row.status == 'LOST':
+                skipped.append({'id': row.id, 'reason': 'No se puede hacer check-out de un item perdido'})
+            else:
+                eligible.append(row)
+        if not eligible:
+            return {'updated': [], 'alreadyInState': already_in_state, 'skipped': skipped}
+
+        # Igual que el check-in/out individual: la salida toma la ubicación indicada y
+        # la entrada conserva la anterior si no se indica otra.
+        if target_status == 'OUT':
+            location = payload.location
+        else:
+            location = func.coalesce(payload.location or None, InventoryItem.location)
+        updated = self._db.execute(
+            update(InventoryItem)
+            .where(InventoryItem.id.in_([row.id for row in eligible]), InventoryItem.status != target_status)
+            .values(status=target_status, location=location, movement_count=InventoryItem.movement_count + 1)
+            .returning(InventoryItem.id, InventoryItem.location)
+            .execution_options(synchronize_session=False)
+        ).all()
+        new_locations = dict(updated)
+
+        movements = unnest_rows(
+            'bulk_movements',
+            {'id': String, 'item_id': String, 'from_status': String, 'from_location': String, 'to_location': String},
+            [
+                (str(uuid4()), row.id, row.status, row.location, new_locations[row.id])
+                for row in eligible
+                if row.id in new_locations
+            ],
+        )
+        self._db.execute(
+            insert(InventoryMovement).from_select(
+                [
+                    InventoryMovement.id,
+                    InventoryMovement.inventory_item_id,
+                    InventoryMovement.type,
+                    InventoryMovement.from_status,
+                    InventoryMovement.to_status,
+                    InventoryMovement.from_location,
+                    InventoryMovement.to_location,
+                    InventoryMovement.reason,
+                    InventoryMovement.reference,
+                    InventoryMovement.performed_by,
+                ],
+                select(
+                    movements.c.id,
+                    movements.c.item_id,
+                    literal('CHECK_IN' if target_status == 'IN' else 'CHECK_OUT'),
+                    movements.c.from_status,
+                    literal(target_status),
+                    movements.c.from_location,
+                    movements.c.to_location,
+                    literal(payload.reason, String),
+                    literal(payload.reference, String),
+                    literal(user_id),
+                ),
+            )
+        )
+
+        deltas: Counter = Counter()
+        for row in eligible:
+            if row.id in new_locations:
+                deltas.update(status_deltas(row.status, target_status))
+                self._invalidate_rfid(row.id)
+        self._apply_summary(deltas)
+        return {
+            'updated': [{'id': item_id, 'status': target_status, 'location': location} for item_id, location in updated],
+            'alreadyInState': already_in_state,
+            'skipped': skipped,
+        }
+
+    def repair_counters(self) -> int:
+        """Recalcula `movementCount`/`contentsCount` desde las tablas y corrige los que difieren."""
+        movements = (
+            select(InventoryMovement.inventory_item_id.label('item_id'), func.count().label('total'))
+            .group_by(InventoryMovement.inventory_item_id)
+            .subquery()
+        )
+        children = aliased(InventoryItem)
+        contents = (
+            select(children.container_id.label('item_id'), func.count().label('total'))
+            .where(children.container_id.is_not(None))
+            .group_by(children.container_id)
+            .subquery()
+        )
+        parent = aliased(InventoryItem)
+        expected = (
+            select(
+                parent.id.label('id'),
+                func.coalesce(movements.c.total, 0).label('movements'),
+                func.coalesce(contents.c.total, 0).label('contents'),
+            )
+            .outerjoin(movements, movements.c.item_id == parent.id)
+            .outerjoin(contents, contents.c.item_id == parent.id)
+            .subquery()
+        )
+        result = self._db.execute(
+            update(InventoryItem)
+            .where(
+                InventoryItem.id == expected.c.id,
+                or_(
+                    InventoryItem.movement_count != expected.c.movements,
+                    InventoryItem.contents_count != expected.c.contents,
+                ),
+            )
+            .values(movement_count=expected.c.movements, contents_count=expected.c.contents)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def _item_payload(self, item: InventoryItem, include_details: bool = False) -> InventoryItemView:
         payload = {
             'id': item.id,
             'productId': item.product_id,
@@ -120,8 +468,8 @@ class SqlAlchemyInventoryRepository:
             if item.rfid_tag
             else None,
             '_count': {
-                'movements': movement_count,
-                'contents': contents_count,
+                'movements': item.movement_count,
+                'contents': item.contents_count,
             },
         }
 
@@ -144,19 +492,11 @@ class SqlAlchemyInventoryRepository:
 
         return payload
 
-    def list_items(self, filters: InventoryListFilters) -> list[InventoryItemView]:
+    def _item_conditions(self, filters: InventoryListFilters) -> list:
         conditions = []
 
         if filters.search:
-            search_like = f'%{filters.search}%'
-            conditions.append(
-                or_(
-                    InventoryItem.serial_number.ilike(search_like),
-                    InventoryItem.asset_tag.ilike(search_like),
-                    InventoryItem.product.has(Product.name.ilike(search_like)),
-                    InventoryItem.product.has(Product.sku.ilike(search_like)),
-                )
-            )
+            conditions.append(InventoryItem.id.in_(_matching_item_ids(f'%{filters.search}%')))
 
         if filters.status_filter:
             conditions.append(InventoryItem.status == filters.status_filter)
@@ -170,40 +510,112 @@ class SqlAlchemyInventoryRepository:
         if filters.container_id:
             conditions.append(InventoryItem.container_id == filters.container_id)
 
-        stmt = (
-            select(InventoryItem)
-            .options(
-                selectinload(InventoryItem.product).selectinload(Product.category),
-                selectinload(InventoryItem.container),
-                selectinload(InventoryItem.rfid_tag),
-            )
-            .order_by(InventoryItem.created_at.desc())
+        return conditions
+
+    def _list_select(self, conditions: list):
+        stmt = select(InventoryItem).options(
+            selectinload(InventoryItem.product).selectinload(Product.category),
+            selectinload(InventoryItem.container),
+            selectinload(InventoryItem.rfid_tag),
         )
         if conditions:
             stmt = stmt.where(and_(*conditions))
+        return stmt
 
-        items = self._db.scalars(stmt).all()
-        item_ids = [item.id for item in items]
-
-        movement_counts: dict[str, int] = {}
-        contents_counts: dict[str, int] = {}
+    def list_items(self, filters: InventoryListFilters) -> list[InventoryItemView]:
+        """Lista completa (sin paginar), para clientes que no envían `limit` ni `cursor`."""
+        created = InventoryItem.created_at.asc() if filters.sort == 'createdAt' else InventoryItem.created_at.desc()
+        stmt = self._list_select(self._item_conditions(filters)).order_by(created)
+        return [self._item_payload(item) for item in self._db.scalars(stmt).all()]
+
+    def list_items_page(self, filters: InventoryListFilters) -> InventoryItemsPageView:
+        conditions = self._item_conditions(filters)
+        limit = filters.limit
+        ascending = filters.sort == 'createdAt'
+        direction = 'next'
+        stmt = self._list_select(conditions)
+        key = tuple_(InventoryItem.created_at, InventoryItem.id)
+        if filters.cursor:
+            # Keyset sobre `(createdAt, id)`: el costo de una página no depende de su profundidad.
+            try:
+                cursor_time, cursor_id, direction = decode_cursor(filters.cursor)
+            except ValueError:
+                raise InvalidInventoryFiltersError('Cursor de inventario invalido') from None
+            # `prev` recorre en el orden inverso al del listado y luego se da vuelta.
+            forward = ascending == (direction == 'next')
+            stmt = stmt.where(key > tuple_(cursor_time, cursor_id) if forward else key < tuple_(cursor_time, cursor_id))
+        else:
+            forward = ascending
+        if forward:
+            stmt = stmt.order_by(InventoryItem.created_at.asc(), InventoryItem.id.asc())
+        else:
+            stmt = stmt.order_by(InventoryItem.created_at.desc(), InventoryItem.id.desc())
+
+        rows = self._db.scalars(stmt.limit(limit + 1)).all()
+        has_more = len(rows) > limit
+        items = list(rows[:limit])
+        if direction == 'prev':
+            items.reverse()
+        has_previous = has_more if direction == 'prev' else bool(filters.cursor)
+        has_next = has_more if direction == 'next' else True
+
+        total = None
+        if filters.include_total:
+            total = self._db.scalar(select(func.count()).select_from(InventoryItem).where(*conditions)) or 0
 
-        if item_ids:
-            movement_rows = self._db.execute(
-                select(InventoryMovement.inventory_item_id, func.count(InventoryMovement.id))
-                .where(InventoryMovement.inventory_item_id.in_(item_ids))
-                .group_by(InventoryMovement.inventory_item_id)
-            ).all()
-            movement_counts = {item_id: count for item_id, count in movement_rows}
+        return {
+            'items': [self._item_payload(item) for item in items],
+            'total': total,
+            'nextCursor': encode_cursor(items[-1].created_at, items[-1].id, 'next') if items and has_next else None,
+            'prevCursor': encode_cursor(items[0].created_at, items[0].id, 'prev') if items and has_previous else None,
+        }
 
-            contents_rows = self._db.execute(
-                select(InventoryItem.container_id, func.count(InventoryItem.id))
-                .where(InventoryItem.container_id.in_(item_ids))
-                .group_by(InventoryItem.container_id)
-            ).all()
-            contents_counts = {item_id: count for item_id, count in contents_rows if item_id}
+    def search_items(self, query: str, limit: int) -> list[InventorySearchHitView]:
+        """Items que contienen `query` en alguno de sus textos, del más al menos relevante.
+
+        Por campo: coincidencia exacta 3, prefijo 2, subcadena 1. Con `pg_trgm` se
+        suma la mayor similitud trigram (0-1) para ordenar dentro de cada nivel.
+        """
+        fields = {
+            'serialNumber': InventoryItem.serial_number,
+            'assetTag': InventoryItem.asset_tag,
+            'sku': Product.sku,
+            'productName': Product.name,
+            'brand': Product.brand,
+            'model': Product.model,
+            'epc': RfidTag.epc,
+            'tid': RfidTag.tid,
+        }
+        tiers = {
+            name: case(
+                (func.lower(column) == query.lower(), 3),
+                (column.ilike(f'{query}%'), 2),
+                (column.ilike(f'%{query}%'), 1),
+                else_=0,
+            ).label(name)
+            for name, column in fields.items()
+        }
+        rank = func.greatest(*tiers.values())
+        if trigram_available(self._db):
+            rank = rank + func.coalesce(func.greatest(*(func.similarity(column, query) for column in fields.values())), 0)
+
+        rows = self._db.execute(
+            self._list_select([InventoryItem.id.in_(_matching_item_ids(f'%{query}%'))])
+            .add_columns(rank.label('rank'), *tiers.values())
+            .join(Product, Product.id == InventoryItem.product_id)
+            .outerjoin(RfidTag, RfidTag.inventory_item_id == InventoryItem.id)
+            .order_by(rank.desc(), InventoryItem.created_at.desc(), InventoryItem.id.desc())
+            .limit(limit)
+        ).all()
 
-        return [self._item_payload(item, movement_counts.get(item.id, 0), contents_counts.get(item.id, 0)) for item in items]
+        return [
+            {
+                'item': self._item_payload(row[0]),
+                'rank': float(row.rank),
+                'matchedOn': max(fields, key=lambda name: getattr(row, name)),
+            }
+            for row in rows
+        ]
 
     def create_item(self, payload: InventoryItemInput, user_id: str) -> InventoryItemView:
         product = self._db.get(Product, payload.product_id)
@@ -224,6 +636,7 @@ class SqlAlchemyInventoryRepository:
             purchase_price=payload.purchase_price,
             warranty_expiry=self._parse_date(payload.warranty_expiry),
             notes=payload.notes,
+            movement_count=1,
         )
         self._db.add(item)
 
@@ -247,6 +660,8 @@ class SqlAlchemyInventoryRepository:
             if 'assettag' in msg:
                 raise DuplicateAssetTagError('Ya existe un item con esa etiqueta de activo') from None
             raise InventoryPersistenceError('No se pudo crear el item de inventario') from None
+        self._adjust_contents(item.container_id, 1)
+        self._apply_summary(item_deltas(item.status, item.type, product.category_id))
 
         item = self._db.scalar(
             select(InventoryItem)
@@ -257,28 +672,226 @@ class SqlAlchemyInventoryRepository:
                 selectinload(InventoryItem.rfid_tag),
             )
         )
-        return self._item_payload(item, movement_count=1, contents_count=0)
+        return self._item_payload(item)
+
+    def import_items(self, rows: Iterable[InventoryImportRow], user_id: str, batch_size: int) -> InventoryImportWriteResult:
+        """Inserta los items (y su movimiento `ENROLLMENT`) por lotes de `batch_size` filas.
+
+        Por lote, productos, contenedores y duplicados se resuelven con una consulta
+        cada uno y las filas válidas se insertan con un `INSERT ... SELECT FROM unnest`
+        por tabla; los seriales y etiquetas del propio archivo se comparan en memoria.
+        """
+        state = _ImportState()
+        errors: list[InventoryImportErrorView] = []
+        created = 0
+        iterator = iter(rows)
+        while batch := list(islice(iterator, batch_size)):
+            created += self._import_batch(batch, user_id, state, errors)
+        return {'created': created, 'errors': errors}
+
+    def _resolve_import_batch(self, batch: list[InventoryImportRow], state: _ImportState) -> tuple[set[str], set[str]]:
+        """Completa `state` con los productos y contenedores del lote; devuelve seriales y etiquetas ya existentes."""
+        product_ids = {row.item.product_id for row in batch if row.item.product_id} - state.products_by_id.keys()
+        skus = {row.product_sku for row in batch if not row.item.product_id and row.product_sku} - state.products_by_sku.keys()
+        if product_ids or skus:
+            rows = self._db.execute(
+                select(Product.id, Product.sku, Product.category_id, Product.deleted_at).where(
+                    or_(Product.id.in_(product_ids), Product.sku.in_(skus))
+                )
+            )
+            for product_id, sku, category_id, deleted_at in rows:
+                entry = (product_id, category_id) if deleted_at is None else None
+                state.products_by_id[product_id] = entry
+                state.products_by_sku[sku] = entry
+            for product_id in product_ids:
+                state.products_by_id.setdefault(product_id, None)
+            for sku in skus:
+                state.products_by_sku.setdefault(sku, None)
+
+        container_ids = {row.item.container_id for row in batch if row.item.container_id} - state.containers.keys()
+        if container_ids:
+            found = set(self._db.scalars(select(InventoryItem.id).where(InventoryItem.id.in_(container_ids))))
+            state.containers.update({container_id: container_id in found for container_id in container_ids})
+
+        serials = {row.item.serial_number for row in batch if row.item.serial_number}
+        asset_tags = {row.item.asset_tag for row in batch if row.item.asset_tag}
+        existing_serials = (
+            set(self._db.scalars(select(InventoryItem.serial_number).where(InventoryItem.serial_number.in_(serials))))
+            if serials
+            else set()
+        )
+        existing_asset_tags = (
+            set(self._db.scalars(select(InventoryItem.asset_tag).where(InventoryItem.asset_tag.in_(asset_tags))))
+            if asset_tags
+            else set()
+        )
+        return existing_serials, existing_asset_tags
+
+    def _import_batch(
+        self,
+        batch: list[InventoryImportRow],
+        user_id: str,
+        state: _ImportState,
+        errors: list[InventoryImportErrorView],
+    ) -> int:
+        existing_serials, existing_asset_tags = self._resolve_import_batch(batch, state)
+
+        item_rows: list[tuple] = []
+        contents: Counter = Counter()
+        deltas: Counter = Counter()
+        for row in batch:
+            item = row.item
+            product = state.products_by_id.get(item.product_id) if item.product_id else state.products_by_sku.get(row.product_sku)
+            if product is None:
+                errors.append({'line': row.line, 'message': 'Producto no encontrado o inactivo'})
+                continue
+            if item.container_id and not state.containers.get(item.container_id):
+                errors.append({'line': row.line, 'message': 'Contenedor no encontrado'})
+                continue
+            # Lo repetido en el archivo se revisa antes que la base: un lote anterior ya lo insertó.
+            if item.serial_number in state.serials:
+                errors.append({'line': row.line, 'message': f'Numero de serie repetido (linea {state.serials[item.serial_number]})'})
+                continue
+            if item.serial_number in existing_serials:
+                errors.append({'line': row.line, 'message': 'Ya existe un item con ese numero de serie'})
+                continue
+            if item.asset_tag in state.asset_tags:
+                errors.append({'line': row.line, 'message': f'Etiqueta de activo repetida (linea {state.asset_tags[item.asset_tag]})'})
+                continue
+            if item.asset_tag in existing_asset_tags:
+                errors.append({'line': row.line, 'message': 'Ya existe un item con esa etiqueta de activo'})
+                continue
+            try:
+                purchase_date = self._parse_date(item.purchase_date)
+                warranty_expiry = self._parse_date(item.warranty_expiry)
+            except InvalidDateFormatError as exc:
+                errors.append({'line': row.line, 'message': str(exc)})
+                continue
+
+            if item.serial_number:
+                state.serials[item.serial_number] = row.line
+            if item.asset_tag:
+                state.asset_tags[item.asset_tag] = row.line
+            product_id, category_id = product
+            item_rows.append(
+                (
+                    str(uuid4()),
+                    str(uuid4()),
+                    product_id,
+                    item.serial_number,
+                    item.asset_tag,
+                    item.item_type,
+                    item.status,
+                    item.condition,
+                    item.location,
+                    item.container_id,
+                    purchase_date,
+                    item.purchase_price,
+                    warranty_expiry,
+                    item.notes,
+                )
+            )
+            if item.container_id:
+                contents[item.container_id] += 1
+            deltas.update(item_deltas(item.status, item.item_type, category_id))
+
+        if not item_rows:
+            return 0
+        rows = unnest_rows('imported_items', _IMPORT_COLUMNS, item_rows)
+        self._db.execute(
+            insert(InventoryItem).from_select(
+                [
+                    InventoryItem.id,
+                    InventoryItem.product_id,
+                    InventoryItem.serial_number,
+                    InventoryItem.asset_tag,
+                    InventoryItem.type,
+                    InventoryItem.status,
+                    InventoryItem.condition,
+                    InventoryItem.location,
+                    InventoryItem.container_id,
+                    InventoryItem.purchase_date,
+                    InventoryItem.purchase_price,
+                    InventoryItem.warranty_expiry,
+                    InventoryItem.notes,
+                    InventoryItem.movement_count,
+                ],
+                select(
+                    rows.c.id,
+                    rows.c.product_id,
+                    rows.c.serial_number,
+                    rows.c.asset_tag,
+                    rows.c.type,
+                    rows.c.status,
+                    rows.c.condition,
+                    rows.c.location,
+                    rows.c.container_id,
+                    rows.c.purchase_date,
+                    rows.c.purchase_price,
+                    rows.c.warranty_expiry,
+                    rows.c.notes,
+                    literal(1),
+                ),
+            )
+        )
+        self._db.execute(
+            insert(InventoryMovement).from_select(
+                [
+                    InventoryMovement.id,
+                    InventoryMovement.inventory_item_id,
+                    InventoryMovement.type,
+                    InventoryMovement.to_status,
+                    InventoryMovement.to_location,
+                    InventoryMovement.reason,
+                    InventoryMovement.performed_by,
+                ],
+                select(
+                    rows.c.movement_id,
+                    rows.c.id,
+                    literal('ENROLLMENT'),
+                    rows.c.status,
+                    rows.c.location,
+                    literal('Importacion masiva'),
+                    literal(user_id),
+                ),
+            )
+        )
+        if contents:
+            added = unnest_rows('imported_contents', {'container_id': String, 'added': Integer}, sorted(contents.items()))
+            self._db.execute(
+                update(InventoryItem)
+                .where(InventoryItem.id == added.c.container_id)
+                .values(contents_count=InventoryItem.contents_count + added.c.added)
+                .execution_options(synchronize_session=False)
+            )
+        self._apply_summary(deltas)
+        return len(item_rows)
 
     def summary(self) -> InventorySummaryView:
-        by_status_rows = self._db.execute(select(InventoryItem.status, func.count(InventoryItem.id)).group_by(InventoryItem.status)).all()
-        by_type_rows = self._db.execute(select(InventoryItem.type, func.count(InventoryItem.id)).group_by(InventoryItem.type)).all()
+        """Conteos desde los contadores del resumen y sus deltas pendientes (sin agrupar `inventory_items`)."""
+        if self._summary_cache:
+            cached = self._summary_cache.get()
+            if cached is not None:
+                return cached
+
+        counts = summary_counts()
+        counter_rows = self._db.execute(
+            select(counts.c.dimension, counts.c.key, counts.c.count).where(counts.c.dimension.in_((STATUS, TYPE)))
+        ).all()
 
         status_counts = {'IN': 0, 'OUT': 0, 'MAINTENANCE': 0, 'LOST': 0}
-        for status_name, count in by_status_rows:
-            if status_name in status_counts:
-                status_counts[status_name] = count
-
         type_counts = {'UNIT': 0, 'CONTAINER': 0}
-        for type_name, count in by_type_rows:
-            if type_name in type_counts:
-                type_counts[type_name] = count
+        for dimension, key, count in counter_rows:
+            bucket = status_counts if dimension == STATUS else type_counts
+            if key in bucket:
+                bucket[key] = count
 
         total = sum(status_counts.values())
 
         recent_movements = self._db.scalars(
             select(InventoryMovement)
             .options(selectinload(InventoryMovement.inventory_item).selectinload(InventoryItem.product))
-            .order_by(InventoryMovement.created_at.desc())
+            .order_by(InventoryMovement.created_at.desc(), InventoryMovement.id.desc())
             .limit(10)
         ).all()
 
@@ -306,38 +919,145 @@ class SqlAlchemyInventoryRepository:
         ]
 
         category_rows = self._db.execute(
-            select(Category.id, Category.name, Category.color, func.count(InventoryItem.id))
-            .join(Product, Product.category_id == Category.id)
-            .join(InventoryItem, InventoryItem.product_id == Product.id)
-            .group_by(Category.id, Category.name, Category.color)
+            select(Category.name, Category.color, counts.c.count)
+            .select_from(counts)
+            .join(Category, Category.id == counts.c.key)
+            .where(counts.c.dimension == CATEGORY, counts.c.count > 0)
+            .order_by(Category.name)
         ).all()
 
-        return {
+        result: InventorySummaryView = {
             'total': total,
             'byStatus': status_counts,
             'byType': type_counts,
-            'byCategory': [{'name': name, 'color': color, 'count': count} for _, name, color, count in category_rows],
+            'byCategory': [{'name': name, 'color': color, 'count': count} for name, color, count in category_rows],
             'recentMovements': recent_movements_payload,
         }
+        if self._summary_cache:
+            self._summary_cache.put(result)
+        return result
+
+    def summary_as_of(self, as_of: datetime) -> InventoryAsOfSummaryView:
+        """Conteos del inventario en `as_of`: foto más cercana más los movimientos posteriores."""
+        snapshot = nearest_snapshot(self._db, as_of)
+        state = state_at(as_of, snapshot)
+        rows = self._db.execute(
+            select(state.c.status, InventoryItem.type, Category.name, Category.color, func.count())
+            .select_from(state)
+            .join(InventoryItem, InventoryItem.id == state.c.item_id)
+            .outerjoin(Product, Product.id == InventoryItem.product_id)
+            .outerjoin(Category, Category.id == Product.category_id)
+            .group_by(state.c.status, InventoryItem.type, Category.id, Category.name, Category.color)
+        ).all()
 
-    def list_movements(self, filters: MovementListFilters) -> InventoryMovementsPageView:
+        status_counts = {'IN': 0, 'OUT': 0, 'MAINTENANCE': 0, 'LOST': 0}
+        type_counts = {'UNIT': 0, 'CONTAINER': 0}
+        categories: dict[str, dict] = {}
+        for status, item_type, category_name, color, count in rows:
+            status_counts[status] = status_counts.get(status, 0) + count
+            type_counts[item_type] = type_counts.get(item_type, 0) + count
+            if category_name is not None:
+                category = categories.setdefault(category_name, {'name': category_name, 'color': color, 'count': 0})
+                category['count'] += count
+
+        return {
+            'asOf': as_of,
+            'snapshotAt': snapshot.taken_at if snapshot else None,
+            'total': sum(status_counts.values()),
+            'byStatus': status_counts,
+            'byType': type_counts,
+            'byCategory': [categories[name] for name in sorted(categories)],
+        }
+
+    def get_item_state(self, item_id: str, as_of: datetime) -> InventoryItemStateView:
+        """Estado del item en `as_of`: su último movimiento hasta esa fecha.
+
+        Para un solo item no hace falta la foto: el índice `(inventoryItemId, createdAt
+        DESC)` llega directo a ese movimiento en cada partición.
+        """
+        if self._db.get(InventoryItem, item_id) is None:
+            raise InventoryItemNotFoundError('Item de inventario no encontrado')
+        last = self._db.execute(
+            select(
+                InventoryMovement.to_status,
+                InventoryMovement.to_location,
+                InventoryMovement.created_at,
+                InventoryMovement.type,
+            )
+            .where(InventoryMovement.inventory_item_id == item_id, InventoryMovement.created_at <= as_of)
+            .order_by(InventoryMovement.created_at.desc(), InventoryMovement.id.desc())
+            .limit(1)
+        ).first()
+        return {
+            'id': item_id,
+            'asOf': as_of,
+            'status': last.to_status if last else None,
+            'location': last.to_location if last else None,
+            'changedAt': last.created_at if last else None,
+            'movementType': last.type if last else None,
+        }
+
+    def take_snapshot(self, cutoff: datetime, min_interval: timedelta, retention: timedelta | None) -> InventorySnapshotView | None:
+        taken = save_snapshot(self._db, cutoff, min_interval)
+        if retention is not None:
+            apply_snapshot_retention(self._db, cutoff - retention)
+        if taken is None:
+            return None
+        snapshot_id, taken_at, item_count = taken
+        return {'id': snapshot_id, 'takenAt': taken_at, 'itemCount': item_count}
+
+    @staticmethod
+    def _movement_conditions(filters: MovementListFilters | MovementExportFilters) -> list:
         conditions = []
         if filters.type_filter:
             conditions.append(InventoryMovement.type == filters.type_filter)
         if filters.inventory_item_id:
             conditions.append(InventoryMovement.inventory_item_id == filters.inventory_item_id)
+        # Un rango sobre la columna de partición permite descartar particiones enteras.
+        if filters.since:
+            conditions.append(InventoryMovement.created_at >= filters.since)
+        if filters.until:
+            conditions.append(InventoryMovement.created_at < filters.until)
+        return conditions
 
-        stmt = select(InventoryMovement).options(selectinload(InventoryMovement.inventory_item).selectinload(InventoryItem.product))
-        count_stmt = select(func.count(InventoryMovement.id))
-
-        if conditions:
-            stmt = stmt.where(and_(*conditions))
-            count_stmt = count_stmt.where(and_(*conditions))
-
-        stmt = stmt.order_by(InventoryMovement.created_at.desc()).limit(filters.limit).offset(filters.offset)
-
-        movements = self._db.scalars(stmt).all()
-        total = self._db.scalar(count_stmt) or 0
+    def list_movements(self, filters: MovementListFilters) -> InventoryMovementsPageView:
+        """Movimientos del más reciente al más antiguo, paginados por `(createdAt, id)`."""
+        conditions = self._movement_conditions(filters)
+        stmt = (
+            select(InventoryMovement)
+            .where(*conditions)
+            .options(selectinload(InventoryMovement.inventory_item).selectinload(InventoryItem.product))
+        )
+        direction = 'next'
+        key = tuple_(InventoryMovement.created_at, InventoryMovement.id)
+        if filters.cursor:
+            try:
+                cursor_time, cursor_id, direction = decode_cursor(filters.cursor)
+            except ValueError:
+                raise InvalidInventoryFiltersError('Cursor de movimientos invalido') from None
+            # La cota simple sobre `createdAt` se repite para que también descarte particiones.
+            if direction == 'next':
+                stmt = stmt.where(InventoryMovement.created_at <= cursor_time, key < tuple_(cursor_time, cursor_id))
+            else:
+                stmt = stmt.where(InventoryMovement.created_at >= cursor_time, key > tuple_(cursor_time, cursor_id))
+        if direction == 'next':
+            stmt = stmt.order_by(InventoryMovement.created_at.desc(), InventoryMovement.id.desc())
+        else:
+            stmt = stmt.order_by(InventoryMovement.created_at.asc(), InventoryMovement.id.asc())
+        if filters.offset and not filters.cursor:
+            stmt = stmt.offset(filters.offset)
+
+        rows = self._db.scalars(stmt.limit(filters.limit + 1)).all()
+        has_more = len(rows) > filters.limit
+        movements = list(rows[: filters.limit])
+        if direction == 'prev':
+            movements.reverse()
+        has_previous = has_more if direction == 'prev' else bool(filters.cursor or filters.offset)
+        has_next = has_more if direction == 'next' else True
+
+        total = None
+        if filters.include_total:
+            total = self._db.scalar(select(func.count()).select_from(InventoryMovement).where(*conditions)) or 0
 
         user_ids = {movement.performed_by for movement in movements}
         user_rows = self._db.execute(select(User.id, User.name, User.email).where(User.id.in_(user_ids))).all() if user_ids else []
@@ -366,6 +1086,107 @@ class SqlAlchemyInventoryRepository:
             'total': total,
             'limit': filters.limit,
             'offset': filters.offset,
+            'nextCursor': encode_cursor(movements[-1].created_at, movements[-1].id, 'next') if movements and has_next else None,
+            'prevCursor': encode_cursor(movements[0].created_at, movements[0].id, 'prev') if movements and has_previous else None,
+        }
+
+    def _stream_rows(self, stmt, batch_size: int) -> Iterator[tuple]:
+        # `yield_per` abre un cursor del lado del servidor: solo un lote vive en memoria.
+        for row in self._db.execute(stmt.execution_options(yield_per=batch_size)):
+            yield tuple(row)
+
+    def export_items(self, filters: InventoryListFilters, batch_size: int) -> InventoryExportView:
+        """Items que cumplen los filtros como tuplas, con las columnas que acepta la importación."""
+        created_at = InventoryItem.created_at.desc() if filters.sort == '-createdAt' else InventoryItem.created_at
+        item_id = InventoryItem.id.desc() if filters.sort == '-createdAt' else InventoryItem.id
+        stmt = (
+            select(
+                InventoryItem.id,
+                Product.sku,
+                Product.name,
+                Category.name,
+                InventoryItem.serial_number,
+                InventoryItem.asset_tag,
+                InventoryItem.type,
+                InventoryItem.status,
+                InventoryItem.condition,
+                InventoryItem.location,
+                InventoryItem.container_id,
+                InventoryItem.purchase_date,
+                InventoryItem.purchase_price,
+                InventoryItem.warranty_expiry,
+                InventoryItem.notes,
+                InventoryItem.created_at,
+            )
+            .outerjoin(Product, Product.id == InventoryItem.product_id)
+            .outerjoin(Category, Category.id == Product.category_id)
+            .where(*self._item_conditions(filters))
+            .order_by(created_at, item_id)
+        )
+        return {
+            'columns': [
+                'id',
+                'productSku',
+                'productName',
+                'category',
+                'serialNumber',
+                'assetTag',
+                'type',
+                'status',
+                'condition',
+                'location',
+                'containerId',
+                'purchaseDate',
+                'purchasePrice',
+                'warrantyExpiry',
+                'notes',
+                'createdAt',
+            ],
+            'rows': self._stream_rows(stmt, batch_size),
+        }
+
+    def export_movements(self, filters: MovementExportFilters, batch_size: int) -> InventoryExportView:
+        stmt = (
+            select(
+                InventoryMovement.id,
+                InventoryMovement.created_at,
+                InventoryMovement.type,
+                InventoryMovement.inventory_item_id,
+                InventoryItem.serial_number,
+                InventoryItem.asset_tag,
+                Product.sku,
+                InventoryMovement.from_status,
+                InventoryMovement.to_status,
+                InventoryMovement.from_location,
+                InventoryMovement.to_location,
+                InventoryMovement.reason,
+                InventoryMovement.reference,
+                User.email,
+            )
+            .outerjoin(InventoryItem, InventoryItem.id == InventoryMovement.inventory_item_id)
+            .outerjoin(Product, Product.id == InventoryItem.product_id)
+            .outerjoin(User, User.id == InventoryMovement.performed_by)
+            .where(*self._movement_conditions(filters))
+            .order_by(InventoryMovement.created_at.desc(), InventoryMovement.id.desc())
+        )
+        return {
+            'columns': [
+                'id',
+                'createdAt',
+                'type',
+                'inventoryItemId',
+                'serialNumber',
+                'assetTag',
+                'productSku',
+                'fromStatus',
+                'toStatus',
+                'fromLocation',
+                'toLocation',
+                'reason',
+                'reference',
+                'performedBy',
+            ],
+            'rows': self._stream_rows(stmt, batch_size),
         }
 
     def get_item(self, item_id: str) -> InventoryItemView:
@@ -384,20 +1205,65 @@ class SqlAlchemyInventoryRepository:
             raise InventoryItemNotFoundError('Item de inventario no encontrado')
 
         movements = self._db.scalars(
-            select(InventoryMovement).where(InventoryMovement.inventory_item_id == item_id).order_by(InventoryMovement.created_at.desc()).limit(20)
+            select(InventoryMovement)
+            .where(InventoryMovement.inventory_item_id == item_id)
+            .order_by(InventoryMovement.created_at.desc(), InventoryMovement.id.desc())
+            .limit(20)
         ).all()
 
         user_ids = {movement.performed_by for movement in movements}
         user_rows = self._db.execute(select(User.id, User.name, User.email).where(User.id.in_(user_ids))).all() if user_ids else []
         user_map = {user_id: {'id': user_id, 'name': name, 'email': email} for user_id, name, email in user_rows}
 
-        movement_count = self._db.scalar(select(func.count(InventoryMovement.id)).where(InventoryMovement.inventory_item_id == item_id)) or 0
-        contents_count = self._db.scalar(select(func.count(InventoryItem.id)).where(InventoryItem.container_id == item_id)) or 0
-
-        payload = self._item_payload(item, int(movement_count), int(contents_count), include_details=True)
+        payload = self._item_payload(item, include_details=True)
         payload['movements'] = [self._movement_payload(movement, user_map) for movement in movements]
         return payload
 
+    def get_item_tree(self, item_id: str) -> InventoryTreeNodeView:
+        """El item y todo lo que contiene, anidado, resuelto con una sola consulta."""
+        tree = _container_tree(item_id)
+        rows = self._db.execute(
+            select(
+                tree.c.parent_id,
+                tree.c.depth,
+                InventoryItem.id,
+                InventoryItem.serial_number,
+                InventoryItem.asset_tag,
+                InventoryItem.type,
+                InventoryItem.status,
+                InventoryItem.location,
+                InventoryItem.container_id,
+                Product.id.label('product_id'),
+                Product.sku,
+                Product.name,
+            )
+            .join(InventoryItem, InventoryItem.id == tree.c.id)
+            .outerjoin(Product, Product.id == InventoryItem.product_id)
+            .order_by(tree.c.depth, InventoryItem.created_at, InventoryItem.id)
+        ).all()
+        if not rows:
+            raise InventoryItemNotFoundError('Item de inventario no encontrado')
+
+        # Los padres llegan antes que sus hijos (orden por profundidad).
+        nodes: dict[str, InventoryTreeNodeView] = {}
+        for row in rows:
+            node: InventoryTreeNodeView = {
+                'id': row.id,
+                'serialNumber': row.serial_number,
+                'assetTag': row.asset_tag,
+                'type': row.type,
+                'status': row.status,
+                'location': row.location,
+                'containerId': row.container_id,
+                'depth': row.depth,
+                'product': {'id': row.product_id, 'sku': row.sku, 'name': row.name} if row.product_id else None,
+                'contents': [],
+            }
+            nodes[row.id] = node
+            if row.parent_id is not None:
+                nodes[row.parent_id]['contents'].append(node)
+        return nodes[item_id]
+
     def update_item(self, item_id: str, payload: InventoryItemInput, user_id: str) -> InventoryItemView:
         item = self._db.get(InventoryItem, item_id)
         if not item:
@@ -405,6 +1271,13 @@ class SqlAlchemyInventoryRepository:
 
         previous_status = item.status
         previous_location = item.location
+        previous_container_id = item.container_id
+        if payload.container_id and payload.container_id != previous_container_id:
+            # El nuevo contenedor no puede ser el item ni algo que este contiene.
+            tree = _container_tree(item_id)
+            if self._db.scalar(select(tree.c.id).where(tree.c.id == payload.container_id)) is not None:
+                raise ContainerCycleError('Un contenedor no puede quedar dentro de si mismo ni de su contenido')
+        previous_deltas = item_deltas(item.status, item.type, self._category_of(item.product_id), sign=-1)
 
         item.product_id = payload.product_id
         item.serial_number = payload.serial_number
@@ -433,6 +1306,7 @@ class SqlAlchemyInventoryRepository:
                     performed_by=user_id,
                 )
             )
+            item.movement_count = InventoryItem.movement_count + 1
 
         try:
             self._db.flush()
@@ -443,6 +1317,13 @@ class SqlAlchemyInventoryRepository:
             if 'assettag' in msg:
                 raise DuplicateAssetTagError('Ya existe un item con esa etiqueta de activo') from None
             raise InventoryPersistenceError('No se pudo actualizar el item de inventario') from None
+        if previous_container_id != item.container_id:
+            self._adjust_contents(previous_container_id, -1)
+            self._adjust_contents(item.container_id, 1)
+        # Lo que no cambia se anula al sumar (p. ej. mismo estado: -1 y +1).
+        previous_deltas.update(item_deltas(item.status, item.type, self._category_of(item.product_id)))
+        self._apply_summary(previous_deltas)
+        self._invalidate_rfid(item.id)
 
         item = self._db.scalar(
             select(InventoryItem)
@@ -453,9 +1334,7 @@ class SqlAlchemyInventoryRepository:
                 selectinload(InventoryItem.rfid_tag),
             )
         )
-        movement_count = self._db.scalar(select(func.count(InventoryMovement.id)).where(InventoryMovement.inventory_item_id == item.id)) or 0
-        contents_count = self._db.scalar(select(func.count(InventoryItem.id)).where(InventoryItem.container_id == item.id)) or 0
-        return self._item_payload(item, int(movement_count), int(contents_count))
+        return self._item_payload(item)
 
     def delete_item(self, item_id: str) -> InventoryMutationResult:
         item = self._db.get(InventoryItem, item_id)
@@ -467,8 +1346,11 @@ class SqlAlchemyInventoryRepository:
             tag.inventory_item_id = None
             tag.status = 'UNASSIGNED'
 
+        self._adjust_contents(item.container_id, -1)
+        self._apply_summary(item_deltas(item.status, item.type, self._category_of(item.product_id), sign=-1))
         self._db.delete(item)
         self._db.flush()
+        self._invalidate_rfid(item_id)
         return {'success': True}
 
     def check_in(self, item_id: str, payload: CheckInOutInput, user_id: str) -> InventoryCheckInOutResult:
@@ -495,8 +1377,11 @@ class SqlAlchemyInventoryRepository:
                 performed_by=user_id,
             )
         )
+        item.movement_count = InventoryItem.movement_count + 1
 
         self._db.flush()
+        self._apply_summary(status_deltas(previous_status, item.status))
+        self._invalidate_rfid(item.id)
 
         return {
             'id': item.id,
@@ -529,8 +1414,11 @@ class SqlAlchemyInventoryRepository:
                 performed_by=user_id,
             )
         )
+        item.movement_count = InventoryItem.movement_count + 1
 
         self._db.flush()
+        self._apply_summary(status_deltas(previous_status, item.status))
+        self._invalidate_rfid(item.id)
 
         return {
             'id': item.id,
@@ -0,0 +1,201 @@
+"""Contadores del resumen de inventario y su caché en proceso.
+
+`inventory_summary_counters` guarda cuántos items hay por estado, tipo y categoría,
+así que `GET /inventory/summary` lee unas pocas filas en lugar de agrupar toda la
+tabla. Cada camino que crea, borra o cambia el estado, el tipo o el producto de un
+item registra sus deltas con `apply_summary_deltas`:
+
+- Los deltas se suman en la sesión y, al confirmar, se insertan de una vez en
+  `inventory_summary_deltas` (solo inserciones). Ninguna transacción de escritura
+  (API, importación o ingesta RFID) bloquea ni espera las filas compartidas de los
+  contadores, y un rollback los descarta junto con el resto de la transacción.
+- `fold_summary_deltas` (tarea periódica) mueve esos deltas a los contadores; el
+  resumen suma contadores y deltas pendientes, así que siempre es exacto.
+- `reconcile_summary_counters` recalcula los conteos desde `inventory_items` con las
+  dos tablas bloqueadas contra escrituras, por si algo escribió por fuera de la aplicación.
+- `SummaryCache` guarda la respuesta armada durante unos segundos: los cambios que
+  no pasan por este proceso (p. ej. otro worker) se ven al vencer el TTL.
+"""
+
+import time
+from collections import Counter
+from threading import Lock
+
+from sqlalchemy import BigInteger, cast, delete, event, func, insert, select, text, tuple_, union_all
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.models.catalog_inventory import InventoryItem, InventorySummaryCounter, InventorySummaryDelta, Product
+
+STATUS = 'status'
+TYPE = 'type'
+CATEGORY = 'category'
+_PENDING_DELTAS = 'inventory_summary_deltas'
+
+
+def item_deltas(status: str, item_type: str, category_id: str | None, sign: int = 1) -> Counter:
+    """Deltas de un item que entra (`sign=1`) o sale (`sign=-1`) del inventario."""
+    deltas: Counter = Counter({(STATUS, status): sign, (TYPE, item_type): sign})
+    if category_id:
+        deltas[(CATEGORY, category_id)] += sign
+    return deltas
+
+
+def status_deltas(previous: str | None, current: str) -> Counter:
+    """Deltas de un cambio de estado (vacío si el estado no cambia)."""
+    deltas: Counter = Counter()
+    if previous != current:
+        if previous is not None:
+            deltas[(STATUS, previous)] -= 1
+        deltas[(STATUS, current)] += 1
+    return deltas
+
+
+def apply_summary_deltas(db: Session, deltas: Counter) -> None:
+    """Suma los deltas a la transacción de `db`; se escriben una sola vez al confirmar."""
+    db.info.setdefault(_PENDING_DELTAS, Counter()).update(deltas)
+
+
+@event.listens_for(Session, 'before_commit')
+def _write_pending_deltas(session: Session) -> None:
+    pending = session.info.pop(_PENDING_DELTAS, None)
+    rows = [
+        {'dimension': dimension, 'key': key, 'count': delta}
+        for (dimension, key), delta in (pending or {}).items()
+        if delta
+    ]
+    if rows:
+        session.execute(insert(InventorySummaryDelta).values(rows))
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _drop_pending_deltas(session: Session, transaction) -> None:
+    # Rollback o cierre sin commit: los deltas se van con la transacción.
+    if transaction.parent is None:
+        session.info.pop(_PENDING_DELTAS, None)
+
+
+def summary_counts():
+    """Subconsulta `(dimension, key, count)`: contadores más deltas pendientes."""
+    rows = union_all(
+        select(InventorySummaryCounter.dimension, InventorySummaryCounter.key, InventorySummaryCounter.count),
+        select(InventorySummaryDelta.dimension, InventorySummaryDelta.key, InventorySummaryDelta.count),
+    ).subquery('summary_rows')
+    return (
+        select(rows.c.dimension, rows.c.key, cast(func.sum(rows.c.count), BigInteger).label('count'))
+        .group_by(rows.c.dimension, rows.c.key)
+        .subquery('summary_counts')
+    )
+
+
+def _lock_counters(db: Session) -> None:
+    db.execute(text('SELECT pg_advisory_xact_lock(hashtext(:key))'), {'key': 'inventory_summary_counters'})
+
+
+def _fold(db: Session) -> int:
+    folded = db.execute(
+        delete(InventorySummaryDelta).returning(
+            InventorySummaryDelta.dimension, InventorySummaryDelta.key, InventorySummaryDelta.count
+        )
+    ).all()
+    totals: Counter = Counter()
+    for dimension, key, count in folded:
+        totals[(dimension, key)] += count
+    rows = [
+        {'dimension': dimension, 'key': key, 'count': delta}
+        for (dimension, key), delta in sorted(totals.items())
+        if delta
+    ]
+    if rows:
+        stmt = pg_insert(InventorySummaryCounter).values(rows)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[InventorySummaryCounter.dimension, InventorySummaryCounter.key],
+                set_={'count': InventorySummaryCounter.count + stmt.excluded['count']},
+            )
+        )
+    return len(folded)
+
+
+def fold_summary_deltas(db: Session) -> int:
+    """Mueve los deltas pendientes a los contadores. Devuelve cuántos deltas consolidó."""
+    # Un solo proceso escribe los contadores a la vez; las inserciones de deltas que
+    # confirmen mientras tanto quedan para la próxima pasada.
+    _lock_counters(db)
+    return _fold(db)
+
+
+def reconcile_summary_counters(db: Session) -> int:
+    """Deja los contadores iguales a los conteos reales. Devuelve cuántas filas corrigió."""
+    # Bloquea las escrituras (no las lecturas) hasta el commit: una transacción que ya
+    # insertó sus deltas se espera, y una que los inserte después lo hará sobre el
+    # valor conciliado. El candado de consolidación va primero, igual que en `fold`.
+    _lock_counters(db)
+    db.execute(text('LOCK TABLE inventory_summary_counters, inventory_summary_deltas IN EXCLUSIVE MODE'))
+    _fold(db)
+
+    expected: dict[tuple[str, str], int] = {}
+    for status, count in db.execute(select(InventoryItem.status, func.count()).group_by(InventoryItem.status)):
+        expected[(STATUS, status)] = count
+    for item_type, count in db.execute(select(InventoryItem.type, func.count()).group_by(InventoryItem.type)):
+        expected[(TYPE, item_type)] = count
+    for category_id, count in db.execute(
+        select(Product.category_id, func.count())
+        .select_from(InventoryItem)
+        .join(Product, Product.id == InventoryItem.product_id)
+        .group_by(Product.category_id)
+    ):
+        expected[(CATEGORY, category_id)] = count
+
+    current = {
+        (row.dimension, row.key): row.count
+        for row in db.execute(select(InventorySummaryCounter.dimension, InventorySummaryCounter.key, InventorySummaryCounter.count))
+    }
+    fixes = {key: count for key, count in expected.items() if current.get(key) != count}
+    stale = [key for key, count in current.items() if key not in expected and count != 0]
+
+    if fixes:
+        stmt = pg_insert(InventorySummaryCounter).values(
+            [{'dimension': dimension, 'key': key, 'count': count} for (dimension, key), count in sorted(fixes.items())]
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[InventorySummaryCounter.dimension, InventorySummaryCounter.key],
+                set_={'count': stmt.excluded['count']},
+            )
+        )
+    if stale:
+        db.execute(
+            InventorySummaryCounter.__table__.delete().where(
+                tuple_(InventorySummaryCounter.dimension, InventorySummaryCounter.key).in_(stale)
+            )
+        )
+    return len(fixes) + len(stale)
+
+
+class SummaryCache:
+    """Última respuesta de `summary()` durante `ttl_seconds` (0 = sin caché)."""
+
+    def __init__(self, ttl_seconds: float, clock=time.monotonic) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = Lock()
+        self._value: dict | None = None
+        self._expires_at = 0.0
+
+    def get(self) -> dict | None:
+        with self._lock:
+            if self._value is None or self._clock() >= self._expires_at:
+                return None
+            return self._value
+
+    def put(self, value: dict) -> None:
+        if self._ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._value = value
+            self._expires_at = self._clock() + self._ttl_seconds
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._value = None
@@ -1,5 +1,6 @@
 """Adaptador de infraestructura para `products` (persistencia concreta)."""
 
+from collections import Counter
 from datetime import datetime
 from uuid import uuid4
 
@@ -18,6 +19,7 @@ from app.domain.products.entities import (
     SupplierLite,
 )
 from app.domain.products.errors import DuplicateSkuError, ProductPersistenceError
+from app.infrastructure.inventory.summary_counters import CATEGORY, apply_summary_deltas
 from app.models.catalog_inventory import Category, InventoryItem, Product, ProductSupplier, Supplier
 
 
@@ -134,6 +136,7 @@ class SqlAlchemyProductsRepository:
         if not product:
             return None
 
+        previous_category_id = product.category_id
         product.sku = payload.sku
         product.name = payload.name
         product.description = payload.description
@@ -156,6 +159,14 @@ class SqlAlchemyProductsRepository:
         self._db.refresh(product)
         self._db.refresh(product, attribute_names=['category'])
         inventory_count = self._db.scalar(select(func.count(InventoryItem.id)).where(InventoryItem.product_id == product_id)) or 0
+        if inventory_count and previous_category_id != product.category_id:
+            # Los items del producto pasan a contar en la nueva categoría del resumen.
+            deltas = Counter()
+            if previous_category_id:
+                deltas[(CATEGORY, previous_category_id)] -= inventory_count
+            if product.category_id:
+                deltas[(CATEGORY, product.category_id)] += inventory_count
+            apply_summary_deltas(self._db, deltas)
         return self._to_product_data(product, int(inventory_count))
 
     def delete_product(self, product_id: str) -> dict | None:
@@ -0,0 +1,140 @@
+"""Ventana de antirrebote (debounce) de lecturas RFID antes de persistirlas.
+
+Los lectores fijos reportan el mismo tag varias veces por segundo. En lugar de
+guardar una `RfidDetection` por lectura, las lecturas repetidas de un mismo
+(EPC, lector, dirección) separadas por menos de `window_seconds` se agrupan en una
+sola detección, que conserva primer/último instante, número de lecturas y RSSI
+máximo/promedio.
+
+El estado vive en memoria del proceso (un `OrderedDict` por orden de uso):
+
+- Una ventana se cierra cuando pasa `window_seconds` sin lecturas (según el
+  timestamp de la lectura); la siguiente lectura abre una detección nueva.
+- Las ventanas inactivas se expulsan por tiempo (reloj monotónico) y, si hace
+  falta, por tamaño (`max_entries`), así que la memoria queda acotada.
+- `first_seen` no cambia una vez abierta la ventana (es el `timestamp` de la fila);
+  una lectura atrasada dentro de la ventana solo suma al conteo y al RSSI.
+- Cada proceso tiene su propia ventana: con varios workers una misma ráfaga puede
+  quedar en más de una detección, nunca en menos.
+- Si la transacción que persistía una ventana se revierte, la ventana se olvida
+  (`forget`) y la siguiente lectura abre una detección nueva.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from threading import Lock
+from uuid import uuid4
+
+
+@dataclass(slots=True)
+class DebounceWindow:
+    detection_id: str
+    rfid_tag_id: str
+    first_seen: datetime
+    last_seen: datetime
+    rssi: int | None = None
+    read_count: int = 0
+    rssi_max: int | None = None
+    rssi_sum: int = 0
+    rssi_reads: int = 0
+    touched_at: float = 0.0
+
+    @property
+    def rssi_avg(self) -> float | None:
+        return self.rssi_sum / self.rssi_reads if self.rssi_reads else None
+
+    def add(self, detection_time: datetime, rssi: int | None) -> None:
+        if not self.read_count:
+            self.rssi = rssi
+        self.last_seen = max(self.last_seen, detection_time)
+        self.read_count += 1
+        if rssi is not None:
+            self.rssi_max = rssi if self.rssi_max is None else max(self.rssi_max, rssi)
+            self.rssi_sum += rssi
+            self.rssi_reads += 1
+
+
+class DetectionDebouncer:
+    def __init__(self, window_seconds: float, max_entries: int, clock=time.monotonic) -> None:
+        self._window = timedelta(seconds=window_seconds)
+        self._window_seconds = window_seconds
+        self._max_entries = max_entries
+        self._clock = clock
+        self._lock = Lock()
+        self._windows: OrderedDict[tuple, DebounceWindow] = OrderedDict()
+        self._reads = 0
+        self._opened = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._window_seconds > 0 and self._max_entries > 0
+
+    def observe(
+        self,
+        key: tuple,
+        rfid_tag_id: str,
+        detection_time: datetime,
+        rssi: int | None,
+    ) -> tuple[DebounceWindow, bool]:
+        """Suma una lectura a su ventana. Devuelve `(ventana, abierta_ahora)`."""
+        if not self.enabled:
+            window = DebounceWindow(str(uuid4()), rfid_tag_id, detection_time, detection_time)
+            window.add(detection_time, rssi)
+            return window, True
+
+        now = self._clock()
+        with self._lock:
+            self._reads += 1
+            self._expire(now)
+            window = self._windows.get(key)
+            opened = (
+                window is None
+                or window.rfid_tag_id != rfid_tag_id
+                or detection_time > window.last_seen + self._window
+                or detection_time < window.first_seen - self._window
+            )
+            if opened:
+                window = DebounceWindow(str(uuid4()), rfid_tag_id, detection_time, detection_time)
+                self._windows[key] = window
+                self._opened += 1
+            self._windows.move_to_end(key)
+            window.add(detection_time, rssi)
+            window.touched_at = now
+            while len(self._windows) > self._max_entries:
+                self._windows.popitem(last=False)
+                self._evictions += 1
+            return window, opened
+
+    def forget(self, keys) -> None:
+        """Descarta las ventanas de `keys` (p. ej. las de una transacción revertida)."""
+        with self._lock:
+            for key in keys:
+                self._windows.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._windows.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'windowSeconds': self._window_seconds,
+                'size': len(self._windows),
+                'maxEntries': self._max_entries,
+                'reads': self._reads,
+                'detections': self._opened,
+                'collapsed': self._reads - self._opened,
+                'evictions': self._evictions,
+            }
+
+    def _expire(self, now: float) -> None:
+        while self._windows:
+            window = next(iter(self._windows.values()))
+            if window.touched_at + self._window_seconds > now:
+                return
+            self._windows.popitem(last=False)
+            self._evictions += 1
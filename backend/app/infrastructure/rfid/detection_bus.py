@@ -0,0 +1,108 @@
+"""Bus pub/sub en proceso para el feed en vivo de detecciones RFID.
+
+La ingesta publica (desde hilos del threadpool o de los workers de la cola) las
+lecturas ya confirmadas; cada suscriptor (una conexión SSE, atendida por el event
+loop) recibe solo las que pasan sus filtros en una cola acotada. Un suscriptor
+que no consume a tiempo y desborda su cola se desconecta en lugar de frenar la
+ingesta o acumular memoria.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from threading import Lock
+from uuid import uuid4
+
+# Marca de fin en la cola de un suscriptor: fue desconectado por lento.
+DROPPED = None
+
+
+@dataclass(slots=True)
+class DetectionSubscription:
+    id: str
+    reader_id: str
+    rfid_tag_id: str
+    direction: str
+    queue: asyncio.Queue
+    loop: asyncio.AbstractEventLoop
+    delivered: int = 0
+    dropped: bool = False
+
+    def matches(self, event: dict) -> bool:
+        return (
+            (not self.reader_id or event.get('readerId') == self.reader_id)
+            and (not self.rfid_tag_id or event.get('tagId') == self.rfid_tag_id)
+            and (not self.direction or event.get('direction') == self.direction)
+        )
+
+
+class DetectionBus:
+    def __init__(self, buffer_size: int, max_subscribers: int) -> None:
+        self._buffer_size = buffer_size
+        self._max_subscribers = max_subscribers
+        self._lock = Lock()
+        self._subscriptions: dict[str, DetectionSubscription] = {}
+        self._published = 0
+        self._dropped = 0
+
+    def subscribe(self, *, reader_id: str = '', rfid_tag_id: str = '', direction: str = '') -> DetectionSubscription | None:
+        """Registra un suscriptor del event loop actual. `None` si se alcanzó el máximo."""
+        subscription = DetectionSubscription(
+            id=str(uuid4()),
+            reader_id=reader_id,
+            rfid_tag_id=rfid_tag_id,
+            direction=direction,
+            # Un lugar extra para la marca `DROPPED` aunque la cola esté llena.
+            queue=asyncio.Queue(maxsize=self._buffer_size + 1),
+            loop=asyncio.get_running_loop(),
+        )
+        with self._lock:
+            if len(self._subscriptions) >= self._max_subscribers:
+                return None
+            self._subscriptions[subscription.id] = subscription
+        return subscription
+
+    def unsubscribe(self, subscription: DetectionSubscription) -> None:
+        with self._lock:
+            self._subscriptions.pop(subscription.id, None)
+
+    def publish(self, events: list[dict]) -> None:
+        """Reparte `events` a los suscriptores cuyos filtros coinciden. Nunca bloquea ni lanza."""
+        if not events:
+            return
+        with self._lock:
+            self._published += len(events)
+            subscriptions = list(self._subscriptions.values())
+        for subscription in subscriptions:
+            matched = [event for event in events if subscription.matches(event)]
+            if not matched:
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(self._deliver, subscription, matched)
+            except RuntimeError:
+                # El event loop del suscriptor ya se cerró.
+                self.unsubscribe(subscription)
+
+    def _deliver(self, subscription: DetectionSubscription, events: list[dict]) -> None:
+        # Corre en el event loop del suscriptor: la cola no necesita más sincronización.
+        if subscription.dropped:
+            return
+        if subscription.queue.qsize() + len(events) > self._buffer_size:
+            subscription.dropped = True
+            self.unsubscribe(subscription)
+            with self._lock:
+                self._dropped += 1
+            subscription.queue.put_nowait(DROPPED)
+            return
+        for event in events:
+            subscription.queue.put_nowait(event)
+        subscription.delivered += len(events)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'subscribers': len(self._subscriptions),
+                'maxSubscribers': self._max_subscribers,
+                'bufferSize': self._buffer_size,
+                'published': self._published,
+                'droppedSubscribers': self._dropped,
+            }
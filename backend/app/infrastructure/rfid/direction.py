@@ -0,0 +1,204 @@
+"""Inferencia de dirección (IN/OUT) a partir de la secuencia de lecturas por zona.
+
+Cada par lector/antena se asigna a un lado de la puerta (`INSIDE`/`OUTSIDE`) con
+`RFID_DIRECTION_ZONES`, p. ej. `dock1:1=OUTSIDE,dock1:2=INSIDE,gate=INSIDE` (la
+antena es opcional; sin ella el lado vale para todo el lector).
+
+Por EPC se guarda una ventana corta de lecturas recientes `(instante, lado, rssi)`:
+
+- El lado candidato es el que más lecturas tiene en la ventana (a igualdad, el de
+  mayor RSSI promedio) y se confirma con al menos `min_reads` lecturas.
+- Una transición se emite solo cuando el lado confirmado cambia (`OUTSIDE` ->
+  `INSIDE` = `IN`). La primera vez que se ve un tag, el lado confirmado se toma
+  como punto de partida y solo hay transición si la ventana muestra el paso desde
+  el otro lado.
+- Al confirmar, la ventana conserva solo lecturas del nuevo lado: volver atrás
+  exige otra vez `min_reads` lecturas dominantes del lado opuesto (histéresis).
+  Un tag que rebota entre antenas no hace cambiar el estado del item.
+
+El estado vive en memoria del proceso, acotado por `max_tags` (LRU) y por
+`ttl_seconds` sin lecturas; cada tag ocupa una ventana de pocas tuplas.
+"""
+
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from threading import Lock
+
+DIRECTION_MODES = ('reader', 'infer', 'hybrid')
+INSIDE = 'INSIDE'
+OUTSIDE = 'OUTSIDE'
+_TRANSITIONS = {INSIDE: 'IN', OUTSIDE: 'OUT'}
+# Lecturas por tag que se conservan en la ventana (suficiente para decidir).
+_MAX_WINDOW_READS = 32
+
+
+def parse_zones(value: str) -> dict[str, str]:
+    """`lector[:antena]=INSIDE|OUTSIDE` separados por coma -> `{'lector[:antena]': lado}`."""
+    zones: dict[str, str] = {}
+    for entry in value.split(','):
+        entry = entry.strip()
+        if not entry:
+            continue
+        key, _, side = entry.partition('=')
+        side = side.strip().upper()
+        if not key.strip() or side not in _TRANSITIONS:
+            raise ValueError(f'Zona RFID invalida: {entry}')
+        zones[key.strip()] = side
+    return zones
+
+
+@dataclass(slots=True)
+class _TagTrack:
+    side: str | None = None
+    reads: deque = field(default_factory=lambda: deque(maxlen=_MAX_WINDOW_READS))
+    touched_at: float = 0.0
+
+
+class DirectionInferenceEngine:
+    def __init__(
+        self,
+        mode: str,
+        zones: dict[str, str],
+        window_seconds: float,
+        min_reads: int,
+        max_tags: int,
+        ttl_seconds: float,
+        clock=time.monotonic,
+    ) -> None:
+        if mode not in DIRECTION_MODES:
+            raise ValueError(f'Modo de direccion RFID no soportado: {mode}')
+        self._mode = mode
+        self._zones = zones
+        self._window_seconds = window_seconds
+        self._min_reads = max(min_reads, 1)
+        self._max_tags = max_tags
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = Lock()
+        self._tracks: OrderedDict[str, _TagTrack] = OrderedDict()
+        self._observed = 0
+        self._unmapped = 0
+        self._transitions = {'IN': 0, 'OUT': 0}
+        self._evictions = 0
+
+    def effective_direction(
+        self,
+        epc: str,
+        reader_id: str,
+        antenna: int | None,
+        reported: str | None,
+        rssi: int | None,
+        detection_time: datetime,
+    ) -> str | None:
+        """Dirección con la que se actualiza el inventario según el modo.
+
+        - `reader`: la que reporta el lector.
+        - `infer`: solo transiciones confirmadas por la secuencia de zonas.
+        - `hybrid`: la del lector si viene; si no, la inferida.
+        """
+        if self._mode == 'reader':
+            return reported
+        if self._mode == 'hybrid' and reported in _TRANSITIONS.values():
+            return reported
+        return self.observe(epc, reader_id, antenna, rssi, detection_time)
+
+    def observe(
+        self,
+        epc: str,
+        reader_id: str,
+        antenna: int | None,
+        rssi: int | None,
+        detection_time: datetime,
+    ) -> str | None:
+        """Suma una lectura a la ventana del EPC. Devuelve `IN`/`OUT` si confirma una transición."""
+        side = self._zones.get(f'{reader_id}:{antenna}') if antenna is not None else None
+        side = side or self._zones.get(reader_id)
+        now = self._clock()
+        with self._lock:
+            if side is None:
+                self._unmapped += 1
+                return None
+            self._observed += 1
+            self._expire(now)
+            track = self._tracks.get(epc)
+            if track is None:
+                track = self._tracks[epc] = _TagTrack()
+            self._tracks.move_to_end(epc)
+            track.touched_at = now
+
+            moment = detection_time.timestamp()
+            track.reads.append((moment, side, rssi))
+            while track.reads and track.reads[0][0] < moment - self._window_seconds:
+                track.reads.popleft()
+
+            transition = self._decide(track)
+            while len(self._tracks) > self._max_tags:
+                self._tracks.popitem(last=False)
+                self._evictions += 1
+            return transition
+
+    def _decide(self, track: _TagTrack) -> str | None:
+        counts = {INSIDE: 0, OUTSIDE: 0}
+        rssi_totals = {INSIDE: [0, 0], OUTSIDE: [0, 0]}
+        for _, side, rssi in track.reads:
+            counts[side] += 1
+            if rssi is not None:
+                rssi_totals[side][0] += rssi
+                rssi_totals[side][1] += 1
+
+        if counts[INSIDE] != counts[OUTSIDE]:
+            candidate = INSIDE if counts[INSIDE] > counts[OUTSIDE] else OUTSIDE
+        else:
+            averages = {side: total / reads if reads else float('-inf') for side, (total, reads) in rssi_totals.items()}
+            if averages[INSIDE] == averages[OUTSIDE]:
+                return None
+            candidate = INSIDE if averages[INSIDE] > averages[OUTSIDE] else OUTSIDE
+        if counts[candidate] < self._min_reads or candidate == track.side:
+            return None
+
+        # Sin lado previo solo hay transición si la ventana empieza en el otro lado.
+        crossed = track.side is not None or track.reads[0][1] != candidate
+        track.side = candidate
+        kept = [read for read in track.reads if read[1] == candidate]
+        track.reads.clear()
+        track.reads.extend(kept)
+        if not crossed:
+            return None
+        transition = _TRANSITIONS[candidate]
+        self._transitions[transition] += 1
+        return transition
+
+    def forget(self, epcs) -> None:
+        """Descarta la ventana de `epcs`; la próxima lectura los trata como vistos por primera vez."""
+        with self._lock:
+            for epc in epcs:
+                self._tracks.pop(epc, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tracks.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'mode': self._mode,
+                'zones': dict(self._zones),
+                'windowSeconds': self._window_seconds,
+                'minReads': self._min_reads,
+                'tracked': len(self._tracks),
+                'maxTags': self._max_tags,
+                'observed': self._observed,
+                'unmapped': self._unmapped,
+                'transitions': dict(self._transitions),
+                'evictions': self._evictions,
+            }
+
+    def _expire(self, now: float) -> None:
+        while self._tracks:
+            track = next(iter(self._tracks.values()))
+            if track.touched_at + self._ttl_seconds > now:
+                return
+            self._tracks.popitem(last=False)
+            self._evictions += 1
@@ -0,0 +1,221 @@
+"""Caché en proceso EPC -> tag para la ingesta RFID.
+
+La resolución EPC -> (tag, estado, item vinculado, estado del item) solo cambia en
+las mutaciones de tags (`create/update/delete/enroll/unenroll`) y en los cambios de
+estado de inventario. Los lectores, en cambio, leen los mismos EPC miles de veces:
+esta caché LRU acotada evita ir a PostgreSQL en casi todas las lecturas.
+
+- Las mutaciones invalidan la entrada (por EPC o por item de inventario) al
+  hacerse y otra vez tras su commit (`invalidate_on_commit`): entre ambos momentos
+  la ingesta todavía puede leer de la base el valor anterior.
+- Cada invalidación sube una generación. La ingesta anota la generación al resolver
+  y publica tras su commit; si el EPC o su item se invalidaron entretanto, la
+  entrada se descarta en lugar de reponer un vínculo viejo.
+- Los EPC que se sabe que no existen se guardan como entradas negativas.
+- Cada entrada expira `ttl_seconds` después de leerse de la base (volver a leer el
+  tag no la renueva), lo que acota la desactualización entre procesos (cada worker
+  tiene su propia caché y no recibe invalidaciones ajenas).
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from threading import Lock
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_PENDING_INVALIDATIONS = 'epc_cache_invalidations'
+
+
+@dataclass(frozen=True, slots=True)
+class CachedTag:
+    id: str
+    tid: str | None
+    status: str
+    inventory_item_id: str | None
+    item_status: str | None
+
+
+class EpcCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, clock=time.monotonic) -> None:
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = Lock()
+        # epc -> (expira_en, tag | None). `None` es una entrada negativa (EPC inexistente).
+        self._entries: OrderedDict[str, tuple[float, CachedTag | None]] = OrderedDict()
+        self._epc_by_item: dict[str, str] = {}
+        # Generación de la última invalidación de cada EPC/item (acotado como la caché);
+        # `_floor` es la más nueva que se olvidó: lo resuelto antes se da por viejo.
+        self._generation = 0
+        self._invalidated: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self._floor = 0
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0
+
+    def get_many(self, epcs: set[str]) -> tuple[dict[str, CachedTag], set[str], set[str]]:
+        """Devuelve `(encontrados, ausentes_conocidos, desconocidos)` para un lote de EPC."""
+        found: dict[str, CachedTag] = {}
+        absent: set[str] = set()
+        missing: set[str] = set()
+        if not self.enabled:
+            self._misses += len(epcs)
+            return found, absent, set(epcs)
+
+        now = self._clock()
+        with self._lock:
+            for epc in epcs:
+                entry = self._entries.get(epc)
+                if entry is None or entry[0] <= now:
+                    if entry is not None:
+                        self._drop(epc)
+                    missing.add(epc)
+                    continue
+                self._entries.move_to_end(epc)
+                if entry[1] is None:
+                    absent.add(epc)
+                else:
+                    found[epc] = entry[1]
+            self._hits += len(found)
+            self._negative_hits += len(absent)
+            self._misses += len(missing)
+        return found, absent, missing
+
+    def generation(self) -> int:
+        """Generación actual: se anota al resolver y se pasa a `put` al publicar."""
+        with self._lock:
+            return self._generation
+
+    def put(self, epc: str, tag: CachedTag, generation: int | None = None, keep_expiry: bool = False) -> None:
+        """Guarda `tag` salvo que se haya invalidado después de `generation`.
+
+        Con `keep_expiry` solo actualiza una entrada que sigue en caché y conserva su
+        vencimiento (p. ej. el estado del item cambiado sobre un tag leído de caché).
+        """
+        self._store(epc, tag, generation, keep_expiry)
+
+    def put_absent(self, epc: str, generation: int | None = None) -> None:
+        self._store(epc, None, generation, False)
+
+    def invalidate(self, epc: str) -> None:
+        with self._lock:
+            self._bump(('epc', epc))
+            if self._drop(epc):
+                self._invalidations += 1
+
+    def invalidate_item(self, inventory_item_id: str) -> None:
+        """Invalida el EPC vinculado a un item cuyo estado o vínculo cambió."""
+        with self._lock:
+            self._bump(('item', inventory_item_id))
+            epc = self._epc_by_item.get(inventory_item_id)
+            if epc is not None and self._drop(epc):
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._floor = self._generation
+            self._invalidated.clear()
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+            self._epc_by_item.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._negative_hits + self._misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'maxEntries': self._max_entries,
+                'ttlSeconds': self._ttl_seconds,
+                'hits': self._hits,
+                'negativeHits': self._negative_hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations,
+                'hitRatio': (self._hits + self._negative_hits) / lookups if lookups else 0.0,
+            }
+
+    def _store(self, epc: str, tag: CachedTag | None, generation: int | None, keep_expiry: bool) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if generation is not None and self._stale(epc, tag, generation):
+                return
+            if keep_expiry:
+                current = self._entries.get(epc)
+                if current is None:
+                    return
+                expires_at = current[0]
+            else:
+                expires_at = self._clock() + self._ttl_seconds
+            self._drop(epc)
+            self._entries[epc] = (expires_at, tag)
+            if tag is not None and tag.inventory_item_id:
+                self._epc_by_item[tag.inventory_item_id] = epc
+            while len(self._entries) > self._max_entries:
+                oldest_epc = next(iter(self._entries))
+                self._drop(oldest_epc)
+                self._evictions += 1
+
+    def _bump(self, key: tuple[str, str]) -> None:
+        self._generation += 1
+        self._invalidated[key] = self._generation
+        self._invalidated.move_to_end(key)
+        while len(self._invalidated) > max(self._max_entries, 1):
+            _, forgotten = self._invalidated.popitem(last=False)
+            self._floor = forgotten
+
+    def _stale(self, epc: str, tag: CachedTag | None, generation: int) -> bool:
+        if generation < self._floor or self._invalidated.get(('epc', epc), 0) > generation:
+            return True
+        return bool(tag and tag.inventory_item_id and self._invalidated.get(('item', tag.inventory_item_id), 0) > generation)
+
+    def _drop(self, epc: str) -> bool:
+        entry = self._entries.pop(epc, None)
+        if entry is None:
+            return False
+        tag = entry[1]
+        if tag is not None and tag.inventory_item_id and self._epc_by_item.get(tag.inventory_item_id) == epc:
+            del self._epc_by_item[tag.inventory_item_id]
+        return True
+
+
+def invalidate_on_commit(
+    db: Session,
+    cache: EpcCache,
+    epcs: Iterable[str] = (),
+    inventory_item_ids: Iterable[str] = (),
+) -> None:
+    """Invalida ahora y otra vez cuando `db` confirme (si se revierte, basta con la primera)."""
+    pending = (tuple(epcs), tuple(inventory_item_ids))
+    _invalidate(cache, *pending)
+    db.info.setdefault(_PENDING_INVALIDATIONS, []).append((cache, *pending))
+
+
+def _invalidate(cache: EpcCache, epcs: tuple[str, ...], inventory_item_ids: tuple[str, ...]) -> None:
+    for epc in epcs:
+        cache.invalidate(epc)
+    for inventory_item_id in inventory_item_ids:
+        cache.invalidate_item(inventory_item_id)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_committed(session: Session) -> None:
+    for cache, epcs, inventory_item_ids in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        _invalidate(cache, epcs, inventory_item_ids)
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _drop_pending_invalidations(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_PENDING_INVALIDATIONS, None)
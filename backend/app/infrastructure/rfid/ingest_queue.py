@@ -0,0 +1,189 @@
+"""Cola en proceso para la ingesta asíncrona de lecturas RFID.
+
+`POST /rfid/read` en modo `async` solo valida y encola el lote; un pool de hilos
+lo persiste después. Cada worker toma un lote y, sin esperar, hasta
+`max_coalesce - 1` lotes más que ya estén en cola, y los guarda en una sola
+transacción. Si esa transacción falla, reintenta cada lote por separado para que
+un lote inválido no arrastre a los demás.
+
+La cola es acotada: cuando se llena, `submit` lanza `IngestQueueFullError` y la API
+responde 503 con `Retry-After`. El estado de cada lote se conserva en memoria
+(acotado a `status_retention` lotes terminados) para consultarlo por `batchId`.
+"""
+
+import logging
+import queue
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from app.domain.rfid.errors import IngestQueueFullError
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class InMemoryRfidIngestQueue:
+    def __init__(
+        self,
+        process_batches: Callable[[list[dict]], list[dict]],
+        *,
+        max_size: int,
+        workers: int,
+        max_coalesce: int,
+        status_retention: int,
+    ) -> None:
+        self._process_batches = process_batches
+        self._queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self._worker_count = workers
+        self._max_coalesce = max(1, max_coalesce)
+        self._status_retention = status_retention
+        self._batches: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._accepting = False
+        self._accepted = 0
+        self._rejected = 0
+        self._processed = 0
+        self._failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._accepting
+
+    def start(self) -> None:
+        with self._lock:
+            if self._accepting:
+                return
+            self._accepting = True
+            self._threads = [
+                threading.Thread(target=self._run, name=f'rfid-ingest-{index}', daemon=True)
+                for index in range(self._worker_count)
+            ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """Deja de aceptar lotes y espera a que los encolados se persistan."""
+        with self._lock:
+            if not self._accepting:
+                return
+            self._accepting = False
+        # Las marcas de parada quedan detrás de los lotes pendientes: se drenan primero.
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, payload: dict) -> dict:
+        batch = {
+            'batchId': str(uuid4()),
+            'status': 'QUEUED',
+            'readerId': payload['readerId'],
+            'reads': len(payload['reads']),
+            'queuedAt': _now(),
+            'startedAt': None,
+            'completedAt': None,
+            'result': None,
+            'error': None,
+        }
+        with self._lock:
+            if not self._accepting:
+                raise IngestQueueFullError('La cola de ingesta RFID no esta disponible')
+            try:
+                self._queue.put_nowait((batch['batchId'], payload))
+            except queue.Full:
+                self._rejected += 1
+                raise IngestQueueFullError('La cola de ingesta RFID esta llena') from None
+            self._accepted += 1
+            self._batches[batch['batchId']] = batch
+            return dict(batch)
+
+    def get(self, batch_id: str) -> dict | None:
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            return dict(batch) if batch else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'running': self._accepting,
+                'workers': self._worker_count,
+                'depth': self._queue.qsize(),
+                'capacity': self._queue.maxsize,
+                'accepted': self._accepted,
+                'rejected': self._rejected,
+                'processed': self._processed,
+                'failed': self._failed,
+            }
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            group = [item]
+            stop_after = False
+            while len(group) < self._max_coalesce:
+                try:
+                    extra = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if extra is _STOP:
+                    stop_after = True
+                    break
+                group.append(extra)
+
+            self._process_group(group)
+            if stop_after:
+                return
+
+    def _process_group(self, group: list[tuple[str, dict]]) -> None:
+        self._update([batch_id for batch_id, _ in group], status='PROCESSING', startedAt=_now())
+        try:
+            results = self._process_batches([payload for _, payload in group])
+        except Exception:
+            if len(group) == 1:
+                batch_id = group[0][0]
+                logger.exception('Fallo la ingesta asincrona del lote RFID %s', batch_id)
+                self._finish(batch_id, error='No se pudo procesar el lote')
+                return
+            for single in group:
+                self._process_group([single])
+            return
+
+        for (batch_id, _), result in zip(group, results):
+            self._finish(batch_id, result=result)
+
+    def _update(self, batch_ids: list[str], **changes) -> None:
+        with self._lock:
+            for batch_id in batch_ids:
+                batch = self._batches.get(batch_id)
+                if batch:
+                    batch.update(changes)
+
+    def _finish(self, batch_id: str, result: dict | None = None, error: str | None = None) -> None:
+        with self._lock:
+            batch = self._batches.get(batch_id)
+            if batch:
+                batch.update(status='FAILED' if error else 'DONE', completedAt=_now(), result=result, error=error)
+            if error:
+                self._failed += 1
+            else:
+                self._processed += 1
+            self._evict_finished()
+
+    def _evict_finished(self) -> None:
+        overflow = len(self._batches) - self._status_retention
+        if overflow <= 0:
+            return
+        for batch_id in [key for key, batch in self._batches.items() if batch['status'] in {'DONE', 'FAILED'}][:overflow]:
+            del self._batches[batch_id]
@@ -0,0 +1,166 @@
+"""Salud y rendimiento por lector RFID, en memoria del proceso.
+
+Se actualiza en cada lote de lectura ya procesado (cualquier canal de ingesta) y
+permite ver qué lectores están activos, cuáles inundan y cuáles callaron sin
+agrupar `rfid_detections` por `readerId`.
+
+- La tasa (lecturas/s) es un promedio móvil exponencial con constante de tiempo
+  `rate_window_seconds`: cada lectura aporta `1/τ` y el acumulado decae con
+  `exp(-Δt/τ)`, así que un lector que deja de enviar tiende a 0.
+- Las latencias de procesamiento se guardan en una ventana de las últimas
+  `latency_samples` mediciones para calcular p50/p95/p99.
+- Los contadores tienen además un delta pendiente de volcar a `rfid_readers`
+  (`drain`), para que varios procesos puedan sumar sus totales.
+"""
+
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from threading import Lock
+
+
+@dataclass(slots=True)
+class _ReaderStats:
+    reader_id: str
+    reader_name: str | None
+    first_seen_at: datetime
+    last_seen_at: datetime
+    # Reloj monotónico de la última lectura (tasa y detección de lectores callados).
+    updated: float
+    rate: float = 0.0
+    batches: int = 0
+    reads: int = 0
+    unknown_reads: int = 0
+    errors: int = 0
+    max_batch: int = 0
+    latencies: deque = field(default_factory=deque)
+    pending_batches: int = 0
+    pending_reads: int = 0
+    pending_unknown: int = 0
+    pending_errors: int = 0
+
+
+def _percentile(ordered: list[float], fraction: float) -> float | None:
+    if not ordered:
+        return None
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+class ReaderStatsRegistry:
+    def __init__(
+        self,
+        rate_window_seconds: float,
+        latency_samples: int,
+        silent_after_seconds: float,
+        clock=time.monotonic,
+    ) -> None:
+        self._tau = rate_window_seconds
+        self._latency_samples = latency_samples
+        self._silent_after = silent_after_seconds
+        self._clock = clock
+        self._lock = Lock()
+        self._readers: dict[str, _ReaderStats] = {}
+
+    def _reader(self, reader_id: str, reader_name: str | None, now: float) -> _ReaderStats:
+        reader = self._readers.get(reader_id)
+        if reader is None:
+            seen_at = datetime.now(timezone.utc)
+            reader = _ReaderStats(
+                reader_id=reader_id,
+                reader_name=reader_name,
+                first_seen_at=seen_at,
+                last_seen_at=seen_at,
+                updated=now,
+                latencies=deque(maxlen=self._latency_samples),
+            )
+            self._readers[reader_id] = reader
+        elif reader_name:
+            reader.reader_name = reader_name
+        return reader
+
+    def _decayed_rate(self, reader: _ReaderStats, now: float) -> float:
+        return reader.rate * math.exp(-(now - reader.updated) / self._tau)
+
+    def record_batch(self, reader_id: str, reader_name: str | None, reads: int, unknown_reads: int, latency_ms: float) -> None:
+        now = self._clock()
+        with self._lock:
+            reader = self._reader(reader_id, reader_name, now)
+            reader.rate = self._decayed_rate(reader, now) + reads / self._tau
+            reader.updated = now
+            reader.last_seen_at = datetime.now(timezone.utc)
+            reader.batches += 1
+            reader.reads += reads
+            reader.unknown_reads += unknown_reads
+            reader.max_batch = max(reader.max_batch, reads)
+            reader.latencies.append(latency_ms)
+            reader.pending_batches += 1
+            reader.pending_reads += reads
+            reader.pending_unknown += unknown_reads
+
+    def record_error(self, reader_id: str, reader_name: str | None) -> None:
+        now = self._clock()
+        with self._lock:
+            reader = self._reader(reader_id, reader_name, now)
+            reader.errors += 1
+            reader.pending_errors += 1
+
+    def stats(self) -> list[dict]:
+        now = self._clock()
+        with self._lock:
+            return [self._serialize(reader, now) for _, reader in sorted(self._readers.items())]
+
+    def drain(self) -> list[dict]:
+        """Estado actual más los contadores acumulados desde el último `drain` (que se reinician)."""
+        now = self._clock()
+        with self._lock:
+            rows = []
+            for reader in self._readers.values():
+                row = self._serialize(reader, now)
+                row.update(
+                    {
+                        'batchesDelta': reader.pending_batches,
+                        'readsDelta': reader.pending_reads,
+                        'unknownReadsDelta': reader.pending_unknown,
+                        'errorsDelta': reader.pending_errors,
+                    }
+                )
+                reader.pending_batches = reader.pending_reads = reader.pending_unknown = reader.pending_errors = 0
+                rows.append(row)
+            return rows
+
+    def restore(self, rows: list[dict]) -> None:
+        """Devuelve deltas de un `drain` que no se pudo persistir."""
+        with self._lock:
+            for row in rows:
+                reader = self._readers.get(row['readerId'])
+                if reader is None:
+                    continue
+                reader.pending_batches += row['batchesDelta']
+                reader.pending_reads += row['readsDelta']
+                reader.pending_unknown += row['unknownReadsDelta']
+                reader.pending_errors += row['errorsDelta']
+
+    def _serialize(self, reader: _ReaderStats, now: float) -> dict:
+        latencies = sorted(reader.latencies)
+        return {
+            'readerId': reader.reader_id,
+            'readerName': reader.reader_name,
+            'status': 'SILENT' if now - reader.updated > self._silent_after else 'ACTIVE',
+            'firstSeenAt': reader.first_seen_at,
+            'lastSeenAt': reader.last_seen_at,
+            'readsPerSecond': round(self._decayed_rate(reader, now), 3),
+            'batches': reader.batches,
+            'reads': reader.reads,
+            'avgBatchSize': reader.reads / reader.batches if reader.batches else None,
+            'maxBatchSize': reader.max_batch,
+            'unknownRatio': reader.unknown_reads / reader.reads if reader.reads else None,
+            'errors': reader.errors,
+            'latencyMs': {
+                'p50': _percentile(latencies, 0.50),
+                'p95': _percentile(latencies, 0.95),
+                'p99': _percentile(latencies, 0.99),
+            },
+        }
@@ -1,30 +1,149 @@
 """Adaptador de infraestructura para `rfid` (persistencia concreta)."""
 
-from datetime import datetime
+import json
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from uuid import uuid4
 
-from sqlalchemy import and_, func, or_, select
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Float,
+    Integer,
+    String,
+    and_,
+    any_,
+    case,
+    delete,
+    distinct,
+    func,
+    literal,
+    or_,
+    select,
+    tuple_,
+    union,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased, selectinload
 
-from app.domain.rfid.entities import DetectionFilters, TagFilters
+from app.domain.rfid.entities import ActivityFilters, DetectionFilters, TagFilters
 from app.domain.rfid.errors import (
     DuplicateEpcError,
     InvalidApiKeyError,
+    InvalidCursorError,
     InvalidTimestampError,
     InventoryItemAlreadyLinkedError,
     InventoryItemNotFoundError,
     TagAlreadyLinkedError,
     TagNotFoundError,
 )
-from app.models.catalog_inventory import InventoryItem, Product, RfidDetection, RfidTag
+from app.infrastructure.common.bulk import array_param, unnest_rows
+from app.infrastructure.common.cursors import decode_cursor, encode_cursor
+from app.infrastructure.inventory.summary_counters import apply_summary_deltas, status_deltas
+from app.infrastructure.rfid.debounce import DebounceWindow, DetectionDebouncer
+from app.infrastructure.rfid.direction import DirectionInferenceEngine
+from app.infrastructure.rfid.epc_cache import CachedTag, EpcCache, invalidate_on_commit
+from app.models.catalog_inventory import (
+    InventoryItem,
+    InventoryMovement,
+    Product,
+    RfidDetection,
+    RfidDetectionRollup,
+    RfidReader,
+    RfidTag,
+)
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Detecciones por página en el detalle de un tag.
+_TAG_DETECTIONS_PAGE_SIZE = 50
+
+
+@dataclass(slots=True)
+class _TagSnapshot:
+    """Estado mínimo de un tag durante el procesamiento de un lote de lecturas."""
+
+    id: str
+    tid: str | None
+    status: str
+    inventory_item_id: str | None = None
+    item_status: str | None = None
+    last_seen_at: datetime | None = None
+    is_new: bool = False
+
+
+@dataclass(slots=True)
+class _PendingTag:
+    """Entrada que la transacción en curso publicará en la caché tras el commit."""
+
+    entry: CachedTag
+    # Generación de la caché al resolver el EPC: si se invalidó después, no se publica.
+    generation: int
+    # Entrada que ya estaba en caché (None si el tag salió de la base o se creó aquí).
+    cached: CachedTag | None
+
+
+@dataclass(slots=True)
+class _RollupAggregate:
+    """Acumulado de un lote para una fila de `rfid_detection_rollups` (tag, lector, hora)."""
+
+    first_seen: datetime
+    last_seen: datetime
+    read_count: int = 0
+    rssi_min: int | None = None
+    rssi_max: int | None = None
+    rssi_sum: int = 0
+    rssi_reads: int = 0
+
+    def add(self, detection_time: datetime, rssi: int | None) -> None:
+        self.first_seen = min(self.first_seen, detection_time)
+        self.last_seen = max(self.last_seen, detection_time)
+        self.read_count += 1
+        if rssi is not None:
+            self.rssi_min = rssi if self.rssi_min is None else min(self.rssi_min, rssi)
+            self.rssi_max = rssi if self.rssi_max is None else max(self.rssi_max, rssi)
+            self.rssi_sum += rssi
+            self.rssi_reads += 1
+
+
+def _hour_bucket(moment: datetime) -> datetime:
+    return moment.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
 
 
 class SqlAlchemyRfidRepository:
-    def __init__(self, db: Session) -> None:
+    def __init__(
+        self,
+        db: Session,
+        epc_cache: EpcCache | None = None,
+        debouncer: DetectionDebouncer | None = None,
+        direction_engine: DirectionInferenceEngine | None = None,
+        system_user_email: str | None = None,
+    ) -> None:
         self._db = db
+        self._epc_cache = epc_cache
+        # Sin antirrebote configurado, cada lectura es su propia detección.
+        self._debouncer = debouncer or DetectionDebouncer(window_seconds=0, max_entries=0)
+        # Sin motor de inferencia, el inventario sigue la dirección que reporta el lector.
+        self._direction_engine = direction_engine
+        # Usuario al que se atribuyen los movimientos de inventario generados por lecturas.
+        self._system_user_email = system_user_email
+        # Estado en memoria que deja la transacción en curso: la caché solo se actualiza
+        # tras el commit y, si se revierte, se olvidan las ventanas que tocó.
+        self._pending_tags: dict[str, _PendingTag] = {}
+        self._debounce_keys: set[tuple] = set()
+        self._direction_epcs: set[str] = set()
+
+    def _invalidate_epcs(self, *epcs: str | None) -> None:
+        if self._epc_cache:
+            invalidate_on_commit(self._db, self._epc_cache, epcs=[epc for epc in epcs if epc])
 
-    def _serialize_tag(self, tag: RfidTag, include_deep: bool = False) -> dict:
-        payload = {
+    def _serialize_tag(self, tag: RfidTag) -> dict:
+        return {
             'id': tag.id,
             'epc': tag.epc,
             'tid': tag.tid,
@@ -52,54 +171,83 @@ class SqlAlchemyRfidRepository:
             }
             if tag.inventory_item
             else None,
+            'lastReaderId': tag.last_reader_id,
             '_count': {
-                'detections': len(tag.detections),
+                'detections': tag.detection_count,
             },
         }
 
-        if include_deep:
-            payload['detections'] = [
-                {
-                    'id': detection.id,
-                    'readerId': detection.reader_id,
-                    'readerName': detection.reader_name,
-                    'rssi': detection.rssi,
-                    'direction': detection.direction,
-                    'timestamp': detection.timestamp,
-                }
-                for detection in sorted(tag.detections, key=lambda row: row.timestamp, reverse=True)[:50]
-            ]
-
-        return payload
-
     def _load_tag(self, tag_id: str) -> RfidTag | None:
         return self._db.scalar(
             select(RfidTag)
             .where(RfidTag.id == tag_id)
-            .options(
-                selectinload(RfidTag.inventory_item).selectinload(InventoryItem.product),
-                selectinload(RfidTag.detections),
-            )
+            .options(selectinload(RfidTag.inventory_item).selectinload(InventoryItem.product))
         )
 
+    def _recent_detections(self, tag_id: str, before: str | None) -> tuple[list[dict], str | None]:
+        """Página de detecciones del tag, de la más reciente a la más antigua.
+
+        Usa `ix_rfid_detections_tag_timestamp` con `ORDER BY ... LIMIT`: el costo no
+        depende del tamaño del historial. `before` es el cursor de la página anterior.
+        """
+        stmt = select(RfidDetection).where(RfidDetection.rfid_tag_id == tag_id)
+        if before:
+            try:
+                before_time, before_id, direction = decode_cursor(before)
+            except ValueError:
+                raise InvalidCursorError('Cursor de detecciones invalido') from None
+            if direction != 'next':
+                raise InvalidCursorError('Cursor de detecciones invalido')
+            stmt = stmt.where(tuple_(RfidDetection.timestamp, RfidDetection.id) < tuple_(before_time, before_id))
+        stmt = stmt.order_by(RfidDetection.timestamp.desc(), RfidDetection.id.desc()).limit(_TAG_DETECTIONS_PAGE_SIZE + 1)
+
+        detections = self._db.scalars(stmt).all()
+        page = detections[:_TAG_DETECTIONS_PAGE_SIZE]
+        cursor = encode_cursor(page[-1].timestamp, page[-1].id) if len(detections) > _TAG_DETECTIONS_PAGE_SIZE else None
+        return [
+            {
+                'id': detection.id,
+                'readerId': detection.reader_id,
+                'readerName': detection.reader_name,
+                'rssi': detection.rssi,
+                'direction': detection.direction,
+                'timestamp': detection.timestamp,
+                'lastSeenAt': detection.last_seen_at,
+                'readCount': detection.read_count,
+                'rssiMax': detection.rssi_max,
+                'rssiAvg': detection.rssi_avg,
+            }
+            for detection in page
+        ], cursor
+
     def _parse_timestamp(self, value: str | None) -> datetime:
         if not value:
-            return datetime.utcnow()
+            return datetime.now(timezone.utc)
         try:
-            return datetime.fromisoformat(value)
+            parsed = datetime.fromisoformat(value)
         except ValueError:
             raise InvalidTimestampError('Timestamp invalido en lectura RFID') from None
+        # Los timestamps sin zona se interpretan en UTC (igual que `now()` de la sesión).
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
 
     def list_tags(self, filters: TagFilters) -> list[dict]:
         conditions = []
         if filters.search:
             search_like = f'%{filters.search}%'
+            # `UNION` de una consulta por tabla para que cada una use sus índices trigram.
             conditions.append(
-                or_(
-                    RfidTag.epc.ilike(search_like),
-                    RfidTag.tid.ilike(search_like),
-                    RfidTag.inventory_item.has(InventoryItem.serial_number.ilike(search_like)),
-                    RfidTag.inventory_item.has(InventoryItem.asset_tag.ilike(search_like)),
+                RfidTag.id.in_(
+                    union(
+                        select(RfidTag.id).where(or_(RfidTag.epc.ilike(search_like), RfidTag.tid.ilike(search_like))),
+                        select(RfidTag.id)
+                        .join(InventoryItem, InventoryItem.id == RfidTag.inventory_item_id)
+                        .where(
+                            or_(
+                                InventoryItem.serial_number.ilike(search_like),
+                                InventoryItem.asset_tag.ilike(search_like),
+                            )
+                        ),
+                    )
                 )
             )
 
@@ -108,10 +256,7 @@ class SqlAlchemyRfidRepository:
 
         stmt = (
             select(RfidTag)
-            .options(
-                selectinload(RfidTag.inventory_item).selectinload(InventoryItem.product),
-                selectinload(RfidTag.detections),
-            )
+            .options(selectinload(RfidTag.inventory_item).selectinload(InventoryItem.product))
             .order_by(RfidTag.last_seen_at.desc())
         )
         if conditions:
@@ -143,6 +288,7 @@ class SqlAlchemyRfidRepository:
         )
         self._db.add(tag)
         self._db.flush()
+        self._invalidate_epcs(tag.epc)
 
         tag = self._load_tag(tag.id)
         return self._serialize_tag(tag)
@@ -151,16 +297,18 @@ class SqlAlchemyRfidRepository:
         tags = self._db.scalars(
             select(RfidTag)
             .where(RfidTag.status == 'UNKNOWN')
-            .options(selectinload(RfidTag.detections))
+            .options(selectinload(RfidTag.inventory_item).selectinload(InventoryItem.product))
             .order_by(RfidTag.last_seen_at.desc())
         ).all()
         return [self._serialize_tag(tag) for tag in tags]
 
-    def get_tag(self, tag_id: str) -> dict:
+    def get_tag(self, tag_id: str, before: str | None = None) -> dict:
         tag = self._load_tag(tag_id)
         if not tag:
             raise TagNotFoundError('Tag RFID no encontrado')
-        return self._serialize_tag(tag, include_deep=True)
+        payload = self._serialize_tag(tag)
+        payload['detections'], payload['detectionsCursor'] = self._recent_detections(tag_id, before)
+        return payload
 
     def update_tag(self, tag_id: str, payload: dict) -> dict:
         tag = self._db.get(RfidTag, tag_id)
@@ -171,11 +319,13 @@ class SqlAlchemyRfidRepository:
         if duplicate:
             raise DuplicateEpcError('Ya existe un tag con ese EPC')
 
+        previous_epc = tag.epc
         tag.epc = payload['epc']
         tag.tid = payload.get('tid')
         tag.inventory_item_id = payload.get('inventoryItemId')
         tag.status = 'ENROLLED' if payload.get('inventoryItemId') else payload.get('status', 'UNASSIGNED')
         self._db.flush()
+        self._invalidate_epcs(previous_epc, tag.epc)
 
         tag = self._load_tag(tag_id)
         return self._serialize_tag(tag)
@@ -187,6 +337,7 @@ class SqlAlchemyRfidRepository:
 
         self._db.delete(tag)
         self._db.flush()
+        self._invalidate_epcs(tag.epc)
         return {'success': True}
 
     def enroll_tag(self, tag_id: str, inventory_item_id: str) -> dict:
@@ -208,6 +359,7 @@ class SqlAlchemyRfidRepository:
         tag.inventory_item_id = inventory_item_id
         tag.status = 'ENROLLED'
         self._db.flush()
+        self._invalidate_epcs(tag.epc)
 
         tag = self._load_tag(tag_id)
         return self._serialize_tag(tag)
@@ -220,6 +372,7 @@ class SqlAlchemyRfidRepository:
         tag.inventory_item_id = None
         tag.status = 'UNASSIGNED'
         self._db.flush()
+        self._invalidate_epcs(tag.epc)
 
         tag = self._load_tag(tag_id)
         return self._serialize_tag(tag)
@@ -232,20 +385,54 @@ class SqlAlchemyRfidRepository:
             conditions.append(RfidDetection.reader_id == filters.reader_id)
         if filters.direction in {'IN', 'OUT'}:
             conditions.append(RfidDetection.direction == filters.direction)
+        # Los filtros por `timestamp` permiten a PostgreSQL descartar particiones enteras.
+        if filters.since:
+            conditions.append(RfidDetection.timestamp >= filters.since)
+        if filters.until:
+            conditions.append(RfidDetection.timestamp < filters.until)
 
-        stmt = select(RfidDetection).options(
-            selectinload(RfidDetection.rfid_tag).selectinload(RfidTag.inventory_item).selectinload(InventoryItem.product)
+        stmt = (
+            select(RfidDetection)
+            .where(*conditions)
+            .options(
+                selectinload(RfidDetection.rfid_tag).selectinload(RfidTag.inventory_item).selectinload(InventoryItem.product)
+            )
         )
-        count_stmt = select(func.count(RfidDetection.id))
 
-        if conditions:
-            stmt = stmt.where(and_(*conditions))
-            count_stmt = count_stmt.where(and_(*conditions))
+        newest_first = (RfidDetection.timestamp.desc(), RfidDetection.id.desc())
+        direction = 'next'
+        if filters.cursor:
+            # Keyset sobre `(timestamp, id)`: el costo de una página no depende de su profundidad.
+            try:
+                cursor_time, cursor_id, direction = decode_cursor(filters.cursor)
+            except ValueError:
+                raise InvalidCursorError('Cursor de detecciones invalido') from None
+            key = tuple_(RfidDetection.timestamp, RfidDetection.id)
+            if direction == 'next':
+                stmt = stmt.where(key < tuple_(cursor_time, cursor_id)).order_by(*newest_first)
+            else:
+                stmt = stmt.where(key > tuple_(cursor_time, cursor_id)).order_by(
+                    RfidDetection.timestamp.asc(), RfidDetection.id.asc()
+                )
+            stmt = stmt.limit(filters.limit + 1)
+        else:
+            stmt = stmt.order_by(*newest_first).limit(filters.limit + 1).offset(filters.offset)
 
-        stmt = stmt.order_by(RfidDetection.timestamp.desc()).limit(filters.limit).offset(filters.offset)
+        rows = self._db.scalars(stmt).all()
+        has_more = len(rows) > filters.limit
+        detections = rows[: filters.limit]
+        if direction == 'prev':
+            detections.reverse()
+        # Hay páginas más recientes si se llegó con cursor `next` o con `offset`, o si
+        # la consulta hacia atrás (`prev`) devolvió filas de sobra; simétrico para `next`.
+        has_newer = has_more if direction == 'prev' else bool(filters.cursor or filters.offset)
+        has_older = has_more if direction == 'next' else True
 
-        detections = self._db.scalars(stmt).all()
-        total = self._db.scalar(count_stmt) or 0
+        # El `COUNT(*)` exacto recorre todas las filas filtradas: solo bajo pedido.
+        if filters.include_total:
+            total = self._db.scalar(select(func.count()).select_from(RfidDetection).where(*conditions)) or 0
+        else:
+            total = self._estimate_rows(select(RfidDetection.id).where(*conditions))
 
         return {
             'detections': [
@@ -257,6 +444,10 @@ class SqlAlchemyRfidRepository:
                     'rssi': detection.rssi,
                     'direction': detection.direction,
                     'timestamp': detection.timestamp,
+                    'lastSeenAt': detection.last_seen_at,
+                    'readCount': detection.read_count,
+                    'rssiMax': detection.rssi_max,
+                    'rssiAvg': detection.rssi_avg,
                     'rfidTag': {
                         'id': detection.rfid_tag.id,
                         'epc': detection.rfid_tag.epc,
@@ -281,54 +472,666 @@ class SqlAlchemyRfidRepository:
                 for detection in detections
             ],
             'total': total,
+            'totalExact': filters.include_total,
             'limit': filters.limit,
             'offset': filters.offset,
+            'nextCursor': encode_cursor(detections[-1].timestamp, detections[-1].id) if detections and has_older else None,
+            'prevCursor': encode_cursor(detections[0].timestamp, detections[0].id, 'prev')
+            if detections and has_newer
+            else None,
+        }
+
+    def _estimate_rows(self, stmt) -> int:
+        """Filas estimadas por el planificador (`EXPLAIN`) sin ejecutar la consulta."""
+        compiled = stmt.compile(dialect=self._db.get_bind().dialect)
+        plan = self._db.connection().exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}', compiled.params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def list_activity(self, filters: ActivityFilters) -> dict:
+        bucket = func.date_trunc(filters.granularity, RfidDetectionRollup.bucket).label('bucket')
+        conditions = [
+            RfidDetectionRollup.bucket >= _hour_bucket(filters.since),
+            RfidDetectionRollup.bucket < filters.until,
+        ]
+        if filters.rfid_tag_id:
+            conditions.append(RfidDetectionRollup.rfid_tag_id == filters.rfid_tag_id)
+        if filters.reader_id:
+            conditions.append(RfidDetectionRollup.reader_id == filters.reader_id)
+
+        rows = self._db.execute(
+            select(
+                bucket,
+                RfidDetectionRollup.reader_id,
+                func.sum(RfidDetectionRollup.read_count),
+                func.count(distinct(RfidDetectionRollup.rfid_tag_id)),
+                func.min(RfidDetectionRollup.first_seen_at),
+                func.max(RfidDetectionRollup.last_seen_at),
+                func.min(RfidDetectionRollup.rssi_min),
+                func.max(RfidDetectionRollup.rssi_max),
+                func.sum(RfidDetectionRollup.rssi_sum),
+                func.sum(RfidDetectionRollup.rssi_reads),
+            )
+            .where(and_(*conditions))
+            .group_by(bucket, RfidDetectionRollup.reader_id)
+            .order_by(bucket, RfidDetectionRollup.reader_id)
+        ).all()
+
+        buckets = [
+            {
+                'bucket': bucket_start,
+                'readerId': reader_id,
+                'readCount': int(read_count),
+                'tagCount': tag_count,
+                'firstSeenAt': first_seen,
+                'lastSeenAt': last_seen,
+                'rssiMin': rssi_min,
+                'rssiMax': rssi_max,
+                'rssiAvg': float(rssi_sum) / int(rssi_reads) if rssi_reads else None,
+            }
+            for bucket_start, reader_id, read_count, tag_count, first_seen, last_seen, rssi_min, rssi_max, rssi_sum, rssi_reads in rows
+        ]
+        return {
+            'granularity': filters.granularity,
+            'since': filters.since,
+            'until': filters.until,
+            'readCount': sum(row['readCount'] for row in buckets),
+            'buckets': buckets,
+        }
+
+    def backfill_rollups(self, since: datetime, until: datetime) -> int:
+        """Reemplaza los agregados de `[since, until)` (horas completas) con datos de `rfid_detections`.
+
+        Las detecciones agrupadas por antirrebote se atribuyen completas a la hora de su
+        `timestamp` (la ingesta en vivo reparte por hora de cada lectura) y solo guardan
+        RSSI inicial, máximo y promedio: el mínimo se aproxima con el RSSI inicial.
+
+        El rango empieza en la hora de la detección más antigua que sigue en la tabla:
+        antes de ella las particiones ya se purgaron o desacoplaron y los agregados son
+        el único historial, así que no se tocan.
+        """
+        since, until = _hour_bucket(since), _hour_bucket(until)
+        oldest = self._db.scalar(
+            select(func.min(RfidDetection.timestamp)).where(RfidDetection.timestamp >= since, RfidDetection.timestamp < until)
+        )
+        if oldest is None:
+            return 0
+        since = _hour_bucket(oldest)
+        self._db.execute(
+            delete(RfidDetectionRollup)
+            .where(RfidDetectionRollup.bucket >= since, RfidDetectionRollup.bucket < until)
+            .execution_options(synchronize_session=False)
+        )
+        rssi_reads = case((RfidDetection.rssi.is_(None), 0), else_=RfidDetection.read_count)
+        rssi_sum = func.coalesce(func.round(RfidDetection.rssi_avg * RfidDetection.read_count), RfidDetection.rssi, 0)
+        bucket = func.date_trunc('hour', RfidDetection.timestamp)
+        result = self._db.execute(
+            pg_insert(RfidDetectionRollup).from_select(
+                [
+                    RfidDetectionRollup.rfid_tag_id,
+                    RfidDetectionRollup.reader_id,
+                    RfidDetectionRollup.bucket,
+                    RfidDetectionRollup.read_count,
+                    RfidDetectionRollup.first_seen_at,
+                    RfidDetectionRollup.last_seen_at,
+                    RfidDetectionRollup.rssi_min,
+                    RfidDetectionRollup.rssi_max,
+                    RfidDetectionRollup.rssi_sum,
+                    RfidDetectionRollup.rssi_reads,
+                ],
+                select(
+                    RfidDetection.rfid_tag_id,
+                    RfidDetection.reader_id,
+                    bucket,
+                    func.sum(RfidDetection.read_count),
+                    func.min(RfidDetection.timestamp),
+                    func.max(func.coalesce(RfidDetection.last_seen_at, RfidDetection.timestamp)),
+                    func.min(RfidDetection.rssi),
+                    func.max(func.coalesce(RfidDetection.rssi_max, RfidDetection.rssi)),
+                    func.sum(rssi_sum),
+                    func.sum(rssi_reads),
+                )
+                .where(RfidDetection.timestamp >= since, RfidDetection.timestamp < until)
+                .group_by(RfidDetection.rfid_tag_id, RfidDetection.reader_id, bucket),
+            )
+            .returning(RfidDetectionRollup.bucket)
+        )
+        return len(result.all())
+
+    def save_reader_stats(self, rows: list[dict]) -> None:
+        """Vuelca el estado de los lectores: suma los deltas de contadores y reemplaza las métricas.
+
+        Cada proceso vuelca solo lo acumulado desde su último volcado, así que los
+        totales de varios workers se suman sin pisarse.
+        """
+        if not rows:
+            return
+        readers = unnest_rows(
+            'reader_rows',
+            {
+                'id': String,
+                'name': String,
+                'first_seen_at': DateTime(timezone=True),
+                'last_seen_at': DateTime(timezone=True),
+                'batches': BigInteger,
+                'reads': BigInteger,
+                'unknown_reads': BigInteger,
+                'errors': BigInteger,
+                'reads_per_second': Float,
+                'p50': Float,
+                'p95': Float,
+                'p99': Float,
+            },
+            [
+                (
+                    row['readerId'],
+                    row['readerName'],
+                    row['firstSeenAt'],
+                    row['lastSeenAt'],
+                    row['batchesDelta'],
+                    row['readsDelta'],
+                    row['unknownReadsDelta'],
+                    row['errorsDelta'],
+                    row['readsPerSecond'],
+                    row['latencyMs']['p50'],
+                    row['latencyMs']['p95'],
+                    row['latencyMs']['p99'],
+                )
+                for row in sorted(rows, key=lambda row: row['readerId'])
+            ],
+        )
+        stmt = pg_insert(RfidReader).from_select(
+            [
+                RfidReader.id,
+                RfidReader.name,
+                RfidReader.first_seen_at,
+                RfidReader.last_seen_at,
+                RfidReader.total_batches,
+                RfidReader.total_reads,
+                RfidReader.unknown_reads,
+                RfidReader.errors,
+                RfidReader.reads_per_second,
+                RfidReader.latency_p50_ms,
+                RfidReader.latency_p95_ms,
+                RfidReader.latency_p99_ms,
+            ],
+            select(readers),
+        )
+        self._db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[RfidReader.id],
+                set_={
+                    'name': func.coalesce(stmt.excluded.name, RfidReader.name),
+                    'firstSeenAt': func.least(RfidReader.first_seen_at, stmt.excluded.firstSeenAt),
+                    'lastSeenAt': func.greatest(RfidReader.last_seen_at, stmt.excluded.lastSeenAt),
+                    'totalBatches': RfidReader.total_batches + stmt.excluded.totalBatches,
+                    'totalReads': RfidReader.total_reads + stmt.excluded.totalReads,
+                    'unknownReads': RfidReader.unknown_reads + stmt.excluded.unknownReads,
+                    'errors': RfidReader.errors + stmt.excluded.errors,
+                    'readsPerSecond': stmt.excluded.readsPerSecond,
+                    'latencyP50Ms': stmt.excluded.latencyP50Ms,
+                    'latencyP95Ms': stmt.excluded.latencyP95Ms,
+                    'latencyP99Ms': stmt.excluded.latencyP99Ms,
+                    'updatedAt': func.now(),
+                },
+            )
+        )
+
+    def _resolve_tags(self, epcs: set[str]) -> tuple[dict[str, _TagSnapshot], dict[str, tuple[CachedTag | None, int]]]:
+        """Resuelve los EPC del lote: primero en caché y el resto con una sola consulta.
+
+        Devuelve además, por EPC, la entrada de caché de la que salió (None si no
+        venía de caché) y la generación de la caché al resolverlo.
+        """
+        if not self._epc_cache:
+            return self._fetch_tags(epcs), {}
+
+        generation = self._epc_cache.generation()
+        origins: dict[str, tuple[CachedTag | None, int]] = dict.fromkeys(epcs, (None, generation))
+        # Lo que ya escribió esta transacción manda sobre la caché (aún sin confirmar).
+        pending = {epc: self._pending_tags[epc] for epc in epcs if epc in self._pending_tags}
+        cached, _, missing = self._epc_cache.get_many(epcs - set(pending))
+        origins.update((epc, (entry, generation)) for epc, entry in cached.items())
+        origins.update((epc, (entry.cached, entry.generation)) for epc, entry in pending.items())
+        cached.update((epc, entry.entry) for epc, entry in pending.items())
+        tags = {
+            epc: _TagSnapshot(
+                id=entry.id,
+                tid=entry.tid,
+                status=entry.status,
+                inventory_item_id=entry.inventory_item_id,
+                item_status=entry.item_status,
+            )
+            for epc, entry in cached.items()
         }
+        if missing:
+            fetched = self._fetch_tags(missing)
+            tags.update(fetched)
+            for epc in missing - set(fetched):
+                self._epc_cache.put_absent(epc, generation)
+        return tags, origins
+
+    def _fetch_tags(self, epcs: set[str]) -> dict[str, _TagSnapshot]:
+        """Resuelve EPC en base de datos con una sola consulta `epc = ANY(:epcs)`."""
+        if not epcs:
+            return {}
+        rows = self._db.execute(
+            select(RfidTag.id, RfidTag.epc, RfidTag.tid, RfidTag.status, RfidTag.inventory_item_id, InventoryItem.status)
+            .outerjoin(InventoryItem, InventoryItem.id == RfidTag.inventory_item_id)
+            .where(RfidTag.epc == any_(array_param(list(epcs), String)))
+        ).all()
+        return {
+            epc: _TagSnapshot(id=tag_id, tid=tid, status=status, inventory_item_id=item_id, item_status=item_status)
+            for tag_id, epc, tid, status, item_id, item_status in rows
+        }
+
+    def _insert_unknown_tags(self, first_reads: dict[str, tuple[dict, datetime]]) -> dict[str, _TagSnapshot]:
+        """Crea los EPC desconocidos con un único `INSERT ... ON CONFLICT (epc) DO NOTHING`.
+
+        Los EPC que otra transacción haya creado en paralelo no vuelven en `RETURNING`;
+        esos se resuelven de nuevo y se tratan como tags existentes.
+        """
+        new_tags = {
+            epc: _TagSnapshot(id=str(uuid4()), tid=read.get('tid'), status='UNKNOWN', last_seen_at=detection_time, is_new=True)
+            for epc, (read, detection_time) in first_reads.items()
+        }
+        rows = unnest_rows(
+            'new_tags',
+            {'id': String, 'epc': String, 'tid': String, 'seen_at': DateTime(timezone=True)},
+            [(tag.id, epc, tag.tid, tag.last_seen_at) for epc, tag in new_tags.items()],
+        )
+        inserted = self._db.execute(
+            pg_insert(RfidTag)
+            .from_select(
+                [RfidTag.id, RfidTag.epc, RfidTag.tid, RfidTag.status, RfidTag.first_seen_at, RfidTag.last_seen_at],
+                select(rows.c.id, rows.c.epc, rows.c.tid, literal('UNKNOWN'), rows.c.seen_at, rows.c.seen_at),
+            )
+            .on_conflict_do_nothing(index_elements=['epc'])
+            .returning(RfidTag.epc)
+        ).scalars()
+
+        tags = {epc: new_tags[epc] for epc in inserted}
+        tags.update(self._fetch_tags(set(first_reads) - set(tags)))
+        return tags
+
+    def _update_seen_tags(self, tags: list[_TagSnapshot], reader_id: str, new_detections: dict[str, int]) -> None:
+        """Actualiza `lastSeenAt`/`tid`/contadores de los tags leídos con un solo `UPDATE ... FROM unnest(...)`."""
+        if not tags:
+            return
+        rows = unnest_rows(
+            'seen_tags',
+            {'id': String, 'seen_at': DateTime(timezone=True), 'tid': String, 'new_detections': Integer},
+            [(tag.id, tag.last_seen_at, tag.tid, new_detections.get(tag.id, 0)) for tag in tags],
+        )
+        self._db.execute(
+            update(RfidTag)
+            .where(RfidTag.id == rows.c.id)
+            .values(
+                last_seen_at=rows.c.seen_at,
+                tid=func.coalesce(RfidTag.tid, rows.c.tid),
+                detection_count=RfidTag.detection_count + rows.c.new_detections,
+                last_reader_id=reader_id,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    def _upsert_detections(self, payload: dict, windows: list[tuple[DebounceWindow, str | None]]) -> None:
+        """Escribe las detecciones (ventanas de antirrebote) del lote en una sola sentencia.
+
+        Las ventanas abiertas en este lote se insertan; las que continúan una ventana de
+        un lote anterior chocan por `(id, timestamp)` (el inicio de la ventana no cambia)
+        y solo actualizan sus agregados. Si la fila no existe (p. ej. el lote que la
+        abrió hizo rollback) se vuelve a insertar.
+        """
+        rows = unnest_rows(
+            'detection_windows',
+            {
+                'id': String,
+                'rfid_tag_id': String,
+                'reader_id': String,
+                'reader_name': String,
+                'rssi': Integer,
+                'direction': String,
+                'timestamp': DateTime(timezone=True),
+                'last_seen_at': DateTime(timezone=True),
+                'read_count': Integer,
+                'rssi_max': Integer,
+                'rssi_avg': Float,
+            },
+            [
+                (
+                    window.detection_id,
+                    window.rfid_tag_id,
+                    payload['readerId'],
+                    payload.get('readerName'),
+                    window.rssi,
+                    direction,
+                    window.first_seen,
+                    window.last_seen,
+                    window.read_count,
+                    window.rssi_max,
+                    window.rssi_avg,
+                )
+                for window, direction in windows
+            ],
+        )
+        stmt = pg_insert(RfidDetection).from_select(
+            [
+                RfidDetection.id,
+                RfidDetection.rfid_tag_id,
+                RfidDetection.reader_id,
+                RfidDetection.reader_name,
+                RfidDetection.rssi,
+                RfidDetection.direction,
+                RfidDetection.timestamp,
+                RfidDetection.last_seen_at,
+                RfidDetection.read_count,
+                RfidDetection.rssi_max,
+                RfidDetection.rssi_avg,
+            ],
+            select(rows),
+        )
+        # `GREATEST` mantiene los agregados monótonos si dos transacciones escriben la
+        # misma ventana en orden inverso.
+        self._db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[RfidDetection.id, RfidDetection.timestamp],
+                set_={
+                    'lastSeenAt': func.greatest(RfidDetection.last_seen_at, stmt.excluded.lastSeenAt),
+                    'readCount': func.greatest(RfidDetection.read_count, stmt.excluded.readCount),
+                    'rssiMax': func.greatest(RfidDetection.rssi_max, stmt.excluded.rssiMax),
+                    'rssiAvg': stmt.excluded.rssiAvg,
+                },
+            )
+        )
+
+    def _upsert_rollups(self, reader_id: str, rollups: dict[tuple[str, datetime], _RollupAggregate]) -> None:
+        """Suma el lote a `rfid_detection_rollups` con un solo `INSERT ... ON CONFLICT DO UPDATE`.
+
+        Las filas van ordenadas por clave para que dos lotes concurrentes bloqueen en
+        el mismo orden y no se produzcan deadlocks.
+        """
+        rows = unnest_rows(
+            'rollup_rows',
+            {
+                'rfid_tag_id': String,
+                'reader_id': String,
+                'bucket': DateTime(timezone=True),
+                'read_count': Integer,
+                'first_seen_at': DateTime(timezone=True),
+                'last_seen_at': DateTime(timezone=True),
+                'rssi_min': Integer,
+                'rssi_max': Integer,
+                'rssi_sum': BigInteger,
+                'rssi_reads': Integer,
+            },
+            [
+                (
+                    tag_id,
+                    reader_id,
+                    bucket,
+                    rollup.read_count,
+                    rollup.first_seen,
+                    rollup.last_seen,
+                    rollup.rssi_min,
+                    rollup.rssi_max,
+                    rollup.rssi_sum,
+                    rollup.rssi_reads,
+                )
+                for (tag_id, bucket), rollup in sorted(rollups.items())
+            ],
+        )
+        stmt = pg_insert(RfidDetectionRollup).from_select(
+            [
+                RfidDetectionRollup.rfid_tag_id,
+                RfidDetectionRollup.reader_id,
+                RfidDetectionRollup.bucket,
+                RfidDetectionRollup.read_count,
+                RfidDetectionRollup.first_seen_at,
+                RfidDetectionRollup.last_seen_at,
+                RfidDetectionRollup.rssi_min,
+                RfidDetectionRollup.rssi_max,
+                RfidDetectionRollup.rssi_sum,
+                RfidDetectionRollup.rssi_reads,
+            ],
+            select(rows),
+        )
+        self._db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[RfidDetectionRollup.rfid_tag_id, RfidDetectionRollup.reader_id, RfidDetectionRollup.bucket],
+                set_={
+                    'readCount': RfidDetectionRollup.read_count + stmt.excluded.readCount,
+                    'firstSeenAt': func.least(RfidDetectionRollup.first_seen_at, stmt.excluded.firstSeenAt),
+                    'lastSeenAt': func.greatest(RfidDetectionRollup.last_seen_at, stmt.excluded.lastSeenAt),
+                    'rssiMin': func.least(RfidDetectionRollup.rssi_min, stmt.excluded.rssiMin),
+                    'rssiMax': func.greatest(RfidDetectionRollup.rssi_max, stmt.excluded.rssiMax),
+                    'rssiSum': RfidDetectionRollup.rssi_sum + stmt.excluded.rssiSum,
+                    'rssiReads': RfidDetectionRollup.rssi_reads + stmt.excluded.rssiReads,
+                },
+            )
+        )
+
+    def _apply_inventory_transitions(self, reader_id: str, transitions: dict[str, tuple[str, str]]) -> None:
+        """Aplica los cambios de estado de inventario del lote y los registra en el historial.
+
+        `transitions` es `{item_id: (estado_final, detection_id)}`. Se envía el estado
+        final de cada item leído con dirección (no solo los que parecen cambiar): el
+        estado de partida puede venir de la caché y el filtro `status <> nuevo` en la
+        base evita escrituras innecesarias. Un solo `UPDATE ... RETURNING` devuelve los
+        items que de verdad cambiaron con su estado anterior, y todos sus movimientos
+        `RFID_CHECK_IN`/`RFID_CHECK_OUT` se insertan en una sola sentencia.
+        """
+        if not transitions:
+            return
+        rows = unnest_rows(
+            'item_transitions',
+            {'id': String, 'status': String, 'detection_id': String},
+            [(item_id, status, detection_id) for item_id, (status, detection_id) in transitions.items()],
+        )
+        # En `UPDATE ... FROM` la otra referencia a la tabla ve la fila antes del cambio.
+        previous = aliased(InventoryItem)
+        changed = self._db.execute(
+            update(InventoryItem)
+            .where(
+                InventoryItem.id == rows.c.id,
+                previous.id == InventoryItem.id,
+                InventoryItem.status != rows.c.status,
+            )
+            .values(status=rows.c.status)
+            .returning(InventoryItem.id, previous.status, rows.c.status, InventoryItem.location, rows.c.detection_id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if not changed:
+            return
+        # Sin invalidar la caché del resumen: con ingesta continua se vaciaría en cada
+        # lote; el resumen refleja estos cambios al vencer su TTL (segundos).
+        deltas = Counter()
+        for _, from_status, to_status, _, _ in changed:
+            deltas.update(status_deltas(from_status, to_status))
+        apply_summary_deltas(self._db, deltas)
+        if self._system_user_email:
+            self._insert_rfid_movements(reader_id, changed)
+
+    def _insert_rfid_movements(self, reader_id: str, changed: list) -> None:
+        movements = unnest_rows(
+            'rfid_movements',
+            {
+                'id': String,
+                'item_id': String,
+                'from_status': String,
+                'to_status': String,
+                'location': String,
+                'detection_id': String,
+            },
+            [(str(uuid4()), *row) for row in changed],
+        )
+        type_expr = case((movements.c.to_status == 'IN', literal('RFID_CHECK_IN')), else_=literal('RFID_CHECK_OUT'))
+        recorded = self._db.scalars(
+            pg_insert(InventoryMovement)
+            .from_select(
+                [
+                    InventoryMovement.id,
+                    InventoryMovement.inventory_item_id,
+                    InventoryMovement.type,
+                    InventoryMovement.from_status,
+                    InventoryMovement.to_status,
+                    InventoryMovement.from_location,
+                    InventoryMovement.to_location,
+                    InventoryMovement.reason,
+                    InventoryMovement.reference,
+                    InventoryMovement.performed_by,
+                ],
+                select(
+                    movements.c.id,
+                    movements.c.item_id,
+                    type_expr,
+                    movements.c.from_status,
+                    movements.c.to_status,
+                    movements.c.location,
+                    movements.c.location,
+                    literal(f'Lectura RFID ({reader_id})'),
+                    movements.c.detection_id,
+                    User.id,
+                )
+                .select_from(movements)
+                .join(User, User.email == self._system_user_email),
+            )
+            .returning(InventoryMovement.inventory_item_id)
+        ).all()
+        if not recorded:
+            logger.warning(
+                'No existe el usuario de sistema RFID %s: %d cambios de estado sin movimiento',
+                self._system_user_email,
+                len(changed),
+            )
+            return
+        self._db.execute(
+            update(InventoryItem)
+            .where(InventoryItem.id == any_(array_param(recorded, String)))
+            .values(movement_count=InventoryItem.movement_count + 1)
+            .execution_options(synchronize_session=False)
+        )
 
     def process_read(self, payload: dict, api_key: str) -> dict:
         if payload['apiKey'] != api_key:
             raise InvalidApiKeyError('API key invalida')
 
-        results = []
-        for read in payload['reads']:
-            detection_time = self._parse_timestamp(read.get('timestamp'))
+        reads = [(read, self._parse_timestamp(read.get('timestamp'))) for read in payload['reads']]
+        if not reads:
+            return {'success': True, 'processed': 0, 'results': []}
 
-            tag = self._db.scalar(select(RfidTag).where(RfidTag.epc == read['epc']).options(selectinload(RfidTag.inventory_item)))
-            is_new = False
-            inventory_updated = False
+        try:
+            return self._ingest(payload, reads)
+        except IntegrityError:
+            # Solo ocurre si la caché apuntaba a un tag que otro proceso borró: se
+            # descarta la caché para que el reintento del lector resuelva en base de datos.
+            if self._epc_cache:
+                self._epc_cache.clear()
+            raise
+
+    def confirm_reads(self) -> None:
+        """Tras el commit, publica en la caché los tags y estados que dejó la transacción.
 
-            if not tag:
-                tag = RfidTag(
-                    id=str(uuid4()),
-                    epc=read['epc'],
-                    tid=read.get('tid'),
-                    status='UNKNOWN',
-                    first_seen_at=detection_time,
-                    last_seen_at=detection_time,
+        Solo se publica lo leído de la base o cambiado aquí; lo que venía de caché
+        conserva su vencimiento, y nada se publica si se invalidó tras resolverlo.
+        """
+        if self._epc_cache:
+            for epc, pending in self._pending_tags.items():
+                self._epc_cache.put(
+                    epc,
+                    pending.entry,
+                    generation=pending.generation,
+                    keep_expiry=pending.cached is not None,
                 )
-                self._db.add(tag)
-                self._db.flush()
-                is_new = True
+        self._reset_read_state()
+
+    def discard_reads(self) -> None:
+        """Tras un rollback, olvida el estado en memoria que apuntaba a filas revertidas.
+
+        Los tags insertados y los estados de item cambiados nunca llegan a la caché; se
+        invalidan además esos EPC por si tenían una entrada anterior, y las ventanas de
+        antirrebote y de dirección tocadas vuelven a empezar.
+        """
+        if self._epc_cache:
+            for epc in self._pending_tags:
+                self._epc_cache.invalidate(epc)
+        self._debouncer.forget(self._debounce_keys)
+        if self._direction_engine:
+            self._direction_engine.forget(self._direction_epcs)
+        self._reset_read_state()
+
+    def _reset_read_state(self) -> None:
+        self._pending_tags = {}
+        self._debounce_keys = set()
+        self._direction_epcs = set()
+
+    def _ingest(self, payload: dict, reads: list[tuple[dict, datetime]]) -> dict:
+        tags, origins = self._resolve_tags({read['epc'] for read, _ in reads})
+
+        first_reads: dict[str, tuple[dict, datetime]] = {}
+        for read, detection_time in reads:
+            if read['epc'] not in tags:
+                first_reads.setdefault(read['epc'], (read, detection_time))
+        if first_reads:
+            tags.update(self._insert_unknown_tags(first_reads))
+
+        # El lote se recorre en orden para reproducir la semántica lectura a lectura
+        # (primer/último visto, `isNew`, `inventoryUpdated`), pero la escritura se
+        # acumula y se envía en pocas sentencias al final.
+        item_statuses = {tag.inventory_item_id: tag.item_status for tag in tags.values() if tag.inventory_item_id}
+        target_statuses: dict[str, tuple[str, str]] = {}
+        windows: dict[str, tuple[DebounceWindow, str | None]] = {}
+        rollups: dict[tuple[str, datetime], _RollupAggregate] = {}
+        new_detections: dict[str, int] = {}
+        results = []
+        for read, detection_time in reads:
+            tag = tags[read['epc']]
+            is_new = tag.is_new
+            inventory_updated = False
+
+            if is_new:
+                tag.is_new = False
             else:
                 tag.last_seen_at = detection_time
                 if read.get('tid') and not tag.tid:
                     tag.tid = read.get('tid')
 
-            detection = RfidDetection(
-                id=str(uuid4()),
-                rfid_tag_id=tag.id,
-                reader_id=payload['readerId'],
-                reader_name=payload.get('readerName'),
-                rssi=read.get('rssi'),
-                direction=read.get('direction'),
-                timestamp=detection_time,
+            debounce_key = (read['epc'], payload['readerId'], read.get('direction'))
+            self._debounce_keys.add(debounce_key)
+            window, opened = self._debouncer.observe(
+                debounce_key,
+                tag.id,
+                detection_time,
+                read.get('rssi'),
             )
-            self._db.add(detection)
+            windows[window.detection_id] = (window, read.get('direction'))
+            if opened:
+                # Solo las ventanas nuevas son detecciones nuevas; las que continúan
+                # una ventana ya registrada solo actualizan sus agregados.
+                new_detections[tag.id] = new_detections.get(tag.id, 0) + 1
+            rollup_key = (tag.id, _hour_bucket(detection_time))
+            if rollup_key not in rollups:
+                rollups[rollup_key] = _RollupAggregate(first_seen=detection_time, last_seen=detection_time)
+            rollups[rollup_key].add(detection_time, read.get('rssi'))
 
-            if tag.status == 'ENROLLED' and tag.inventory_item and read.get('direction') in {'IN', 'OUT'}:
-                new_status = 'IN' if read.get('direction') == 'IN' else 'OUT'
-                if tag.inventory_item.status != new_status:
-                    tag.inventory_item.status = new_status
+            item_id = tag.inventory_item_id
+            direction = read.get('direction')
+            if tag.status == 'ENROLLED' and item_id and self._direction_engine:
+                self._direction_epcs.add(read['epc'])
+                direction = self._direction_engine.effective_direction(
+                    read['epc'],
+                    payload['readerId'],
+                    read.get('antenna'),
+                    direction,
+                    read.get('rssi'),
+                    detection_time,
+                )
+            if tag.status == 'ENROLLED' and item_id and item_statuses.get(item_id) and direction in {'IN', 'OUT'}:
+                new_status = 'IN' if direction == 'IN' else 'OUT'
+                target_statuses[item_id] = (new_status, window.detection_id)
+                if item_statuses[item_id] != new_status:
+                    item_statuses[item_id] = new_status
                     inventory_updated = True
 
             results.append(
@@ -337,10 +1140,30 @@ class SqlAlchemyRfidRepository:
                     'tagId': tag.id,
                     'status': tag.status,
                     'isNew': is_new,
-                    'inventoryItemId': tag.inventory_item_id,
+                    'inventoryItemId': item_id,
                     'inventoryUpdated': inventory_updated,
                 }
             )
 
-        self._db.flush()
+        self._upsert_detections(payload, list(windows.values()))
+        self._update_seen_tags(list(tags.values()), payload['readerId'], new_detections)
+        self._upsert_rollups(payload['readerId'], rollups)
+        self._apply_inventory_transitions(payload['readerId'], target_statuses)
+
+        # Los tags creados y los estados cambiados aquí solo van a la caché tras el commit
+        # (`confirm_reads`): si la transacción se revierte, no existen. Un acierto de
+        # caché que no cambió no se vuelve a publicar.
+        for epc, tag in tags.items():
+            if epc not in origins:
+                continue
+            cached, generation = origins[epc]
+            entry = CachedTag(
+                id=tag.id,
+                tid=tag.tid,
+                status=tag.status,
+                inventory_item_id=tag.inventory_item_id,
+                item_status=item_statuses.get(tag.inventory_item_id) if tag.inventory_item_id else None,
+            )
+            if entry != cached or epc in self._pending_tags:
+                self._pending_tags[epc] = _PendingTag(entry=entry, generation=generation, cached=cached)
         return {'success': True, 'processed': len(results), 'results': results}
@@ -0,0 +1,107 @@
+"""Registro en proceso de conexiones de ingesta RFID por streaming.
+
+Cada lector conectado a `/rfid/read/stream` tiene contadores propios (mensajes,
+lecturas, confirmaciones, errores y latencia de persistencia) para ver el
+rendimiento por conexión sin tocar la base de datos.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from threading import Lock
+from uuid import uuid4
+
+
+@dataclass(slots=True)
+class _StreamConnection:
+    id: str
+    reader_id: str
+    reader_name: str | None
+    connected_at: datetime
+    started: float
+    messages: int = 0
+    reads: int = 0
+    processed: int = 0
+    acks: int = 0
+    errors: int = 0
+    ack_ms_total: float = 0.0
+    last_ack_at: datetime | None = None
+
+
+class RfidStreamRegistry:
+    def __init__(self, clock=time.monotonic) -> None:
+        self._clock = clock
+        self._lock = Lock()
+        self._connections: dict[str, _StreamConnection] = {}
+        self._closed = 0
+        self._closed_reads = 0
+
+    def open(self, reader_id: str, reader_name: str | None) -> str:
+        connection = _StreamConnection(
+            id=str(uuid4()),
+            reader_id=reader_id,
+            reader_name=reader_name,
+            connected_at=datetime.now(timezone.utc),
+            started=self._clock(),
+        )
+        with self._lock:
+            self._connections[connection.id] = connection
+        return connection.id
+
+    def record_message(self, connection_id: str, reads: int) -> None:
+        with self._lock:
+            connection = self._connections.get(connection_id)
+            if connection:
+                connection.messages += 1
+                connection.reads += reads
+
+    def record_ack(self, connection_id: str, processed: int, elapsed_ms: float) -> None:
+        with self._lock:
+            connection = self._connections.get(connection_id)
+            if connection:
+                connection.acks += 1
+                connection.processed += processed
+                connection.ack_ms_total += elapsed_ms
+                connection.last_ack_at = datetime.now(timezone.utc)
+
+    def record_error(self, connection_id: str) -> None:
+        with self._lock:
+            connection = self._connections.get(connection_id)
+            if connection:
+                connection.errors += 1
+
+    def close(self, connection_id: str) -> None:
+        with self._lock:
+            connection = self._connections.pop(connection_id, None)
+            if connection:
+                self._closed += 1
+                self._closed_reads += connection.reads
+
+    def stats(self) -> dict:
+        now = self._clock()
+        with self._lock:
+            connections = [self._serialize(connection, now) for connection in self._connections.values()]
+            return {
+                'open': len(connections),
+                'closed': self._closed,
+                'reads': self._closed_reads + sum(connection['reads'] for connection in connections),
+                'connections': connections,
+            }
+
+    @staticmethod
+    def _serialize(connection: _StreamConnection, now: float) -> dict:
+        elapsed = max(now - connection.started, 1e-9)
+        return {
+            'connectionId': connection.id,
+            'readerId': connection.reader_id,
+            'readerName': connection.reader_name,
+            'connectedAt': connection.connected_at,
+            'messages': connection.messages,
+            'reads': connection.reads,
+            'processed': connection.processed,
+            'acks': connection.acks,
+            'errors': connection.errors,
+            'readsPerSecond': connection.processed / elapsed,
+            'avgAckMs': connection.ack_ms_total / connection.acks if connection.acks else None,
+            'lastAckAt': connection.last_ack_at,
+        }
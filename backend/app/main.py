@@ -17,6 +17,8 @@ from app.api.v1.router import api_router
 from app.core.config import settings
 from app.db.session import SessionLocal
 from app.composition.bootstrap import ensure_superadmin
+from app.composition.inventory import start_inventory_maintenance, stop_inventory_maintenance
+from app.composition.rfid import start_rfid_ingestion, stop_rfid_ingestion
 
 app = FastAPI(title=settings.app_name)
 
@@ -47,6 +49,15 @@ def startup() -> None:
     run_auto_migrations()
     with SessionLocal() as db:
         ensure_superadmin(db)
+    start_rfid_ingestion()
+    start_inventory_maintenance()
+
+
+@app.on_event('shutdown')
+def shutdown() -> None:
+    """Evento de apagado: drena la cola de ingesta RFID asíncrona."""
+    stop_rfid_ingestion()
+    stop_inventory_maintenance()
 
 
 @app.exception_handler(RequestValidationError)
@@ -66,9 +77,10 @@ async def validation_exception_handler(_: Request, exc: RequestValidationError):
 @app.exception_handler(HTTPException)
 async def http_exception_handler(_: Request, exc: HTTPException):
     if isinstance(exc.detail, dict) and 'error' in exc.detail:
-        return JSONResponse(status_code=exc.status_code, content=exc.detail)
+        return JSONResponse(status_code=exc.status_code, content=exc.detail, headers=exc.headers)
     return JSONResponse(
         status_code=exc.status_code,
+        headers=exc.headers,
         content={
             'error': {
                 'code': 'HTTP_ERROR',
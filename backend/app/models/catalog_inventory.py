@@ -1,6 +1,6 @@
 """Modelos ORM de SQLAlchemy para `catalog_inventory`."""
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Numeric, String, Text
+from sqlalchemy import BigInteger, Boolean, DateTime, Float, ForeignKey, Index, Integer, Numeric, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 
@@ -101,18 +101,22 @@ class InventoryItem(Base):
     __tablename__ = 'inventory_items'
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
-    product_id: Mapped[str] = mapped_column('productId', String, ForeignKey('products.id', ondelete='RESTRICT'), nullable=False)
-    serial_number: Mapped[str | None] = mapped_column('serialNumber', String, nullable=True)
-    asset_tag: Mapped[str | None] = mapped_column('assetTag', String, nullable=True)
+    product_id: Mapped[str] = mapped_column('productId', String, ForeignKey('products.id', ondelete='RESTRICT'), nullable=False, index=True)
+    serial_number: Mapped[str | None] = mapped_column('serialNumber', String, nullable=True, index=True)
+    asset_tag: Mapped[str | None] = mapped_column('assetTag', String, nullable=True, index=True)
     type: Mapped[str] = mapped_column(String, nullable=False)
     status: Mapped[str] = mapped_column(String, nullable=False)
     condition: Mapped[str | None] = mapped_column(String, nullable=True)
     location: Mapped[str | None] = mapped_column(String, nullable=True)
-    container_id: Mapped[str | None] = mapped_column('containerId', String, ForeignKey('inventory_items.id'), nullable=True)
+    container_id: Mapped[str | None] = mapped_column('containerId', String, ForeignKey('inventory_items.id'), nullable=True, index=True)
     purchase_date: Mapped[DateTime | None] = mapped_column('purchaseDate', DateTime(timezone=True), nullable=True)
     purchase_price: Mapped[float | None] = mapped_column('purchasePrice', Numeric(10, 2), nullable=True)
     warranty_expiry: Mapped[DateTime | None] = mapped_column('warrantyExpiry', DateTime(timezone=True), nullable=True)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Contadores desnormalizados: se ajustan en la misma transacción que agrega
+    # movimientos o cambia `containerId` (reparables con `scripts/repair_inventory_counters.py`).
+    movement_count: Mapped[int] = mapped_column('movementCount', Integer, nullable=False, server_default='0')
+    contents_count: Mapped[int] = mapped_column('contentsCount', Integer, nullable=False, server_default='0')
     created_at: Mapped[DateTime] = mapped_column('createdAt', DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[DateTime] = mapped_column('updatedAt', DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -124,16 +128,23 @@ class InventoryItem(Base):
     group_links: Mapped[list['ItemGroupItem']] = relationship('ItemGroupItem', back_populates='inventory_item')
 
 
+# Listado de inventario paginado por clave `(createdAt, id)` en ambos sentidos.
+Index('ix_inventory_items_created_id', InventoryItem.created_at, InventoryItem.id)
+
+
 class RfidTag(Base):
     __tablename__ = 'rfid_tags'
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
-    epc: Mapped[str] = mapped_column(String, nullable=False)
+    epc: Mapped[str] = mapped_column(String, nullable=False, unique=True, index=True)
     tid: Mapped[str | None] = mapped_column(String, nullable=True)
-    inventory_item_id: Mapped[str | None] = mapped_column('inventoryItemId', String, ForeignKey('inventory_items.id', ondelete='SET NULL'), nullable=True)
+    inventory_item_id: Mapped[str | None] = mapped_column('inventoryItemId', String, ForeignKey('inventory_items.id', ondelete='SET NULL'), nullable=True, index=True)
     status: Mapped[str] = mapped_column(String, nullable=False)
     first_seen_at: Mapped[DateTime] = mapped_column('firstSeenAt', DateTime(timezone=True), server_default=func.now())
     last_seen_at: Mapped[DateTime] = mapped_column('lastSeenAt', DateTime(timezone=True), server_default=func.now())
+    # Contadores mantenidos por la ingesta: los listados no cargan detecciones.
+    detection_count: Mapped[int] = mapped_column('detectionCount', Integer, nullable=False, server_default='0')
+    last_reader_id: Mapped[str | None] = mapped_column('lastReaderId', String, nullable=True)
     created_at: Mapped[DateTime] = mapped_column('createdAt', DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[DateTime] = mapped_column('updatedAt', DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -143,6 +154,9 @@ class RfidTag(Base):
 
 class RfidDetection(Base):
     __tablename__ = 'rfid_detections'
+    # Particionada por rango de `timestamp` (ver `app/infrastructure/common/partitions.py`);
+    # por eso la PK incluye la columna de partición.
+    __table_args__ = {'postgresql_partition_by': 'RANGE ("timestamp")'}
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     rfid_tag_id: Mapped[str] = mapped_column('rfidTagId', String, ForeignKey('rfid_tags.id', ondelete='CASCADE'), nullable=False)
@@ -150,13 +164,70 @@ class RfidDetection(Base):
     reader_name: Mapped[str | None] = mapped_column('readerName', String, nullable=True)
     rssi: Mapped[int | None] = mapped_column(nullable=True)
     direction: Mapped[str | None] = mapped_column(nullable=True)
-    timestamp: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    timestamp: Mapped[DateTime] = mapped_column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+    last_seen_at: Mapped[DateTime | None] = mapped_column('lastSeenAt', DateTime(timezone=True), nullable=True)
+    read_count: Mapped[int] = mapped_column('readCount', Integer, nullable=False, server_default='1')
+    rssi_max: Mapped[int | None] = mapped_column('rssiMax', Integer, nullable=True)
+    rssi_avg: Mapped[float | None] = mapped_column('rssiAvg', Float, nullable=True)
 
     rfid_tag: Mapped[RfidTag] = relationship('RfidTag', back_populates='detections')
 
 
+# Historial por tag de más reciente a más antiguo (detalle del tag con cursor `before`).
+Index(
+    'ix_rfid_detections_tag_timestamp',
+    RfidDetection.rfid_tag_id,
+    RfidDetection.timestamp.desc(),
+    RfidDetection.id.desc(),
+)
+
+
+class RfidDetectionRollup(Base):
+    """Agregado por (tag, lector, hora) mantenido en la ingesta; sobrevive a la retención de detecciones."""
+
+    __tablename__ = 'rfid_detection_rollups'
+    __table_args__ = (
+        Index('ix_rfid_detection_rollups_bucket', 'bucket'),
+        Index('ix_rfid_detection_rollups_reader_bucket', 'readerId', 'bucket'),
+    )
+
+    rfid_tag_id: Mapped[str] = mapped_column('rfidTagId', String, ForeignKey('rfid_tags.id', ondelete='CASCADE'), primary_key=True)
+    reader_id: Mapped[str] = mapped_column('readerId', String, primary_key=True)
+    bucket: Mapped[DateTime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    read_count: Mapped[int] = mapped_column('readCount', Integer, nullable=False)
+    first_seen_at: Mapped[DateTime] = mapped_column('firstSeenAt', DateTime(timezone=True), nullable=False)
+    last_seen_at: Mapped[DateTime] = mapped_column('lastSeenAt', DateTime(timezone=True), nullable=False)
+    rssi_min: Mapped[int | None] = mapped_column('rssiMin', Integer, nullable=True)
+    rssi_max: Mapped[int | None] = mapped_column('rssiMax', Integer, nullable=True)
+    rssi_sum: Mapped[int] = mapped_column('rssiSum', BigInteger, nullable=False, server_default='0')
+    rssi_reads: Mapped[int] = mapped_column('rssiReads', Integer, nullable=False, server_default='0')
+
+
+class RfidReader(Base):
+    """Último estado conocido de cada lector, volcado periódicamente desde memoria."""
+
+    __tablename__ = 'rfid_readers'
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    name: Mapped[str | None] = mapped_column(String, nullable=True)
+    first_seen_at: Mapped[DateTime] = mapped_column('firstSeenAt', DateTime(timezone=True), nullable=False)
+    last_seen_at: Mapped[DateTime] = mapped_column('lastSeenAt', DateTime(timezone=True), nullable=False)
+    total_batches: Mapped[int] = mapped_column('totalBatches', BigInteger, nullable=False, server_default='0')
+    total_reads: Mapped[int] = mapped_column('totalReads', BigInteger, nullable=False, server_default='0')
+    unknown_reads: Mapped[int] = mapped_column('unknownReads', BigInteger, nullable=False, server_default='0')
+    errors: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default='0')
+    reads_per_second: Mapped[float | None] = mapped_column('readsPerSecond', Float, nullable=True)
+    latency_p50_ms: Mapped[float | None] = mapped_column('latencyP50Ms', Float, nullable=True)
+    latency_p95_ms: Mapped[float | None] = mapped_column('latencyP95Ms', Float, nullable=True)
+    latency_p99_ms: Mapped[float | None] = mapped_column('latencyP99Ms', Float, nullable=True)
+    updated_at: Mapped[DateTime] = mapped_column('updatedAt', DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
 class InventoryMovement(Base):
     __tablename__ = 'inventory_movements'
+    # Libro de movimientos particionado por rango de `createdAt` (ver
+    # `app/infrastructure/common/partitions.py`); la PK incluye la columna de partición.
+    __table_args__ = {'postgresql_partition_by': 'RANGE ("createdAt")'}
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     inventory_item_id: Mapped[str] = mapped_column('inventoryItemId', String, ForeignKey('inventory_items.id', ondelete='CASCADE'), nullable=False)
@@ -168,6 +239,74 @@ class InventoryMovement(Base):
     reason: Mapped[str | None] = mapped_column(String, nullable=True)
     reference: Mapped[str | None] = mapped_column(String, nullable=True)
     performed_by: Mapped[str] = mapped_column('performedBy', String, ForeignKey('users.id', ondelete='RESTRICT'), nullable=False)
-    created_at: Mapped[DateTime] = mapped_column('createdAt', DateTime(timezone=True), server_default=func.now())
+    created_at: Mapped[DateTime] = mapped_column('createdAt', DateTime(timezone=True), primary_key=True, server_default=func.now())
 
     inventory_item: Mapped[InventoryItem] = relationship('InventoryItem')
+
+
+# Historial de un item de más reciente a más antiguo (detalle del item y filtro `inventoryItemId`).
+Index(
+    'ix_inventory_movements_item_created',
+    InventoryMovement.inventory_item_id,
+    InventoryMovement.created_at.desc(),
+    InventoryMovement.id.desc(),
+)
+# Listado global paginado por clave `(createdAt, id)`.
+Index('ix_inventory_movements_created_id', InventoryMovement.created_at, InventoryMovement.id)
+
+
+class InventorySnapshot(Base):
+    """Foto del estado de todo el inventario en `takenAt`, reconstruida desde los movimientos.
+
+    Las consultas históricas parten de la foto más cercana anterior a la fecha pedida y
+    solo aplican los movimientos posteriores (ver `app/infrastructure/inventory/snapshots.py`).
+    """
+
+    __tablename__ = 'inventory_snapshots'
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    taken_at: Mapped[DateTime] = mapped_column('takenAt', DateTime(timezone=True), nullable=False, unique=True)
+    item_count: Mapped[int] = mapped_column('itemCount', Integer, nullable=False, server_default='0')
+    created_at: Mapped[DateTime] = mapped_column('createdAt', DateTime(timezone=True), server_default=func.now())
+
+
+class InventorySnapshotItem(Base):
+    __tablename__ = 'inventory_snapshot_items'
+
+    snapshot_id: Mapped[str] = mapped_column(
+        'snapshotId', String, ForeignKey('inventory_snapshots.id', ondelete='CASCADE'), primary_key=True
+    )
+    # Sin FK a `inventory_items`: borrar un item no recorre las fotos; las consultas
+    # cruzan con `inventory_items` y descartan los que ya no existen.
+    inventory_item_id: Mapped[str] = mapped_column('inventoryItemId', String, primary_key=True)
+    status: Mapped[str] = mapped_column(String, nullable=False)
+    location: Mapped[str | None] = mapped_column(String, nullable=True)
+
+
+class InventorySummaryCounter(Base):
+    """Conteo de items por estado, tipo y categoría para el resumen de inventario.
+
+    Solo lo escriben la tarea que consolida `inventory_summary_deltas` y la
+    conciliación periódica contra `inventory_items`.
+    """
+
+    __tablename__ = 'inventory_summary_counters'
+
+    dimension: Mapped[str] = mapped_column(String, primary_key=True)
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, server_default='0')
+
+
+class InventorySummaryDelta(Base):
+    """Deltas de los contadores del resumen aún sin consolidar (solo inserciones).
+
+    Cada transacción que cambia items agrega aquí sus deltas al confirmar, sin tocar
+    las filas compartidas de `inventory_summary_counters`.
+    """
+
+    __tablename__ = 'inventory_summary_deltas'
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    dimension: Mapped[str] = mapped_column(String, nullable=False)
+    key: Mapped[str] = mapped_column(String, nullable=False)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False)
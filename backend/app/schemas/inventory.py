@@ -22,3 +22,12 @@ class CheckInOutRequest(BaseModel):
     location: str | None = None
     reason: str | None = None
     reference: str | None = None
+
+
+class BulkCheckInOutRequest(BaseModel):
+    itemIds: list[str] = Field(default_factory=list, max_length=1000)
+    containerId: str | None = None
+    groupId: str | None = None
+    location: str | None = None
+    reason: str | None = None
+    reference: str | None = None
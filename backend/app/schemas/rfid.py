@@ -19,6 +19,7 @@ class RfidReadItem(BaseModel):
     tid: str | None = None
     rssi: int | None = None
     direction: str | None = None
+    antenna: int | None = None
     timestamp: str | None = None
 
 
@@ -27,3 +28,14 @@ class RfidReadRequest(BaseModel):
     readerName: str | None = None
     reads: list[RfidReadItem]
     apiKey: str = Field(min_length=1)
+
+
+class RfidStreamHello(BaseModel):
+    readerId: str = Field(min_length=1)
+    readerName: str | None = None
+    apiKey: str = Field(min_length=1)
+
+
+class RfidStreamMessage(BaseModel):
+    seq: int | None = None
+    reads: list[RfidReadItem]
@@ -0,0 +1,58 @@
+"""Recalcula `rfid_detection_rollups` desde `rfid_detections`.
+
+Procesa el rango en tramos (`--chunk-hours`), cada uno en su propia transacción,
+y reemplaza los agregados de esas horas. Por defecto termina en el inicio de la
+hora actual para no pisar la hora que la ingesta sigue acumulando.
+
+Solo se recalculan las horas desde la detección más antigua que sigue en
+`rfid_detections`: lo anterior ya salió por la retención de particiones
+(`RFID_DETECTIONS_RETENTION_DAYS`) y sus agregados se conservan tal cual. Un tramo
+sin detecciones crudas no se modifica (0 filas).
+
+Uso:
+    cd backend && python scripts/backfill_rfid_rollups.py --since 2026-01-01
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.composition.rfid import backfill_rollups  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+
+
+def _parse(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--since', type=_parse, required=True, help='inicio ISO-8601 (UTC si no trae zona)')
+    parser.add_argument('--until', type=_parse, default=None, help='fin ISO-8601 (por defecto, la hora actual)')
+    parser.add_argument('--chunk-hours', type=int, default=24)
+    args = parser.parse_args()
+
+    until = args.until or datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    start = args.since
+    total = 0
+    while start < until:
+        end = min(start + timedelta(hours=args.chunk_hours), until)
+        with SessionLocal() as db:
+            written = backfill_rollups(db, since=start, until=end)
+        total += written
+        print(f'{start.isoformat()} -> {end.isoformat()}: {written} filas')
+        start = end
+    print(f'total: {total} filas')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Benchmark de ingesta RFID (`SqlAlchemyRfidRepository.process_read`).
+
+Mide lecturas/segundo para distintos tamaños de payload contra una base
+PostgreSQL ya migrada (`DATABASE_URL`). Todo corre dentro de una transacción
+externa que se revierte al final: no deja datos en la base.
+
+Uso:
+    cd backend && python scripts/bench_rfid_read.py --sizes 10 100 1000 --rounds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.infrastructure.rfid.debounce import DetectionDebouncer  # noqa: E402
+from app.infrastructure.rfid.epc_cache import EpcCache  # noqa: E402
+from app.infrastructure.rfid.sqlalchemy_repository import SqlAlchemyRfidRepository  # noqa: E402
+from app.models.catalog_inventory import Category, InventoryItem, Product, RfidTag  # noqa: E402
+
+API_KEY = 'bench-key'
+
+
+def _seed(db: Session, tag_count: int) -> list[str]:
+    """Crea tags conocidos (mitad vinculados a items) y devuelve sus EPC."""
+    category = Category(id=str(uuid4()), name='Bench')
+    product = Product(id=str(uuid4()), sku='BENCH', name='Bench', category_id=category.id, status='ACTIVE')
+    db.add_all([category, product])
+    db.flush()
+
+    epcs: list[str] = []
+    for index in range(tag_count):
+        epc = f'BENCH{index:020d}'
+        item_id = None
+        if index % 2 == 0:
+            item_id = str(uuid4())
+            db.add(InventoryItem(id=item_id, product_id=product.id, type='UNIT', status='IN'))
+        db.add(
+            RfidTag(
+                id=str(uuid4()),
+                epc=epc,
+                inventory_item_id=item_id,
+                status='ENROLLED' if item_id else 'UNASSIGNED',
+            )
+        )
+        epcs.append(epc)
+    db.flush()
+    return epcs
+
+
+def _payload(known_epcs: list[str], size: int, unknown_ratio: float) -> dict:
+    reads = []
+    for _ in range(size):
+        if random.random() < unknown_ratio:
+            epc = f'NEW{uuid4().hex[:21].upper()}'
+        else:
+            epc = random.choice(known_epcs)
+        reads.append(
+            {
+                'epc': epc,
+                'tid': None,
+                'rssi': random.randint(-80, -30),
+                'direction': random.choice(['IN', 'OUT', None]),
+                'timestamp': None,
+            }
+        )
+    return {'readerId': 'bench-reader', 'readerName': 'Bench', 'reads': reads, 'apiKey': API_KEY}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--tags', type=int, default=2000)
+    parser.add_argument('--unknown-ratio', type=float, default=0.1)
+    parser.add_argument('--cache', action='store_true', help='usa la caché EPC en proceso (precalentada)')
+    parser.add_argument('--debounce', type=float, default=0, help='ventana de antirrebote en segundos (0 = desactivada)')
+    args = parser.parse_args()
+
+    random.seed(42)
+    engine = create_engine(settings.database_url)
+    with engine.connect() as conn:
+        outer = conn.begin()
+        db = Session(bind=conn, join_transaction_mode='create_savepoint', autoflush=False)
+        known_epcs = _seed(db, args.tags)
+        epc_cache = EpcCache(max_entries=args.tags * 2, ttl_seconds=3600) if args.cache else None
+        debouncer = DetectionDebouncer(window_seconds=args.debounce, max_entries=args.tags * 4)
+        repo = SqlAlchemyRfidRepository(
+            db, epc_cache=epc_cache, debouncer=debouncer, system_user_email=settings.superadmin_email
+        )
+        if epc_cache:
+            warmup = {**_payload(known_epcs, 0, 0.0), 'reads': [{'epc': epc} for epc in known_epcs]}
+            repo.process_read(warmup, API_KEY)
+            repo.confirm_reads()
+
+        print(f'{"reads/payload":>14} {"rounds":>7} {"reads/s":>10} {"ms/payload":>11}')
+        for size in args.sizes:
+            elapsed = 0.0
+            for _ in range(args.rounds):
+                payload = _payload(known_epcs, size, args.unknown_ratio)
+                savepoint = db.begin_nested()
+                started = time.perf_counter()
+                repo.process_read(payload, API_KEY)
+                elapsed += time.perf_counter() - started
+                # Como si cada ronda confirmara: la caché queda caliente para la siguiente.
+                repo.confirm_reads()
+                savepoint.rollback()
+                db.expunge_all()
+            total_reads = size * args.rounds
+            print(f'{size:>14} {args.rounds:>7} {total_reads / elapsed:>10.0f} {elapsed * 1000 / args.rounds:>11.1f}')
+
+        if epc_cache:
+            stats = epc_cache.stats()
+            print(f'cache: hits={stats["hits"]} misses={stats["misses"]} hitRatio={stats["hitRatio"]:.3f}')
+        if debouncer.enabled:
+            stats = debouncer.stats()
+            print(f'debounce: reads={stats["reads"]} detections={stats["detections"]} collapsed={stats["collapsed"]}')
+
+        db.close()
+        outer.rollback()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,33 @@
+"""Mantenimiento manual de particiones de `inventory_movements`.
+
+Crea las particiones de los próximos periodos (`INVENTORY_MOVEMENTS_*`). El backend
+ya lo hace periódicamente; este script sirve para cron externo o para ejecutarlo
+tras cambiar la configuración.
+
+Uso:
+    cd backend && python scripts/maintain_inventory_partitions.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.composition.inventory import maintain_movement_partitions  # noqa: E402
+
+
+def main() -> int:
+    result = maintain_movement_partitions()
+    if not result['partitioned']:
+        print('inventory_movements no esta particionada: aplica las migraciones primero.')
+        return 1
+    print(f'particiones creadas: {", ".join(result["created"]) or "-"}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""Mantenimiento manual de particiones de `rfid_detections`.
+
+Crea las particiones de los próximos periodos y aplica la retención configurada
+(`RFID_DETECTIONS_*`). El backend ya lo hace periódicamente; este script sirve
+para cron externo o para ejecutarlo tras cambiar la configuración.
+
+Uso:
+    cd backend && python scripts/maintain_rfid_partitions.py
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.composition.rfid import maintain_detection_partitions  # noqa: E402
+
+
+def main() -> int:
+    result = maintain_detection_partitions()
+    if not result['partitioned']:
+        print('rfid_detections no esta particionada: aplica las migraciones primero.')
+        return 1
+    print(f'particiones creadas: {", ".join(result["created"]) or "-"}')
+    print(f'particiones expiradas: {", ".join(result["expired"]) or "-"}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""Recalcula `movementCount`/`contentsCount` de `inventory_items`.
+
+Los contadores se mantienen en la misma transacción que agrega movimientos o
+cambia `containerId`; este comando los corrige si algo escribió por fuera de la
+aplicación (SQL manual, restauraciones parciales). Solo actualiza los items cuyo
+valor difiere.
+
+Uso:
+    cd backend && python scripts/repair_inventory_counters.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.composition.inventory import repair_counters  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+
+
+def main() -> int:
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+    with SessionLocal() as db:
+        repaired = repair_counters(db)
+    print(f'items corregidos: {repaired}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,345 @@
+"""Simulador de lectores RFID y banco de carga de `POST /v1/rfid/read`.
+
+Genera flujos de lectura parecidos a los de una instalación real y los envía por
+la API completa (validación, composición, repositorio y base de datos):
+
+- `--readers` lectores con `--antennas` antenas cada uno; cada lector es una puerta
+  de entrada o de salida y reporta esa dirección en `--direction-share` de las
+  lecturas (el resto llega sin dirección).
+- `--tags` tags sembrados (la mitad vinculados a items `IN`) y una proporción
+  `--unknown-ratio` de EPC que la base no conoce.
+- `--repeat-rate`: probabilidad de que una lectura repita un tag que el mismo lector
+  vio hace poco (tags que siguen en el campo de la antena).
+- RSSI base por tag y lector más ruido gaussiano de desvío `--rssi-noise`.
+
+Destinos:
+
+- `inprocess` (por defecto): la app FastAPI en el mismo proceso (`TestClient`).
+  Además de latencias cuenta, con eventos del engine, las sentencias SQL y las filas
+  escritas por tabla durante la carga.
+- `http`: un backend ya levantado en `--url`. Las filas escritas salen de las
+  diferencias de `pg_stat_database` (aproximadas: incluyen cualquier otra actividad
+  de la base); las sentencias no se pueden contar desde fuera.
+
+Los datos sembrados usan un prefijo propio y se borran al terminar (`--keep` los
+conserva). Con `--json` el resultado se imprime como JSON para compararlo entre
+ejecuciones.
+
+Uso:
+    cd backend && python scripts/simulate_rfid_readers.py --readers 4 --tags 5000 --batches 200
+    cd backend && python scripts/simulate_rfid_readers.py --target http --url http://localhost:8000 --concurrency 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from uuid import uuid4
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import delete, event, insert, text  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.catalog_inventory import Category, InventoryItem, Product, RfidReader, RfidTag  # noqa: E402
+
+READ_PATH = '/v1/rfid/read'
+_WRITE_STATEMENT = re.compile(r'^\s*(?:WITH\b.*?\)\s*)?(INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+"?(\w+)"?', re.IGNORECASE | re.DOTALL)
+
+
+class ReaderSimulator:
+    """Genera lotes de lecturas con el comportamiento de varios lectores fijos."""
+
+    def __init__(
+        self,
+        prefix: str,
+        known_epcs: list[str],
+        readers: int,
+        antennas: int,
+        unknown_ratio: float,
+        repeat_rate: float,
+        rssi_noise: float,
+        direction_share: float,
+        seed: int,
+    ) -> None:
+        self._prefix = prefix
+        self._known_epcs = known_epcs
+        self._readers = [f'{prefix}-reader-{index}' for index in range(readers)]
+        self._antennas = antennas
+        self._unknown_ratio = unknown_ratio
+        self._repeat_rate = repeat_rate
+        self._rssi_noise = rssi_noise
+        self._direction_share = direction_share
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._next_reader = 0
+        self._unknown = 0
+        self._recent: dict[str, deque] = {reader: deque(maxlen=256) for reader in self._readers}
+        self._base_rssi: dict[tuple[str, str], float] = {}
+
+    def next_payload(self, batch_size: int, api_key: str) -> dict:
+        with self._lock:
+            reader_index = self._next_reader
+            self._next_reader = (self._next_reader + 1) % len(self._readers)
+            reader_id = self._readers[reader_index]
+            # Lectores pares en puertas de entrada, impares en puertas de salida.
+            door_direction = 'IN' if reader_index % 2 == 0 else 'OUT'
+            reads = [self._read(reader_id, door_direction) for _ in range(batch_size)]
+        return {'readerId': reader_id, 'readerName': f'Simulador {reader_index}', 'apiKey': api_key, 'reads': reads}
+
+    def _read(self, reader_id: str, door_direction: str) -> dict:
+        recent = self._recent[reader_id]
+        if recent and self._random.random() < self._repeat_rate:
+            epc = self._random.choice(recent)
+        elif self._random.random() < self._unknown_ratio:
+            self._unknown += 1
+            epc = f'{self._prefix}N{self._unknown:015d}'
+        else:
+            epc = self._random.choice(self._known_epcs)
+        recent.append(epc)
+
+        base = self._base_rssi.setdefault((reader_id, epc), self._random.uniform(-75, -40))
+        rssi = round(max(-95.0, min(-20.0, self._random.gauss(base, self._rssi_noise))))
+        return {
+            'epc': epc,
+            'rssi': rssi,
+            'antenna': self._random.randint(1, self._antennas),
+            'direction': door_direction if self._random.random() < self._direction_share else None,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+        }
+
+
+class StatementCounter:
+    """Sentencias SQL y filas escritas por tabla en el engine de la app."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.statements = 0
+        self.rows_by_table: Counter[str] = Counter()
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        match = _WRITE_STATEMENT.match(statement)
+        with self._lock:
+            self.statements += 1
+            if match and cursor.rowcount and cursor.rowcount > 0:
+                self.rows_by_table[match.group(2)] += cursor.rowcount
+
+
+def _seed(prefix: str, tag_count: int) -> list[str]:
+    """Crea (y confirma) los tags conocidos; la mitad vinculados a un item `IN`."""
+    category_id = f'{prefix}-category'
+    product_id = f'{prefix}-product'
+    items, tags, epcs = [], [], []
+    for index in range(tag_count):
+        epc = f'{prefix}K{index:015d}'
+        item_id = f'{prefix}-item-{index}' if index % 2 == 0 else None
+        if item_id:
+            items.append({'id': item_id, 'product_id': product_id, 'type': 'UNIT', 'status': 'IN'})
+        tags.append(
+            {
+                'id': str(uuid4()),
+                'epc': epc,
+                'inventory_item_id': item_id,
+                'status': 'ENROLLED' if item_id else 'UNASSIGNED',
+            }
+        )
+        epcs.append(epc)
+
+    with SessionLocal() as db:
+        db.add(Category(id=category_id, name=f'Simulador {prefix}'))
+        db.flush()
+        db.add(Product(id=product_id, sku=prefix, name=f'Simulador {prefix}', category_id=category_id, status='ACTIVE'))
+        db.flush()
+        if items:
+            db.execute(insert(InventoryItem), items)
+        db.execute(insert(RfidTag), tags)
+        db.commit()
+    return epcs
+
+
+def _cleanup(prefix: str) -> None:
+    # Detecciones, agregados y movimientos se van en cascada con sus tags e items.
+    with SessionLocal() as db:
+        db.execute(delete(RfidTag).where(RfidTag.epc.startswith(prefix)))
+        db.execute(delete(InventoryItem).where(InventoryItem.id.startswith(f'{prefix}-item-')))
+        db.execute(delete(Product).where(Product.id == f'{prefix}-product'))
+        db.execute(delete(Category).where(Category.id == f'{prefix}-category'))
+        db.execute(delete(RfidReader).where(RfidReader.id.startswith(f'{prefix}-reader-')))
+        db.commit()
+
+
+def _database_writes() -> int:
+    with engine.connect() as conn:
+        return conn.execute(
+            text(
+                'SELECT tup_inserted + tup_updated + tup_deleted FROM pg_stat_database '
+                'WHERE datname = current_database()'
+            )
+        ).scalar_one()
+
+
+def _percentile(ordered: list[float], fraction: float) -> float | None:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def _client_factory(args):
+    if args.target == 'http':
+        import httpx
+
+        return lambda: httpx.Client(base_url=args.url, timeout=30.0)
+
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    # Sin `with`: no corren los eventos de arranque (migraciones, superadmin, workers).
+    return lambda: TestClient(app)
+
+
+def run(args) -> dict:
+    prefix = f'SIM{uuid4().hex[:6].upper()}'
+    known_epcs = _seed(prefix, args.tags)
+    simulator = ReaderSimulator(
+        prefix,
+        known_epcs,
+        readers=args.readers,
+        antennas=args.antennas,
+        unknown_ratio=args.unknown_ratio,
+        repeat_rate=args.repeat_rate,
+        rssi_noise=args.rssi_noise,
+        direction_share=args.direction_share,
+        seed=args.seed,
+    )
+    make_client = _client_factory(args)
+    local = threading.local()
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    results_lock = threading.Lock()
+
+    def send(_: int) -> None:
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = make_client()
+        payload = simulator.next_payload(args.batch_size, args.api_key)
+        started = time.perf_counter()
+        response = client.post(READ_PATH, json=payload)
+        elapsed = (time.perf_counter() - started) * 1000
+        with results_lock:
+            latencies.append(elapsed)
+            statuses[response.status_code] += 1
+
+    counter = StatementCounter()
+    try:
+        # Calentamiento fuera de la medición (conexiones, cachés de sentencias).
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(send, range(min(args.warmup, args.batches))))
+        latencies.clear()
+        statuses.clear()
+
+        writes_before = _database_writes()
+        if args.target == 'inprocess':
+            event.listen(engine, 'after_cursor_execute', counter)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            list(pool.map(send, range(args.batches)))
+        elapsed = time.perf_counter() - started
+        if args.target == 'inprocess':
+            event.remove(engine, 'after_cursor_execute', counter)
+        else:
+            # Las estadísticas de otros backends se publican con un pequeño retraso.
+            time.sleep(1.5)
+        writes_after = _database_writes()
+    finally:
+        if not args.keep:
+            _cleanup(prefix)
+
+    reads = args.batches * args.batch_size
+    ordered = sorted(latencies)
+    rows_written = sum(counter.rows_by_table.values()) if args.target == 'inprocess' else writes_after - writes_before
+    return {
+        'target': args.target,
+        'prefix': prefix,
+        'requests': args.batches,
+        'reads': reads,
+        'batchSize': args.batch_size,
+        'concurrency': args.concurrency,
+        'statusCodes': {str(code): count for code, count in sorted(statuses.items())},
+        'elapsedSeconds': round(elapsed, 3),
+        'readsPerSecond': round(reads / elapsed, 1) if elapsed else None,
+        'latencyMs': {
+            'p50': _percentile(ordered, 0.50),
+            'p95': _percentile(ordered, 0.95),
+            'p99': _percentile(ordered, 0.99),
+            'max': ordered[-1] if ordered else None,
+        },
+        'statementsPerRequest': round(counter.statements / args.batches, 2) if args.target == 'inprocess' else None,
+        'rowsWrittenPerRead': round(rows_written / reads, 3) if reads else None,
+        'rowsWrittenByTable': dict(counter.rows_by_table.most_common()) if args.target == 'inprocess' else None,
+    }
+
+
+def _print_report(report: dict) -> None:
+    latency = report['latencyMs']
+    print(f'destino: {report["target"]} (prefijo {report["prefix"]})')
+    print(
+        f'peticiones: {report["requests"]} x {report["batchSize"]} lecturas, '
+        f'concurrencia {report["concurrency"]}, códigos {report["statusCodes"]}'
+    )
+    print(f'lecturas/s: {report["readsPerSecond"]}  ({report["reads"]} lecturas en {report["elapsedSeconds"]} s)')
+    print(
+        'latencia ms por petición: '
+        + '  '.join(f'{name}={value:.1f}' for name, value in latency.items() if value is not None)
+    )
+    if report['statementsPerRequest'] is not None:
+        print(f'sentencias SQL por petición: {report["statementsPerRequest"]}')
+    print(f'filas escritas por lectura: {report["rowsWrittenPerRead"]}')
+    for table, rows in (report['rowsWrittenByTable'] or {}).items():
+        print(f'  {table:<28} {rows:>9}')
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', choices=['inprocess', 'http'], default='inprocess')
+    parser.add_argument('--url', default='http://localhost:8000', help='base del backend con `--target http`')
+    parser.add_argument('--api-key', default=settings.rfid_api_key)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--antennas', type=int, default=2)
+    parser.add_argument('--tags', type=int, default=2000)
+    parser.add_argument('--batches', type=int, default=200, help='peticiones medidas')
+    parser.add_argument('--batch-size', type=int, default=50, help='lecturas por petición')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--warmup', type=int, default=10, help='peticiones previas que no se miden')
+    parser.add_argument('--unknown-ratio', type=float, default=0.05)
+    parser.add_argument('--repeat-rate', type=float, default=0.6)
+    parser.add_argument('--rssi-noise', type=float, default=4.0)
+    parser.add_argument('--direction-share', type=float, default=0.5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--keep', action='store_true', help='no borra los datos sembrados ni generados')
+    parser.add_argument('--json', action='store_true', help='imprime el resultado como JSON')
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+    return 0 if set(report['statusCodes']) <= {'200', '202'} else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
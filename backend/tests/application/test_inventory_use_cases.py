@@ -1,7 +1,17 @@
+from datetime import UTC, datetime, timedelta
+
 import pytest
 
 from app.application.inventory.use_cases import InventoryUseCases
-from app.domain.inventory.entities import CheckInOutInput, InventoryItemInput, InventoryListFilters, MovementListFilters
+from app.domain.inventory.entities import (
+    BulkCheckInOutInput,
+    CheckInOutInput,
+    InventoryImportRow,
+    InventoryItemInput,
+    InventoryListFilters,
+    MovementExportFilters,
+    MovementListFilters,
+)
 from app.domain.inventory.errors import (
     AlreadyCheckedInError,
     ContainerHasItemsError,
@@ -13,23 +23,46 @@ from app.domain.inventory.errors import (
 class FakeInventoryRepo:
     def __init__(self):
         self.item_status = 'IN'
+        self.item_type = 'UNIT'
         self.contents_count = 0
 
     def list_items(self, filters):
         return [{'id': 'i1', 'filters': filters}]
 
+    def list_items_page(self, filters):
+        return {'items': [], 'total': None, 'nextCursor': None, 'prevCursor': None, 'filters': filters}
+
+    def search_items(self, query, limit):
+        return [{'item': {'id': 'i1'}, 'rank': 3.0, 'matchedOn': 'sku', 'query': query}]
+
     def create_item(self, payload, user_id):
         return {'id': 'i2', 'payload': payload, 'userId': user_id}
 
+    def import_items(self, rows, user_id, batch_size):
+        self.imported = list(rows)
+        return {'created': len(self.imported) - 1, 'errors': [{'line': 3, 'message': 'Producto no encontrado o inactivo'}]}
+
     def summary(self):
         return {'total': 1}
 
+    def summary_as_of(self, as_of):
+        return {'asOf': as_of, 'snapshotAt': None, 'total': 1}
+
+    def take_snapshot(self, cutoff, min_interval, retention):
+        self.snapshot_call = (cutoff, min_interval, retention)
+        return {'id': 's1', 'takenAt': cutoff, 'itemCount': 1}
+
     def list_movements(self, filters):
         return {'movements': [], 'filters': filters}
 
+    def export_movements(self, filters, batch_size):
+        self.export_filters = filters
+        return {'columns': ['id'], 'rows': iter([('m1',)])}
+
     def get_item(self, item_id):
         return {
             'id': item_id,
+            'type': self.item_type,
             'status': self.item_status,
             '_count': {'contents': self.contents_count, 'movements': 0},
         }
@@ -46,6 +79,18 @@ class FakeInventoryRepo:
     def check_out(self, item_id, payload, user_id):
         return {'id': item_id, 'userId': user_id, 'location': payload.location}
 
+    def bulk_check_in_out(self, target_status, payload, user_id):
+        self.bulk_call = (target_status, payload.item_ids, user_id)
+        self.bulk_container_id = payload.container_id
+        already_in_state = [payload.container_id] if payload.container_id else []
+        return {'updated': [{'id': 'c1', 'status': target_status, 'location': None}], 'alreadyInState': already_in_state, 'skipped': []}
+
+    def repair_counters(self):
+        return 3
+
+    def reconcile_summary(self):
+        return 2
+
 
 class FakeUow:
     def __init__(self):
@@ -90,6 +135,46 @@ def test_list_movements_invalid_limit_raises() -> None:
         uc.list_movements(MovementListFilters(type_filter='', inventory_item_id='', limit=0, offset=0))
 
 
+def test_list_movements_accepts_rfid_movement_types() -> None:
+    uc, _, _ = _build()
+
+    result = uc.list_movements(MovementListFilters(type_filter='RFID_CHECK_OUT', inventory_item_id='', limit=50, offset=0))
+
+    assert result['filters'].type_filter == 'RFID_CHECK_OUT'
+
+
+def test_list_movements_rejects_inverted_date_range() -> None:
+    uc, _, _ = _build()
+    filters = MovementListFilters(
+        type_filter='',
+        inventory_item_id='',
+        limit=50,
+        offset=0,
+        since=datetime(2026, 2, 1, tzinfo=UTC),
+        until=datetime(2026, 1, 1, tzinfo=UTC),
+    )
+
+    with pytest.raises(InvalidInventoryFiltersError):
+        uc.list_movements(filters)
+
+
+def test_list_movements_reads_naive_bounds_as_utc() -> None:
+    uc, _, _ = _build()
+    filters = MovementListFilters(
+        type_filter='',
+        inventory_item_id='',
+        limit=50,
+        offset=0,
+        since=datetime(2026, 1, 1),
+        until=datetime(2026, 2, 1, tzinfo=UTC),
+    )
+
+    result = uc.list_movements(filters)
+
+    assert result['filters'].since == datetime(2026, 1, 1, tzinfo=UTC)
+    assert result['filters'].until == datetime(2026, 2, 1, tzinfo=UTC)
+
+
 def test_list_items_invalid_status_filter_raises() -> None:
     uc, _, _ = _build()
 
@@ -97,6 +182,29 @@ def test_list_items_invalid_status_filter_raises() -> None:
         uc.list_items(InventoryListFilters(search='', status_filter='INVALID', type_filter='', product_id='', container_id=''))
 
 
+def test_list_items_page_validates_limit_and_sort() -> None:
+    uc, _, _ = _build()
+    base = {'search': '', 'status_filter': '', 'type_filter': '', 'product_id': '', 'container_id': ''}
+
+    with pytest.raises(InvalidInventoryFiltersError):
+        uc.list_items_page(InventoryListFilters(**base, limit=500))
+    with pytest.raises(InvalidInventoryFiltersError):
+        uc.list_items_page(InventoryListFilters(**base, limit=50, sort='name'))
+
+    page = uc.list_items_page(InventoryListFilters(**base, limit=50, cursor='abc', sort='createdAt'))
+    assert page['filters'].cursor == 'abc'
+
+
+def test_search_items_trims_query_and_rejects_short_terms() -> None:
+    uc, _, _ = _build()
+
+    with pytest.raises(InvalidInventoryFiltersError):
+        uc.search_items(' a ', 20)
+
+    hits = uc.search_items('  cam-01 ', 20)
+    assert hits[0]['query'] == 'cam-01'
+
+
 def test_update_item_requires_user_id() -> None:
     uc, _, _ = _build()
 
@@ -146,3 +254,146 @@ def test_delete_item_raises_when_container_has_contents() -> None:
 
     with pytest.raises(ContainerHasItemsError):
         uc.delete_item('i1')
+
+
+def test_repair_counters_commits_and_returns_repaired_items() -> None:
+    uc, uow, _ = _build()
+
+    assert uc.repair_counters() == 3
+    assert uow.commits == 1
+
+
+def test_reconcile_summary_commits_and_returns_fixed_counters() -> None:
+    uc, uow, _ = _build()
+
+    assert uc.reconcile_summary() == 2
+    assert uow.commits == 1
+
+
+def test_import_items_reports_invalid_rows_and_commits_valid_ones() -> None:
+    uc, uow, repo = _build()
+    bad_status = _item_input()
+    bad_status.status = 'BROKEN'
+    no_product = _item_input()
+    no_product.product_id = ''
+    rows = [
+        InventoryImportRow(line=5, item=bad_status),
+        InventoryImportRow(line=2, item=_item_input()),
+        InventoryImportRow(line=3, item=no_product, product_sku='SKU-1'),
+        InventoryImportRow(line=4, item=None, error='JSON invalido'),
+    ]
+
+    result = uc.import_items(rows, 'u1', batch_size=100)
+
+    assert [row.line for row in repo.imported] == [2, 3]
+    assert (result['received'], result['created'], result['failed']) == (4, 1, 3)
+    assert [error['line'] for error in result['errors']] == [3, 4, 5]
+    assert uow.commits == 1
+
+
+def test_import_items_dry_run_rolls_back() -> None:
+    uc, uow, _ = _build()
+
+    result = uc.import_items([InventoryImportRow(line=2, item=_item_input())], 'u1', batch_size=100, dry_run=True)
+
+    assert result['dryRun'] is True
+    assert (uow.commits, uow.rollbacks) == (0, 1)
+
+
+def _bulk_input(**overrides) -> BulkCheckInOutInput:
+    values = {'item_ids': [], 'container_id': None, 'group_id': None, 'location': None, 'reason': None, 'reference': None}
+    values.update(overrides)
+    return BulkCheckInOutInput(**values)
+
+
+def test_bulk_check_out_deduplicates_ids_and_commits() -> None:
+    uc, uow, repo = _build()
+
+    uc.bulk_check_out(_bulk_input(item_ids=['i1', '', 'i2', 'i1']), 'u1')
+
+    assert repo.bulk_call == ('OUT', ['i1', 'i2'], 'u1')
+    assert uow.commits == 1
+
+
+def test_bulk_check_in_requires_a_selection() -> None:
+    uc, uow, _ = _build()
+
+    with pytest.raises(InvalidInventoryPayloadError):
+        uc.bulk_check_in(_bulk_input(), 'u1')
+    assert uow.commits == 0
+
+
+def test_check_out_of_container_moves_its_contents_in_the_same_commit() -> None:
+    uc, uow, repo = _build()
+    repo.item_type = 'CONTAINER'
+    repo.contents_count = 1
+
+    result = uc.check_out('k1', CheckInOutInput(location='Evento', reason=None, reference=None), 'u1')
+
+    assert repo.bulk_container_id == 'k1'
+    assert result['contents']['updated'] == [{'id': 'c1', 'status': 'OUT', 'location': None}]
+    assert result['contents']['alreadyInState'] == []
+    assert uow.commits == 1
+
+
+def test_check_in_of_empty_container_does_not_cascade() -> None:
+    uc, _, repo = _build()
+    repo.item_status = 'OUT'
+    repo.item_type = 'CONTAINER'
+
+    result = uc.check_in('k1', CheckInOutInput(location=None, reason=None, reference=None), 'u1')
+
+    assert 'contents' not in result
+    assert not hasattr(repo, 'bulk_call')
+
+
+def test_export_movements_rejects_inverted_date_range() -> None:
+    uc, _, _ = _build()
+    filters = MovementExportFilters(
+        type_filter='CHECK_OUT',
+        inventory_item_id='',
+        since=datetime(2026, 2, 1, tzinfo=UTC),
+        until=datetime(2026, 1, 1, tzinfo=UTC),
+    )
+
+    with pytest.raises(InvalidInventoryFiltersError):
+        uc.export_movements(filters, 100)
+
+    filters.until = None
+    assert list(uc.export_movements(filters, 100)['rows']) == [('m1',)]
+
+
+def test_export_movements_reads_naive_bounds_as_utc() -> None:
+    uc, _, repo = _build()
+    filters = MovementExportFilters(
+        type_filter='',
+        inventory_item_id='',
+        since=datetime(2026, 1, 1, tzinfo=UTC),
+        until=datetime(2026, 2, 1),
+    )
+
+    uc.export_movements(filters, 100)
+
+    assert repo.export_filters.until == datetime(2026, 2, 1, tzinfo=UTC)
+
+
+def test_summary_as_of_reads_naive_dates_as_utc() -> None:
+    uc, _, _ = _build()
+
+    result = uc.summary_as_of(datetime(2026, 3, 1, 12, 0))
+
+    assert result['asOf'] == datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+
+
+def test_take_snapshot_lags_cutoff_and_commits() -> None:
+    uc, uow, repo = _build()
+    now = datetime(2026, 3, 1, 12, 0, tzinfo=UTC)
+
+    snapshot = uc.take_snapshot(now, 86400, 0)
+
+    assert snapshot['takenAt'] == datetime(2026, 3, 1, 11, 55, tzinfo=UTC)
+    assert repo.snapshot_call[1:] == (timedelta(hours=12), None)
+    assert uow.commits == 1
+
+    uc.take_snapshot(now, 86400, 30)
+    assert repo.snapshot_call[2] == timedelta(days=30)
@@ -1,7 +1,15 @@
+from datetime import datetime, timedelta, timezone
+
 import pytest
 
 from app.application.rfid.use_cases import RfidUseCases
-from app.domain.rfid.entities import DetectionFilters, TagFilters
+from app.domain.rfid.entities import ActivityFilters, DetectionFilters, TagFilters
+from app.domain.rfid.errors import (
+    IngestBatchNotFoundError,
+    InvalidActivityFilterError,
+    InvalidApiKeyError,
+    InvalidTimestampError,
+)
 
 
 class FakeRepo:
@@ -14,8 +22,8 @@ class FakeRepo:
     def list_unknown_tags(self):
         return [{'id': 'tu1'}]
 
-    def get_tag(self, tag_id: str):
-        return {'id': tag_id}
+    def get_tag(self, tag_id: str, before: str | None = None):
+        return {'id': tag_id, 'before': before}
 
     def update_tag(self, tag_id: str, payload: dict):
         return {'id': tag_id}
@@ -37,6 +45,12 @@ class FakeRepo:
             raise RuntimeError('read error')
         return {'success': True}
 
+    def confirm_reads(self):
+        self.read_state = 'confirmed'
+
+    def discard_reads(self):
+        self.read_state = 'discarded'
+
 
 class FakeUow:
     def __init__(self):
@@ -62,12 +76,28 @@ def test_create_tag_commits() -> None:
 
 def test_process_read_rolls_back_on_error() -> None:
     uow = FakeUow()
-    uc = RfidUseCases(FakeRepo(), uow)
+    repo = FakeRepo()
+    uc = RfidUseCases(repo, uow)
 
     with pytest.raises(RuntimeError):
         uc.process_read({'fail': True}, 'key')
 
     assert uow.rollbacks == 1
+    assert repo.read_state == 'discarded'
+
+
+def test_process_read_confirms_read_state_after_commit() -> None:
+    class FailingCommitUow(FakeUow):
+        def commit(self):
+            raise RuntimeError('commit failed')
+
+    repo = FakeRepo()
+    RfidUseCases(repo, FakeUow()).process_read({'reads': []}, 'key')
+    assert repo.read_state == 'confirmed'
+
+    with pytest.raises(RuntimeError):
+        RfidUseCases(repo, FailingCommitUow()).process_read_batch([{'reads': []}], 'key')
+    assert repo.read_state == 'discarded'
 
 
 def test_list_tags_delegates_filters() -> None:
@@ -75,3 +105,162 @@ def test_list_tags_delegates_filters() -> None:
     result = uc.list_tags(TagFilters(search='epc', status_filter='ASSIGNED'))
 
     assert result[0]['id'] == 't1'
+
+
+def test_get_tag_passes_detections_cursor() -> None:
+    uc = RfidUseCases(FakeRepo(), FakeUow())
+
+    assert uc.get_tag('t1', 'cursor-1') == {'id': 't1', 'before': 'cursor-1'}
+
+
+class FakeIngestQueue:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, payload: dict):
+        self.submitted.append(payload)
+        return {'batchId': 'b1', 'status': 'QUEUED'}
+
+    def get(self, batch_id: str):
+        return {'batchId': batch_id, 'status': 'DONE'} if batch_id == 'b1' else None
+
+
+def test_process_read_batch_commits_once() -> None:
+    uow = FakeUow()
+    uc = RfidUseCases(FakeRepo(), uow)
+
+    results = uc.process_read_batch([{'reads': []}, {'reads': []}], 'key')
+
+    assert len(results) == 2
+    assert uow.commits == 1
+
+
+def test_process_read_batch_rolls_back_whole_group() -> None:
+    uow = FakeUow()
+    uc = RfidUseCases(FakeRepo(), uow)
+
+    with pytest.raises(RuntimeError):
+        uc.process_read_batch([{'reads': []}, {'fail': True}], 'key')
+
+    assert uow.commits == 0
+    assert uow.rollbacks == 1
+
+
+class FakePublisher:
+    def __init__(self):
+        self.events = []
+
+    def publish(self, events: list[dict]):
+        self.events.extend(events)
+
+
+class ResultsRepo(FakeRepo):
+    def process_read(self, payload: dict, api_key: str):
+        if payload.get('fail'):
+            raise RuntimeError('read error')
+        return {
+            'success': True,
+            'processed': len(payload['reads']),
+            'results': [
+                {'epc': read['epc'], 'tagId': 't1', 'status': 'ENROLLED', 'isNew': False, 'inventoryItemId': 'i1', 'inventoryUpdated': True}
+                for read in payload['reads']
+            ],
+        }
+
+
+def test_process_read_publishes_only_after_commit() -> None:
+    publisher = FakePublisher()
+    uc = RfidUseCases(ResultsRepo(), FakeUow(), publisher=publisher)
+    payload = {'readerId': 'R1', 'reads': [{'epc': 'E1', 'direction': 'IN', 'rssi': -40, 'timestamp': '2026-10-17T10:00:00+00:00'}]}
+
+    uc.process_read(payload, 'key')
+    with pytest.raises(RuntimeError):
+        uc.process_read_batch([payload, {'fail': True}], 'key')
+
+    assert len(publisher.events) == 1
+    assert publisher.events[0]['readerId'] == 'R1'
+    assert publisher.events[0]['direction'] == 'IN'
+    assert publisher.events[0]['timestamp'] == '2026-10-17T10:00:00+00:00'
+    assert publisher.events[0]['inventoryUpdated'] is True
+
+
+def test_enqueue_read_validates_before_queueing() -> None:
+    queue = FakeIngestQueue()
+    uc = RfidUseCases(FakeRepo(), FakeUow(), ingest_queue=queue)
+
+    with pytest.raises(InvalidApiKeyError):
+        uc.enqueue_read({'apiKey': 'bad', 'reads': []}, 'key')
+    with pytest.raises(InvalidTimestampError):
+        uc.enqueue_read({'apiKey': 'key', 'reads': [{'epc': 'E1', 'timestamp': 'ayer'}]}, 'key')
+    batch = uc.enqueue_read({'apiKey': 'key', 'reads': [{'epc': 'E1'}]}, 'key')
+
+    assert batch['status'] == 'QUEUED'
+    assert len(queue.submitted) == 1
+
+
+def test_get_ingest_batch_checks_key_and_existence() -> None:
+    uc = RfidUseCases(FakeRepo(), FakeUow(), ingest_queue=FakeIngestQueue())
+
+    with pytest.raises(InvalidApiKeyError):
+        uc.get_ingest_batch('b1', 'bad', 'key')
+    with pytest.raises(IngestBatchNotFoundError):
+        uc.get_ingest_batch('b2', 'key', 'key')
+    assert uc.get_ingest_batch('b1', 'key', 'key')['status'] == 'DONE'
+
+
+def test_check_api_key_authenticates_stream_readers() -> None:
+    RfidUseCases.check_api_key('key', 'key')
+
+    with pytest.raises(InvalidApiKeyError):
+        RfidUseCases.check_api_key('bad', 'key')
+
+
+class ActivityRepo(FakeRepo):
+    def __init__(self):
+        self.activity_filters = None
+
+    def list_activity(self, filters: ActivityFilters):
+        self.activity_filters = filters
+        return {'buckets': []}
+
+    def backfill_rollups(self, since, until):
+        return 3
+
+
+def test_list_activity_defaults_to_last_day() -> None:
+    repo = ActivityRepo()
+    uc = RfidUseCases(repo, FakeUow())
+
+    uc.list_activity(ActivityFilters(rfid_tag_id='', reader_id='R1'))
+
+    assert repo.activity_filters.until - repo.activity_filters.since == timedelta(hours=24)
+    assert repo.activity_filters.reader_id == 'R1'
+
+
+def test_list_activity_reads_naive_bounds_as_utc() -> None:
+    repo = ActivityRepo()
+    uc = RfidUseCases(repo, FakeUow())
+
+    uc.list_activity(ActivityFilters(rfid_tag_id='', reader_id='', since=datetime(2026, 10, 1)))
+
+    assert repo.activity_filters.since == datetime(2026, 10, 1, tzinfo=timezone.utc)
+    assert repo.activity_filters.until.tzinfo is not None
+
+
+def test_list_activity_rejects_invalid_filters() -> None:
+    uc = RfidUseCases(ActivityRepo(), FakeUow())
+    now = datetime.now(timezone.utc)
+
+    with pytest.raises(InvalidActivityFilterError):
+        uc.list_activity(ActivityFilters(rfid_tag_id='', reader_id='', granularity='minute'))
+    with pytest.raises(InvalidActivityFilterError):
+        uc.list_activity(ActivityFilters(rfid_tag_id='', reader_id='', since=now, until=now - timedelta(hours=1)))
+
+
+def test_backfill_rollups_commits() -> None:
+    uow = FakeUow()
+    uc = RfidUseCases(ActivityRepo(), uow)
+    now = datetime.now(timezone.utc)
+
+    assert uc.backfill_rollups(now - timedelta(days=1), now) == 3
+    assert uow.commits == 1
@@ -0,0 +1,24 @@
+import csv
+import io
+from datetime import UTC, date, datetime
+from decimal import Decimal
+
+from app.infrastructure.common.csv_export import iter_csv
+
+
+def test_iter_csv_writes_header_and_rows_in_chunks() -> None:
+    rows = [('a', 1), ('b', None), ('c', 'x,"y"')]
+
+    chunks = list(iter_csv(['id', 'value'], iter(rows), rows_per_chunk=2))
+
+    assert len(chunks) == 2
+    text = b''.join(chunks).decode('utf-8-sig')
+    assert list(csv.reader(io.StringIO(text))) == [['id', 'value'], ['a', '1'], ['b', ''], ['c', 'x,"y"']]
+
+
+def test_iter_csv_formats_dates_and_decimals() -> None:
+    rows = [(datetime(2026, 1, 2, 3, 4, tzinfo=UTC), date(2026, 1, 2), Decimal('1E+1'))]
+
+    text = b''.join(iter_csv(['at', 'day', 'price'], rows)).decode('utf-8-sig')
+
+    assert text.splitlines()[1] == '2026-01-02T03:04:00+00:00,2026-01-02,10'
@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.infrastructure.common.cursors import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip_keeps_timestamp_and_id() -> None:
+    moment = datetime(2026, 10, 17, 12, 30, 5, 123456, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(moment, 'det-1')
+
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == (moment, 'det-1', 'next')
+    assert decode_cursor(encode_cursor(moment, 'det-1', 'prev')) == (moment, 'det-1', 'prev')
+
+
+@pytest.mark.parametrize(
+    'cursor',
+    [
+        '',
+        'garbage!',
+        encode_cursor(datetime(2026, 1, 1, tzinfo=timezone.utc), 'x')[:-3],
+        encode_cursor(datetime(2026, 1, 1, tzinfo=timezone.utc), 'x', 'sideways'),
+    ],
+)
+def test_decode_cursor_rejects_invalid_values(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+from app.infrastructure.rfid.detection_bus import DROPPED, DetectionBus
+
+
+def _event(reader_id: str = 'R1', direction: str = 'IN', tag_id: str = 't1') -> dict:
+    return {'readerId': reader_id, 'direction': direction, 'tagId': tag_id}
+
+
+def test_publish_from_thread_delivers_matching_events() -> None:
+    async def scenario():
+        bus = DetectionBus(buffer_size=10, max_subscribers=5)
+        dock = bus.subscribe(reader_id='R1', direction='IN')
+        everything = bus.subscribe()
+
+        worker = threading.Thread(target=bus.publish, args=([_event(), _event('R2'), _event(direction='OUT')],))
+        worker.start()
+        worker.join()
+        await asyncio.sleep(0)
+
+        return dock.queue.qsize(), everything.queue.qsize(), bus.stats()
+
+    dock_size, everything_size, stats = asyncio.run(scenario())
+
+    assert dock_size == 1
+    assert everything_size == 3
+    assert stats['published'] == 3
+
+
+def test_slow_subscriber_is_dropped_without_affecting_others() -> None:
+    async def scenario():
+        bus = DetectionBus(buffer_size=2, max_subscribers=5)
+        slow = bus.subscribe()
+        filtered = bus.subscribe(reader_id='R9')
+
+        bus.publish([_event(), _event()])
+        bus.publish([_event()])
+        bus.publish([_event(reader_id='R9')])
+        await asyncio.sleep(0)
+
+        drained = [slow.queue.get_nowait() for _ in range(slow.queue.qsize())]
+        return drained, filtered.queue.qsize(), bus.stats()
+
+    drained, filtered_size, stats = asyncio.run(scenario())
+
+    assert drained[-1] is DROPPED
+    assert len(drained) == 3
+    assert filtered_size == 1
+    assert stats['subscribers'] == 1
+    assert stats['droppedSubscribers'] == 1
+
+
+def test_subscribe_respects_max_subscribers() -> None:
+    async def scenario():
+        bus = DetectionBus(buffer_size=2, max_subscribers=1)
+        first = bus.subscribe()
+        rejected = bus.subscribe()
+        bus.unsubscribe(first)
+        return rejected, bus.subscribe()
+
+    rejected, accepted = asyncio.run(scenario())
+
+    assert rejected is None
+    assert accepted is not None
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta, timezone
+
+from app.infrastructure.rfid.debounce import DetectionDebouncer
+
+BASE = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _at(seconds: float) -> datetime:
+    return BASE + timedelta(seconds=seconds)
+
+
+def test_repeated_reads_collapse_into_one_window(clock) -> None:
+    debouncer = DetectionDebouncer(window_seconds=2, max_entries=10, clock=clock)
+    key = ('E1', 'R1', 'IN')
+
+    first, opened = debouncer.observe(key, 't1', _at(0), -60)
+    same, reopened = debouncer.observe(key, 't1', _at(1.5), -40)
+
+    assert opened and not reopened
+    assert same is first
+    assert first.read_count == 2
+    assert first.first_seen == _at(0)
+    assert first.last_seen == _at(1.5)
+    assert first.rssi == -60
+    assert first.rssi_max == -40
+    assert first.rssi_avg == -50
+
+
+def test_gap_or_other_direction_opens_new_window(clock) -> None:
+    debouncer = DetectionDebouncer(window_seconds=2, max_entries=10, clock=clock)
+
+    first, _ = debouncer.observe(('E1', 'R1', 'IN'), 't1', _at(0), None)
+    other, other_opened = debouncer.observe(('E1', 'R1', 'OUT'), 't1', _at(0.5), None)
+    later, later_opened = debouncer.observe(('E1', 'R1', 'IN'), 't1', _at(5), None)
+
+    assert other_opened and later_opened
+    assert len({first.detection_id, other.detection_id, later.detection_id}) == 3
+    assert debouncer.stats()['collapsed'] == 0
+
+
+def test_idle_windows_are_evicted_and_disabled_mode_never_collapses(clock) -> None:
+    debouncer = DetectionDebouncer(window_seconds=2, max_entries=10, clock=clock)
+    debouncer.observe(('E1', 'R1', None), 't1', _at(0), None)
+    clock.now = 3
+    debouncer.observe(('E2', 'R1', None), 't2', _at(3), None)
+
+    assert debouncer.stats()['size'] == 1
+    assert debouncer.stats()['evictions'] == 1
+
+    disabled = DetectionDebouncer(window_seconds=0, max_entries=10)
+    first, _ = disabled.observe(('E1', 'R1', None), 't1', _at(0), None)
+    second, opened = disabled.observe(('E1', 'R1', None), 't1', _at(0), None)
+    assert opened and first.detection_id != second.detection_id
+
+
+def test_forget_drops_windows_of_a_rolled_back_batch(clock) -> None:
+    debouncer = DetectionDebouncer(window_seconds=2, max_entries=10, clock=clock)
+    key = ('E1', 'R1', 'IN')
+    first, _ = debouncer.observe(key, 't1', _at(0), None)
+
+    debouncer.forget([key])
+    again, opened = debouncer.observe(key, 't1', _at(0.5), None)
+
+    assert opened
+    assert again.detection_id != first.detection_id
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.infrastructure.rfid.direction import DirectionInferenceEngine, parse_zones
+
+BASE = datetime(2026, 10, 17, 10, 0, tzinfo=timezone.utc)
+ZONES = {'dock:1': 'OUTSIDE', 'dock:2': 'INSIDE'}
+
+
+def _engine(mode: str = 'infer', **overrides) -> DirectionInferenceEngine:
+    options = {'window_seconds': 10, 'min_reads': 2, 'max_tags': 100, 'ttl_seconds': 60}
+    options.update(overrides)
+    return DirectionInferenceEngine(mode, ZONES, **options)
+
+
+def _feed(engine: DirectionInferenceEngine, reads: list[tuple[int, int | None]], epc: str = 'E1') -> list[str]:
+    transitions = []
+    for second, antenna in reads:
+        transition = engine.observe(epc, 'dock', antenna, -50, BASE + timedelta(seconds=second))
+        if transition:
+            transitions.append(transition)
+    return transitions
+
+
+def test_parse_zones_accepts_reader_and_antenna_keys() -> None:
+    assert parse_zones(' dock:1=outside, gate=INSIDE ,') == {'dock:1': 'OUTSIDE', 'gate': 'INSIDE'}
+    with pytest.raises(ValueError):
+        parse_zones('dock:1=LEFT')
+
+
+def test_confirms_crossing_from_outside_to_inside() -> None:
+    engine = _engine()
+
+    assert _feed(engine, [(0, 1), (1, 1), (2, 2), (3, 2), (4, 2)]) == ['IN']
+    assert _feed(engine, [(20, 1), (21, 1)]) == ['OUT']
+    assert engine.stats()['transitions'] == {'IN': 1, 'OUT': 1}
+
+
+def test_first_sighting_on_one_side_only_sets_baseline() -> None:
+    engine = _engine()
+
+    assert _feed(engine, [(0, 2), (1, 2), (2, 2)]) == []
+    assert _feed(engine, [(30, 1), (31, 1)]) == ['OUT']
+
+
+def test_noisy_reads_between_antennas_do_not_flap() -> None:
+    engine = _engine(min_reads=3)
+    _feed(engine, [(0, 2), (1, 2), (2, 2)])
+
+    assert _feed(engine, [(3, 1), (4, 2), (5, 1), (6, 2), (7, 1)]) == []
+
+
+def test_hybrid_prefers_reported_direction_and_reader_mode_ignores_zones() -> None:
+    hybrid = _engine('hybrid')
+    reader = _engine('reader')
+
+    assert hybrid.effective_direction('E1', 'dock', 1, 'IN', -40, BASE) == 'IN'
+    assert hybrid.effective_direction('E1', 'dock', 1, None, -40, BASE) is None
+    assert reader.effective_direction('E1', 'dock', 2, None, -40, BASE) is None
+    assert reader.stats()['observed'] == 0
+
+
+def test_tracked_tags_are_bounded() -> None:
+    engine = _engine(max_tags=2)
+    for epc in ('E1', 'E2', 'E3'):
+        _feed(engine, [(0, 1)], epc=epc)
+
+    assert engine.stats()['tracked'] == 2
+    assert engine.stats()['evictions'] == 1
@@ -0,0 +1,117 @@
+from sqlalchemy.orm import Session
+
+from app.infrastructure.rfid.epc_cache import CachedTag, EpcCache, invalidate_on_commit
+
+
+def _tag(tag_id: str, item_id: str | None = None) -> CachedTag:
+    return CachedTag(id=tag_id, tid=None, status='ENROLLED' if item_id else 'UNKNOWN', inventory_item_id=item_id, item_status='IN' if item_id else None)
+
+
+def test_get_many_splits_hits_absent_and_missing() -> None:
+    cache = EpcCache(max_entries=10, ttl_seconds=60)
+    cache.put('E1', _tag('t1'))
+    cache.put_absent('E2')
+
+    found, absent, missing = cache.get_many({'E1', 'E2', 'E3'})
+
+    assert found['E1'].id == 't1'
+    assert absent == {'E2'}
+    assert missing == {'E3'}
+    stats = cache.stats()
+    assert (stats['hits'], stats['negativeHits'], stats['misses']) == (1, 1, 1)
+
+
+def test_evicts_least_recently_used_entry() -> None:
+    cache = EpcCache(max_entries=2, ttl_seconds=60)
+    cache.put('E1', _tag('t1'))
+    cache.put('E2', _tag('t2'))
+    cache.get_many({'E1'})
+    cache.put('E3', _tag('t3'))
+
+    found, _, missing = cache.get_many({'E1', 'E2', 'E3'})
+
+    assert set(found) == {'E1', 'E3'}
+    assert missing == {'E2'}
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entries_expire_after_ttl(clock) -> None:
+    cache = EpcCache(max_entries=10, ttl_seconds=5, clock=clock)
+    cache.put('E1', _tag('t1'))
+
+    clock.now = 6
+    _, _, missing = cache.get_many({'E1'})
+
+    assert missing == {'E1'}
+    assert cache.stats()['size'] == 0
+
+
+def test_invalidate_item_drops_linked_epc() -> None:
+    cache = EpcCache(max_entries=10, ttl_seconds=60)
+    cache.put('E1', _tag('t1', item_id='i1'))
+
+    cache.invalidate_item('i1')
+
+    _, _, missing = cache.get_many({'E1'})
+    assert missing == {'E1'}
+    assert cache.stats()['invalidations'] == 1
+
+
+def test_put_skips_entry_invalidated_after_it_was_resolved() -> None:
+    cache = EpcCache(max_entries=10, ttl_seconds=60)
+    generation = cache.generation()
+
+    cache.invalidate('E1')
+    cache.invalidate_item('i2')
+    cache.put('E1', _tag('t1'), generation=generation)
+    cache.put('E2', _tag('t2', item_id='i2'), generation=generation)
+    cache.put('E3', _tag('t3', item_id='i3'), generation=generation)
+
+    found, _, missing = cache.get_many({'E1', 'E2', 'E3'})
+    assert set(found) == {'E3'}
+    assert missing == {'E1', 'E2'}
+
+
+def test_clear_and_forgotten_invalidations_make_older_generations_stale() -> None:
+    cache = EpcCache(max_entries=1, ttl_seconds=60)
+    generation = cache.generation()
+    cache.invalidate('E1')
+    cache.invalidate('E2')
+
+    cache.put('E3', _tag('t3'), generation=generation)
+    assert cache.get_many({'E3'})[2] == {'E3'}
+
+    generation = cache.generation()
+    cache.clear()
+    cache.put_absent('E4', generation)
+    assert cache.get_many({'E4'})[2] == {'E4'}
+
+
+def test_keep_expiry_updates_entry_without_renewing_it(clock) -> None:
+    cache = EpcCache(max_entries=10, ttl_seconds=5, clock=clock)
+    cache.put('E1', _tag('t1', item_id='i1'))
+
+    clock.now = 4
+    cache.put('E1', _tag('t1b', item_id='i1'), keep_expiry=True)
+    cache.put('E2', _tag('t2'), keep_expiry=True)
+    found, _, missing = cache.get_many({'E1', 'E2'})
+    assert found['E1'].id == 't1b'
+    assert missing == {'E2'}
+
+    clock.now = 6
+    assert cache.get_many({'E1'})[2] == {'E1'}
+
+
+def test_invalidate_on_commit_repeats_after_commit() -> None:
+    cache = EpcCache(max_entries=10, ttl_seconds=60)
+    db = Session()
+    cache.put('E1', _tag('t1', item_id='i1'))
+
+    invalidate_on_commit(db, cache, inventory_item_ids=['i1'])
+    assert cache.get_many({'E1'})[2] == {'E1'}
+    # Otra ingesta leyó el vínculo aún sin confirmar y lo publicó antes del commit.
+    cache.put('E1', _tag('t1', item_id='i1'))
+    db.commit()
+
+    assert cache.get_many({'E1'})[2] == {'E1'}
+    assert 'epc_cache_invalidations' not in db.info
@@ -0,0 +1,60 @@
+import io
+
+import pytest
+
+from app.domain.inventory.errors import InvalidImportFileError
+from app.infrastructure.inventory.import_parser import detect_import_format, iter_import_rows
+
+
+def _rows(content: str, fmt: str):
+    return list(iter_import_rows(io.BytesIO(content.encode('utf-8')), fmt))
+
+
+def test_csv_rows_apply_defaults_and_keep_file_lines() -> None:
+    content = '﻿productSku, serialNumber ,purchasePrice,status\nSKU-1,S1,10.5,out\n,,,\nSKU-2,, ,\n'
+
+    rows = _rows(content, 'csv')
+
+    assert [row.line for row in rows] == [2, 4]
+    first, second = rows
+    assert first.product_sku == 'SKU-1'
+    assert (first.item.product_id, first.item.serial_number, first.item.purchase_price) == ('', 'S1', 10.5)
+    assert (first.item.item_type, first.item.status) == ('UNIT', 'OUT')
+    assert (second.item.serial_number, second.item.purchase_price, second.item.status) == (None, None, 'IN')
+
+
+def test_csv_reports_malformed_rows_without_stopping() -> None:
+    rows = _rows('productId,purchasePrice\np1,abc\np1,1,extra\np2,2\n', 'csv')
+
+    assert [(row.line, row.error) for row in rows] == [
+        (2, 'Precio de compra invalido'),
+        (3, 'La fila tiene mas columnas que el encabezado'),
+        (4, None),
+    ]
+
+
+def test_csv_without_product_column_is_rejected() -> None:
+    with pytest.raises(InvalidImportFileError):
+        _rows('serialNumber\nS1\n', 'csv')
+
+
+def test_ndjson_reports_invalid_lines() -> None:
+    rows = _rows('{"productId": "p1", "purchasePrice": 3}\n\n[1]\n{bad\n{"productSku": "SKU-1"}\n', 'ndjson')
+
+    assert [(row.line, row.error) for row in rows] == [
+        (1, None),
+        (3, 'Se esperaba un objeto JSON'),
+        (4, 'JSON invalido'),
+        (5, None),
+    ]
+    assert rows[0].item.purchase_price == 3.0
+    assert rows[-1].product_sku == 'SKU-1'
+
+
+def test_detect_import_format() -> None:
+    assert detect_import_format(None, 'items.jsonl', None) == 'ndjson'
+    assert detect_import_format(None, 'items.txt', 'application/x-ndjson') == 'ndjson'
+    assert detect_import_format(None, 'items.csv', 'text/csv') == 'csv'
+    assert detect_import_format('NDJSON', 'items.csv', None) == 'ndjson'
+    with pytest.raises(InvalidImportFileError):
+        detect_import_format('xlsx', None, None)
@@ -0,0 +1,64 @@
+import threading
+
+import pytest
+
+from app.domain.rfid.errors import IngestQueueFullError
+from app.infrastructure.rfid.ingest_queue import InMemoryRfidIngestQueue
+
+
+def _payload(reader_id: str = 'R1', **extra) -> dict:
+    return {'readerId': reader_id, 'reads': [{'epc': 'E1'}], 'apiKey': 'key', **extra}
+
+
+def test_submit_rejects_when_full() -> None:
+    queue = InMemoryRfidIngestQueue(lambda payloads: [], max_size=1, workers=0, max_coalesce=1, status_retention=10)
+    queue.start()
+
+    queue.submit(_payload())
+    with pytest.raises(IngestQueueFullError):
+        queue.submit(_payload())
+
+    assert queue.stats()['rejected'] == 1
+
+
+def test_stop_drains_and_coalesces_batches() -> None:
+    calls: list[int] = []
+    release = threading.Event()
+
+    def process(payloads: list[dict]) -> list[dict]:
+        release.wait(1)
+        calls.append(len(payloads))
+        return [{'success': True, 'processed': 1} for _ in payloads]
+
+    queue = InMemoryRfidIngestQueue(process, max_size=10, workers=1, max_coalesce=5, status_retention=10)
+    queue.start()
+    first = queue.submit(_payload())
+    others = [queue.submit(_payload()) for _ in range(3)]
+    release.set()
+    queue.stop(timeout=5)
+
+    assert sum(calls) == 4
+    assert queue.get(first['batchId'])['status'] == 'DONE'
+    assert all(queue.get(batch['batchId'])['result']['processed'] == 1 for batch in others)
+
+
+def test_failed_group_is_retried_per_batch() -> None:
+    release = threading.Event()
+
+    def process(payloads: list[dict]) -> list[dict]:
+        release.wait(1)
+        if any(payload.get('poison') for payload in payloads):
+            raise RuntimeError('boom')
+        return [{'success': True} for _ in payloads]
+
+    queue = InMemoryRfidIngestQueue(process, max_size=10, workers=1, max_coalesce=5, status_retention=10)
+    queue.start()
+    queue.submit(_payload())
+    ok = queue.submit(_payload())
+    bad = queue.submit(_payload(poison=True))
+    release.set()
+    queue.stop(timeout=5)
+
+    assert queue.get(ok['batchId'])['status'] == 'DONE'
+    assert queue.get(bad['batchId'])['status'] == 'FAILED'
+    assert queue.stats()['failed'] == 1
@@ -0,0 +1,37 @@
+from app.infrastructure.inventory.sqlalchemy_repository import SqlAlchemyInventoryRepository
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class FakeSession:
+    """Devuelve en orden las filas de cada `execute` (contadores y luego categorías)."""
+
+    def __init__(self, *results):
+        self._results = list(results)
+
+    def execute(self, statement):
+        return FakeResult(self._results.pop(0))
+
+    def scalars(self, statement):
+        return FakeResult([])
+
+
+def test_summary_reads_status_type_and_category_counts() -> None:
+    db = FakeSession(
+        [('status', 'IN', 3), ('status', 'OUT', 1), ('type', 'UNIT', 4)],
+        [('Audio', '#fff', 4)],
+    )
+
+    result = SqlAlchemyInventoryRepository(db).summary()
+
+    assert result['total'] == 4
+    assert result['byStatus'] == {'IN': 3, 'OUT': 1, 'MAINTENANCE': 0, 'LOST': 0}
+    assert result['byType'] == {'UNIT': 4, 'CONTAINER': 0}
+    assert result['byCategory'] == [{'name': 'Audio', 'color': '#fff', 'count': 4}]
+    assert result['recentMovements'] == []
@@ -0,0 +1,28 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.infrastructure.common.partitions import is_partition_name, next_period, partition_name, period_start
+
+
+def test_period_start_truncates_to_month_and_iso_week() -> None:
+    moment = datetime(2026, 10, 17, 15, 30, tzinfo=timezone(timedelta(hours=-5)))
+
+    assert period_start(moment, 'month') == datetime(2026, 10, 1, tzinfo=timezone.utc)
+    assert period_start(moment, 'week') == datetime(2026, 10, 12, tzinfo=timezone.utc)
+    with pytest.raises(ValueError):
+        period_start(moment, 'day')
+
+
+def test_next_period_rolls_over_year() -> None:
+    assert next_period(datetime(2026, 12, 1, tzinfo=timezone.utc), 'month') == datetime(2027, 1, 1, tzinfo=timezone.utc)
+    assert next_period(datetime(2026, 12, 28, tzinfo=timezone.utc), 'week') == datetime(2027, 1, 4, tzinfo=timezone.utc)
+
+
+def test_partition_names_follow_convention() -> None:
+    name = partition_name('rfid_detections', datetime(2026, 10, 1, tzinfo=timezone.utc))
+
+    assert name == 'rfid_detections_p20261001'
+    assert is_partition_name(name)
+    assert is_partition_name('rfid_detections_default')
+    assert not is_partition_name('rfid_detections')
@@ -0,0 +1,47 @@
+import pytest
+
+from app.infrastructure.rfid.reader_stats import ReaderStatsRegistry
+
+
+def test_rate_converges_to_steady_throughput_and_decays_when_silent(clock) -> None:
+    registry = ReaderStatsRegistry(rate_window_seconds=10, latency_samples=10, silent_after_seconds=30, clock=clock)
+
+    for _ in range(200):
+        clock.now += 0.5
+        registry.record_batch('R1', 'Dock', reads=5, unknown_reads=1, latency_ms=2.0)
+    active = registry.stats()[0]
+    clock.now += 60
+    silent = registry.stats()[0]
+
+    assert active['readsPerSecond'] == pytest.approx(10, rel=0.05)
+    assert active['status'] == 'ACTIVE'
+    assert active['unknownRatio'] == pytest.approx(0.2)
+    assert active['avgBatchSize'] == 5
+    assert silent['status'] == 'SILENT'
+    assert silent['readsPerSecond'] < 0.1
+
+
+def test_latency_percentiles_use_recent_window(clock) -> None:
+    registry = ReaderStatsRegistry(rate_window_seconds=10, latency_samples=100, silent_after_seconds=30, clock=clock)
+
+    registry.record_batch('R1', None, reads=1, unknown_reads=0, latency_ms=1000.0)
+    for latency in range(1, 101):
+        registry.record_batch('R1', None, reads=1, unknown_reads=0, latency_ms=float(latency))
+
+    assert registry.stats()[0]['latencyMs'] == {'p50': 50.0, 'p95': 95.0, 'p99': 99.0}
+
+
+def test_drain_returns_deltas_once_and_restore_puts_them_back(clock) -> None:
+    registry = ReaderStatsRegistry(rate_window_seconds=10, latency_samples=10, silent_after_seconds=30, clock=clock)
+    registry.record_batch('R1', None, reads=3, unknown_reads=1, latency_ms=1.0)
+    registry.record_error('R1', None)
+
+    first = registry.drain()
+    registry.restore(first)
+    registry.record_batch('R1', None, reads=2, unknown_reads=0, latency_ms=1.0)
+    second = registry.drain()
+
+    assert (first[0]['readsDelta'], first[0]['errorsDelta']) == (3, 1)
+    assert (second[0]['readsDelta'], second[0]['batchesDelta'], second[0]['errorsDelta']) == (5, 2, 1)
+    assert registry.drain()[0]['readsDelta'] == 0
+    assert second[0]['reads'] == 5
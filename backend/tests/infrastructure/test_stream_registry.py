@@ -0,0 +1,31 @@
+from app.infrastructure.rfid.stream_registry import RfidStreamRegistry
+
+
+def test_per_connection_counters(clock) -> None:
+    registry = RfidStreamRegistry(clock=clock)
+    connection_id = registry.open('R1', 'Portal 1')
+
+    registry.record_message(connection_id, 3)
+    registry.record_message(connection_id, 1)
+    registry.record_ack(connection_id, processed=4, elapsed_ms=20)
+    registry.record_error(connection_id)
+    clock.now = 2
+
+    connection = registry.stats()['connections'][0]
+    assert connection['messages'] == 2
+    assert connection['reads'] == 4
+    assert connection['errors'] == 1
+    assert connection['readsPerSecond'] == 2
+    assert connection['avgAckMs'] == 20
+
+
+def test_closed_connections_keep_totals() -> None:
+    registry = RfidStreamRegistry()
+    connection_id = registry.open('R1', None)
+    registry.record_message(connection_id, 5)
+    registry.close(connection_id)
+
+    stats = registry.stats()
+    assert stats['open'] == 0
+    assert stats['closed'] == 1
+    assert stats['reads'] == 5
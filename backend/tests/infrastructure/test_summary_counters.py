@@ -0,0 +1,46 @@
+from sqlalchemy.orm import Session
+
+from app.infrastructure.inventory.summary_counters import SummaryCache, apply_summary_deltas, item_deltas, status_deltas
+
+
+def test_status_deltas_move_one_item_between_statuses() -> None:
+    assert status_deltas('IN', 'OUT') == {('status', 'IN'): -1, ('status', 'OUT'): 1}
+    assert status_deltas('IN', 'IN') == {}
+
+
+def test_item_deltas_cancel_out_unchanged_dimensions() -> None:
+    deltas = item_deltas('IN', 'UNIT', 'c1', sign=-1)
+    deltas.update(item_deltas('OUT', 'UNIT', 'c1'))
+
+    assert {key: delta for key, delta in deltas.items() if delta} == {('status', 'IN'): -1, ('status', 'OUT'): 1}
+
+
+def test_deltas_add_up_in_the_session_until_commit() -> None:
+    db = Session()
+    apply_summary_deltas(db, status_deltas('IN', 'OUT'))
+    apply_summary_deltas(db, status_deltas('OUT', 'IN'))
+    apply_summary_deltas(db, status_deltas('IN', 'LOST'))
+
+    pending = {key: delta for key, delta in db.info['inventory_summary_deltas'].items() if delta}
+    assert pending == {('status', 'IN'): -1, ('status', 'LOST'): 1}
+
+
+def test_cache_expires_after_ttl_and_on_invalidate(clock) -> None:
+    cache = SummaryCache(ttl_seconds=5, clock=clock)
+    cache.put({'total': 1})
+
+    clock.now = 4.9
+    assert cache.get() == {'total': 1}
+    clock.now = 5.0
+    assert cache.get() is None
+
+    cache.put({'total': 2})
+    cache.invalidate()
+    assert cache.get() is None
+
+
+def test_zero_ttl_disables_cache() -> None:
+    cache = SummaryCache(ttl_seconds=0)
+    cache.put({'total': 1})
+
+    assert cache.get() is None
@@ -17,6 +17,8 @@ const typeConfig = {
   ADJUSTMENT: { label: 'Ajuste', icon: Settings, className: 'bg-amber-500/10 text-amber-400' },
   ENROLLMENT: { label: 'Registro', icon: Plus, className: 'bg-orange-500/10 text-orange-400' },
   TRANSFER: { label: 'Transferencia', icon: Repeat, className: 'bg-cyan-500/10 text-cyan-400' },
+  RFID_CHECK_IN: { label: 'Entrada RFID', icon: ArrowDownToLine, className: 'bg-green-500/10 text-green-400' },
+  RFID_CHECK_OUT: { label: 'Salida RFID', icon: ArrowUpFromLine, className: 'bg-blue-500/10 text-blue-400' },
 }
 
 const statusLabels: Record<string, string> = {
@@ -268,6 +268,8 @@ export function useRfidTags() {
     direction?: string
     limit?: number
     offset?: number
+    cursor?: string
+    includeTotal?: boolean
   }) => {
     setLoading(true)
     setError(null)
@@ -279,6 +281,8 @@ export function useRfidTags() {
       if (options?.direction) url.searchParams.set('direction', options.direction)
       if (options?.limit) url.searchParams.set('limit', options.limit.toString())
       if (options?.offset) url.searchParams.set('offset', options.offset.toString())
+      if (options?.cursor) url.searchParams.set('cursor', options.cursor)
+      if (options?.includeTotal) url.searchParams.set('includeTotal', 'true')
 
       const response = await fetch(url.toString(), { credentials: 'include' })
 
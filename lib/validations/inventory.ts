@@ -95,7 +95,7 @@ export type InventoryItem = {
 export type InventoryMovement = {
   id: string
   inventoryItemId: string
-  type: 'CHECK_IN' | 'CHECK_OUT' | 'ADJUSTMENT' | 'ENROLLMENT' | 'TRANSFER'
+  type: 'CHECK_IN' | 'CHECK_OUT' | 'ADJUSTMENT' | 'ENROLLMENT' | 'TRANSFER' | 'RFID_CHECK_IN' | 'RFID_CHECK_OUT'
   fromStatus: string | null
   toStatus: string
   fromLocation: string | null